@@ -0,0 +1,180 @@
+"""
+Driver video uploads for Act-Two requests.
+Instead of inlining the driver video as base64 in every task request, the
+video is uploaded once through the /uploads endpoint and each request refers
+to it by its short runway:// URI. Upload URIs are remembered on disk until
+they expire, so consecutive batches within the validity window reuse them.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+
+from http_transport import HTTPTransport
+from path_utils import path_manager, file_sha256
+from payload_cache import video_mime_type
+
+logger = logging.getLogger(__name__)
+
+# Ephemeral uploads stay usable for 24 hours
+UPLOAD_VALIDITY_SECONDS = 24 * 60 * 60
+
+# Upload again when less than this is left, so no task is created with a URI
+# that expires before the API fetches it
+UPLOAD_RENEW_MARGIN_SECONDS = 60 * 60
+
+UPLOAD_TIMEOUT = (10, 300)  # (connect, read) seconds
+
+
+def default_upload_store_path() -> Path:
+    """Location of the remembered upload URIs next to the configuration file."""
+    return path_manager.project_dir / "config" / "driver_uploads.json"
+
+
+class DriverUploadCache:
+    """Uploads driver videos once and hands out their runway:// URIs until they expire."""
+
+    def __init__(self, base_url: str, headers: Dict[str, str],
+                 store_path: Union[str, Path, None] = None,
+                 validity: float = UPLOAD_VALIDITY_SECONDS,
+                 renew_margin: float = UPLOAD_RENEW_MARGIN_SECONDS,
+                 transport: Optional[HTTPTransport] = None):
+        """
+        Initialize the upload cache.
+
+        Args:
+            base_url: API base URL (uploads are remembered per API)
+            headers: Authorization headers for the API
+            store_path: File the upload URIs are saved in (defaults to config/driver_uploads.json)
+            validity: Seconds an upload can be referenced after it was made
+            renew_margin: Upload again once less than this many seconds remain
+            transport: Shared HTTP session (a private one is created if omitted)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers
+        self.store_path = Path(store_path or default_upload_store_path())
+        self.validity = validity
+        self.renew_margin = renew_margin
+        self.transport = transport or HTTPTransport()
+        self._lock = threading.Lock()
+        self._keys: Dict[Tuple[str, int, int], str] = {}  # (path, size, mtime_ns) -> content hash
+
+    def _content_key(self, video_path: str) -> str:
+        """Hash of a video's contents, computed once per file version."""
+        stat = os.stat(video_path)
+        version = (str(Path(video_path).resolve()), stat.st_size, stat.st_mtime_ns)
+        key = self._keys.get(version)
+        if key is None:
+            key = self._keys[version] = file_sha256(video_path)
+        return key
+
+    def get_uri(self, video_path: Union[str, Path]) -> Optional[str]:
+        """
+        Get an upload URI for a video, uploading it if no usable one is remembered.
+
+        Concurrent callers wait for a single upload instead of each making one.
+
+        Args:
+            video_path: Driver video to reference
+
+        Returns:
+            runway:// URI of the uploaded video, or None if it could not be uploaded
+        """
+        video_path = str(video_path)
+        with self._lock:
+            try:
+                key = self._content_key(video_path)
+            except OSError as e:
+                logger.error(f"Cannot read driver video {video_path}: {e}")
+                return None
+
+            uploads = self._read_store()
+            entry = uploads.get(self.base_url, {}).get(key)
+            if entry and entry['expires_at'] - time.time() > self.renew_margin:
+                return entry['uri']
+
+            uri = self.upload(video_path)
+            if not uri:
+                return None
+            uploads.setdefault(self.base_url, {})[key] = {
+                'uri': uri,
+                'expires_at': time.time() + self.validity,
+            }
+            self._write_store(uploads)
+            return uri
+
+    def invalidate(self, video_path: Union[str, Path]):
+        """Forget the upload of a video, e.g. after the API rejected its URI."""
+        with self._lock:
+            try:
+                key = self._content_key(str(video_path))
+            except OSError:
+                return
+            uploads = self._read_store()
+            if uploads.get(self.base_url, {}).pop(key, None):
+                self._write_store(uploads)
+
+    def upload(self, video_path: str) -> Optional[str]:
+        """
+        Upload a video through the /uploads endpoint.
+
+        Args:
+            video_path: Video file to upload
+
+        Returns:
+            runway:// URI of the upload, or None on failure
+        """
+        name = Path(video_path).name
+        try:
+            response = self.transport.post(f"{self.base_url}/uploads", headers=self.headers,
+                                           json={'filename': name, 'type': 'ephemeral'})
+            if response.status_code != 200:
+                logger.warning(f"Upload request for {name} rejected with HTTP "
+                               f"{response.status_code}: {response.text}")
+                return None
+            upload = response.json()
+
+            # The upload URL is pre-signed; it takes the returned form fields
+            # and the file, without the API's authorization headers
+            start = time.monotonic()
+            with open(video_path, 'rb') as f:
+                response = self.transport.post(upload['uploadUrl'], data=upload.get('fields') or {},
+                                               files={'file': (name, f, video_mime_type(video_path))},
+                                               timeout=UPLOAD_TIMEOUT)
+            if response.status_code >= 300:
+                logger.warning(f"Upload of {name} failed with HTTP {response.status_code}: {response.text}")
+                return None
+        except (requests.RequestException, OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not upload driver video {name}: {e}")
+            return None
+
+        logger.info(f"Uploaded driver video {name} in {time.monotonic() - start:.1f}s: {upload['runwayUri']}")
+        return upload['runwayUri']
+
+    def _read_store(self) -> Dict[str, Dict[str, Dict]]:
+        """Read remembered uploads, dropping expired ones."""
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                uploads = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {base_url: {key: entry for key, entry in entries.items() if entry.get('expires_at', 0) > now}
+                for base_url, entries in uploads.items() if isinstance(entries, dict)}
+
+    def _write_store(self, uploads: Dict[str, Dict[str, Dict]]):
+        """Save remembered uploads atomically (caller holds the lock)."""
+        try:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.store_path.with_name(self.store_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(uploads, f)
+            os.replace(temp_path, self.store_path)
+        except OSError as e:
+            logger.warning(f"Could not save driver uploads to {self.store_path}: {e}")
@@ -0,0 +1,294 @@
+"""
+asyncio interface for driving batches from other services.
+Yields an event stream per image (started, submitted, completed, ...) as an
+async iterator. Waiting for tasks costs no thread: every task is watched by
+the generator's single status poller and awaited as a future on the event
+loop, so thousands of tasks can be in flight at once. Blocking work
+(preprocessing, submission, downloads, journal writes) runs on small
+bounded thread pools.
+
+Example:
+    async for event in generate(image_paths, config, output_folder="out"):
+        if event.kind == COMPLETED:
+            print(event.result.job.name, event.result.output_path or event.result.error)
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Optional, Union
+
+from concurrency_control import AdaptiveConcurrencyController
+from generator_factory import create_generator
+from task_pipeline import (GenerationJob, GenerationResult, GenerationTask,
+                           DEFAULT_MAX_IN_FLIGHT, DEFAULT_DOWNLOAD_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+# Threads running blocking preparation, submission, verification and journal calls
+DEFAULT_SUBMIT_WORKERS = 4
+
+# Prepared images waiting for a concurrency slot
+DEFAULT_ASYNC_LOOKAHEAD = 4
+
+# Event kinds, in the order an image goes through them
+STARTED = 'started'        # Took a concurrency slot (or was settled by the journal)
+SUBMITTED = 'submitted'    # Task created or adopted; task_id is set
+DOWNLOADING = 'downloading'  # Task succeeded; its video is being downloaded
+COMPLETED = 'completed'    # Final event for an image; result is set
+SKIPPED = 'skipped'        # Dropped before submission; result is set (skipped=True)
+
+ImageSource = Union[Iterable[Union[str, Path, GenerationJob]], AsyncIterable[Union[str, Path, GenerationJob]]]
+
+
+@dataclass
+class GenerationEvent:
+    """Progress of one image."""
+    kind: str
+    job: GenerationJob
+    task_id: Optional[str] = None
+    result: Optional[GenerationResult] = None  # Set for COMPLETED and SKIPPED
+
+
+class AsyncGenerationRunner:
+    """Runs generations for an image source on the running event loop."""
+
+    def __init__(self, generator, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 submit_workers: int = DEFAULT_SUBMIT_WORKERS,
+                 lookahead: int = DEFAULT_ASYNC_LOOKAHEAD):
+        """
+        Initialize the runner.
+
+        Args:
+            generator: RunwayActTwoBatchGenerator providing the stage operations
+            max_in_flight: Maximum number of Act-Two tasks running at the same time;
+                the actual limit adapts to throttling like the threaded pipeline
+            download_workers: Finished videos downloaded at the same time
+            submit_workers: Threads preparing and submitting images
+            lookahead: Prepared images waiting for a concurrency slot
+        """
+        self.generator = generator
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.lookahead = max(1, int(lookahead))
+        self.controller = AdaptiveConcurrencyController(self.max_in_flight)
+        # Submissions report 429/5xx responses to the runner's controller
+        generator.concurrency = self.controller
+        self.download_workers = max(1, int(download_workers))
+        self.submit_workers = max(1, int(submit_workers))
+        transport = getattr(generator, 'transport', None)
+        if transport is not None:
+            # A connection per blocking worker, plus the poller
+            transport.ensure_pool_size(self.submit_workers + self.download_workers + 1)
+        self._workers = ThreadPoolExecutor(max_workers=self.submit_workers, thread_name_prefix="async-submit")
+        self._downloads = ThreadPoolExecutor(max_workers=self.download_workers, thread_name_prefix="async-download")
+
+    def close(self):
+        """Stop the worker threads (the generator is left open)."""
+        self._workers.shutdown(wait=True, cancel_futures=True)
+        self._downloads.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, images: ImageSource, output_folder: Optional[str] = None,
+                  validate: bool = True) -> AsyncIterator[GenerationEvent]:
+        """
+        Process images, yielding events as they happen.
+
+        Stopping the iteration early (break, aclose or cancellation) cancels
+        the remaining images; tasks already created keep running on the API.
+
+        Args:
+            images: Image paths or GenerationJobs, as a plain or async iterable;
+                a plain iterable is read on a worker thread, so it may scan folders
+            output_folder: Folder for the videos of image paths (None saves each
+                video next to its image)
+            validate: Skip images that are gone or whose video already exists
+
+        Yields:
+            GenerationEvent for each step; every image ends with COMPLETED or SKIPPED
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        state = _RunState(self.controller, self.max_in_flight + self.lookahead + self.download_workers,
+                          self.lookahead)
+        # The task timeout may probe the driver video; do it off the event loop
+        await loop.run_in_executor(self._workers, lambda: self.generator.task_timeout)
+
+        producer = asyncio.ensure_future(self._produce(images, output_folder, validate, state, events.put_nowait))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            await producer  # Re-raise errors from reading the image source
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+
+    async def _produce(self, images: ImageSource, output_folder: Optional[str], validate: bool,
+                       state: '_RunState', emit: Callable[[Optional[GenerationEvent]], None]):
+        """Start a coroutine per image, holding back while too many are running."""
+        running = set()
+        try:
+            async for job in self._iter_jobs(images, output_folder):
+                await state.admission.acquire()
+                job_task = asyncio.ensure_future(self._run_job(job, validate, state, emit))
+                running.add(job_task)
+                job_task.add_done_callback(running.discard)
+                job_task.add_done_callback(lambda _: state.admission.release())
+            if running:
+                await asyncio.gather(*running)
+        finally:
+            leftover = list(running)
+            for job_task in leftover:
+                job_task.cancel()
+            if leftover:
+                await asyncio.gather(*leftover, return_exceptions=True)
+            emit(None)
+
+    async def _iter_jobs(self, images: ImageSource, output_folder: Optional[str]) -> AsyncIterator[GenerationJob]:
+        def to_job(item) -> GenerationJob:
+            if isinstance(item, GenerationJob):
+                return item
+            folder = output_folder if output_folder is not None else str(Path(item).parent)
+            return GenerationJob(image_path=str(item), output_folder=str(folder))
+
+        if hasattr(images, '__aiter__'):
+            async for item in images:
+                yield to_job(item)
+            return
+        loop = asyncio.get_running_loop()
+        iterator = iter(images)
+        end = object()
+        while True:
+            item = await loop.run_in_executor(None, next, iterator, end)
+            if item is end:
+                return
+            yield to_job(item)
+
+    async def _run_job(self, job: GenerationJob, validate: bool, state: '_RunState',
+                       emit: Callable[[Optional[GenerationEvent]], None]):
+        """Take one image through preparation, submission, waiting, download and verification."""
+        loop = asyncio.get_running_loop()
+        generator = self.generator
+
+        def finish(output_path: Optional[str] = None, error: Optional[str] = None):
+            emit(GenerationEvent(COMPLETED, job, result=GenerationResult(job, output_path=output_path,
+                                                                         error=error)))
+
+        def blocking(function: Callable, *args, executor: Optional[ThreadPoolExecutor] = None) -> Any:
+            return loop.run_in_executor(executor or self._workers, function, *args)
+
+        async def skip_reason() -> Optional[str]:
+            # revalidate_job stats files; keep that off the event loop
+            reason = await blocking(generator.revalidate_job, job) if validate else None
+            if reason:
+                logger.info(f"Skipping {job.image_path}: {reason}")
+                emit(GenerationEvent(SKIPPED, job, result=GenerationResult(job, error=reason, skipped=True)))
+            return reason
+
+        try:
+            if await skip_reason():
+                return
+            async with state.prepared:
+                task = await blocking(generator.open_generation, job.image_path, job.output_folder)
+                if not isinstance(task, GenerationTask):
+                    # Already downloaded according to the journal
+                    emit(GenerationEvent(STARTED, job))
+                    finish(output_path=task)
+                    return
+                if not task.task_id:
+                    await blocking(generator.prepare_character, task)
+                # Checked again right before submission
+                if await skip_reason():
+                    return
+                await state.acquire_slot()
+
+            try:
+                emit(GenerationEvent(STARTED, job))
+                if not task.task_id and not await blocking(generator.submit_generation, task):
+                    finish(error=task.error)
+                    return
+                emit(GenerationEvent(SUBMITTED, job, task_id=task.task_id))
+                # No thread waits here: the poller resolves the future
+                status_data = await asyncio.wrap_future(generator.track_task(task.task_id))
+                succeeded = await blocking(generator.record_task_outcome, task, status_data)
+            finally:
+                state.release_slot()
+            if not succeeded:
+                finish(error=task.error)
+                return
+
+            emit(GenerationEvent(DOWNLOADING, job, task_id=task.task_id))
+            if (await blocking(generator.download_generation, task, executor=self._downloads)
+                    and await blocking(generator.verify_generation, task)):
+                finish(output_path=str(task.output_path))
+            else:
+                finish(error=task.error)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error processing {job.image_path}: {str(e)}")
+            finish(error=str(e))
+
+
+class _RunState:
+    """Per-run admission limits and concurrency slot bookkeeping (event loop side)."""
+
+    def __init__(self, controller: AdaptiveConcurrencyController, admitted: int, lookahead: int):
+        self.controller = controller
+        self.admission = asyncio.Semaphore(admitted)  # Images being processed at once
+        self.prepared = asyncio.Semaphore(lookahead)  # Images prepared but not yet holding a slot
+        self._slot_freed = asyncio.Event()
+
+    async def acquire_slot(self):
+        """Wait for the adaptive controller to allow another task."""
+        while True:
+            self._slot_freed.clear()
+            # Never the blocking acquire(): worker threads may cut the limit at any
+            # time, and only this loop frees slots
+            if self.controller.try_acquire():
+                return
+            try:
+                # Also wakes up when a backoff pause ends or the limit grows
+                await asyncio.wait_for(self._slot_freed.wait(), timeout=self.controller.paused_for or 1.0)
+            except asyncio.TimeoutError:
+                pass
+
+    def release_slot(self):
+        self.controller.release()
+        self._slot_freed.set()
+
+
+async def generate(images: ImageSource, config: Dict[str, Any], output_folder: Optional[str] = None,
+                   validate: bool = True) -> AsyncIterator[GenerationEvent]:
+    """
+    Run a batch with a generator built from configuration settings.
+
+    Args:
+        images: Image paths or GenerationJobs, as a plain or async iterable
+        config: Configuration values (keys as in config/runway_config.json,
+            e.g. api_key, driver_video, max_in_flight, download_workers)
+        output_folder: Folder for the videos (None saves each video next to its image)
+        validate: Skip images that are gone or whose video already exists
+
+    Yields:
+        GenerationEvent for each step of each image
+    """
+    loop = asyncio.get_running_loop()
+    generator = await loop.run_in_executor(None, create_generator, config)
+    runner = AsyncGenerationRunner(generator,
+                                   max_in_flight=config.get('max_in_flight', DEFAULT_MAX_IN_FLIGHT),
+                                   download_workers=config.get('download_workers', DEFAULT_DOWNLOAD_WORKERS))
+    try:
+        async for event in runner.run(images, output_folder=output_folder, validate=validate):
+            yield event
+    finally:
+        await loop.run_in_executor(None, runner.close)
+        await loop.run_in_executor(None, generator.close)
@@ -0,0 +1,255 @@
+"""
+Performance benchmarks for the batch automation.
+Run from the src folder, e.g.:
+
+    python benchmarks.py scan --files 100000 --latency-ms 5
+    python benchmarks.py body --driver-mb 64
+    python benchmarks.py preprocess --megapixels 12 24 48
+"""
+
+import argparse
+import base64
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+
+from directory_walker import ParallelDirectoryWalker
+from image_preprocessing import preprocess_to_jpeg_bytes
+from image_scanner import ImageScanner
+from streaming_body import Base64Field, JSONStreamBody
+
+
+class _LatencyWalker(ParallelDirectoryWalker):
+    """Walker that adds a fixed delay per listing, imitating an SMB/NFS round trip."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def _scandir(self, path: str):
+        time.sleep(self.latency)
+        return super()._scandir(path)
+
+
+def make_synthetic_tree(root: Path, files: int, files_per_folder: int = 100,
+                        match_every: int = 10) -> int:
+    """
+    Create an input tree of empty image files.
+
+    Args:
+        root: Folder to create the tree in
+        files: Total number of files
+        files_per_folder: Files in each batch folder
+        match_every: Every Nth file is named like a GenX image
+
+    Returns:
+        Number of batch folders created
+    """
+    folders = (files + files_per_folder - 1) // files_per_folder
+    created = 0
+    for f in range(folders):
+        folder = root / f"Person {f:05d}"
+        folder.mkdir(parents=True)
+        for i in range(min(files_per_folder, files - created)):
+            name = f"genx PERSON{f} X {i}.jpg" if i % match_every == 0 else f"photo {i}.jpg"
+            (folder / name).touch()
+            created += 1
+    return folders
+
+
+def benchmark_scan(args):
+    """Time the image scanner serially and with a thread pool on a synthetic tree."""
+    temp_dir = Path(tempfile.mkdtemp(prefix="scan-bench-"))
+    try:
+        start = time.perf_counter()
+        folders = make_synthetic_tree(temp_dir, args.files, args.files_per_folder)
+        print(f"Created {args.files} files in {folders} folders in {time.perf_counter() - start:.1f}s")
+        latency = args.latency_ms / 1000.0
+        if latency:
+            print(f"Simulated listing latency: {args.latency_ms:g} ms")
+        print()
+
+        baseline = None
+        for workers in [1] + [w for w in args.workers if w != 1]:
+            timings = []
+            for _ in range(args.repeat):
+                walker = _LatencyWalker(latency, workers=workers, max_depth=1)
+                scanner = ImageScanner('genx', walker=walker)
+                start = time.perf_counter()
+                plan = scanner.scan(temp_dir)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            baseline = baseline or best
+            print(f"  workers={workers:<3} {best:7.3f}s  ({len(plan)} images in "
+                  f"{len(plan.folders)} folders, {baseline / best:.1f}x vs serial)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _measure(build_and_send) -> tuple:
+    """Run a body builder, returning (seconds, peak traced allocation in bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    sent = build_and_send()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, sent
+
+
+def benchmark_body(args):
+    """Compare peak memory of an in-memory JSON body with the streaming body."""
+    temp_dir = Path(tempfile.mkdtemp(prefix="body-bench-"))
+    try:
+        video = temp_dir / "driver.mp4"
+        with open(video, 'wb') as f:
+            for _ in range(args.driver_mb):
+                f.write(os.urandom(1024 * 1024))
+        print(f"Driver video: {args.driver_mb} MB\n")
+
+        def in_memory():
+            with open(video, 'rb') as f:
+                uri = "data:video/mp4;base64," + base64.b64encode(f.read()).decode('utf-8')
+            body = json.dumps({"reference": {"type": "video", "uri": uri}}).encode('utf-8')
+            return len(body)
+
+        def streaming():
+            body = JSONStreamBody({"reference": {"type": "video", "uri": Base64Field(video, "video/mp4")}})
+            return sum(len(chunk) for chunk in body)  # Chunks are dropped as a socket would
+
+        for label, builder in (("json=payload", in_memory), ("JSONStreamBody", streaming)):
+            elapsed, peak, sent = _measure(builder)
+            print(f"  {label:<15} {elapsed:6.3f}s  peak {peak / (1024 * 1024):7.1f} MB  "
+                  f"({sent / (1024 * 1024):.1f} MB body)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def make_synthetic_photo(path: Path, megapixels: float, seed: int = 0):
+    """Write a 4:3 JPEG with gradients, hard edges and sensor-like noise."""
+    width = int(math.sqrt(megapixels * 1_000_000 * 4 / 3))
+    height = width * 3 // 4
+    rng = random.Random(seed)
+    img = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    draw = ImageDraw.Draw(img)
+    for _ in range(400):
+        x, y, r = rng.randrange(width), rng.randrange(height), rng.randrange(10, width // 20)
+        draw.ellipse((x, y, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+    noise = Image.effect_noise((width, height), 20).convert('RGB')
+    Image.blend(img, noise, 0.15).save(path, "JPEG", quality=92)
+
+
+def _rss_mb(field: str) -> float:
+    """Current (VmRSS) or peak (VmHWM) resident memory of this process from /proc, in MB."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024
+    raise OSError(f"{field} not reported")
+
+
+def _preprocess_in_child(path: str, fast: bool) -> tuple:
+    """Preprocess one image in a fresh process, returning (seconds, peak RSS growth in MB, JPEG)."""
+    try:
+        # Reset the peak to the current RSS (ru_maxrss would carry the parent's peak over exec)
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        before = _rss_mb('VmRSS')
+    except OSError:  # Not Linux
+        before = None
+    start = time.perf_counter()
+    data = preprocess_to_jpeg_bytes(path, fast=fast)
+    elapsed = time.perf_counter() - start
+    return elapsed, _rss_mb('VmHWM') - before if before is not None else None, data
+
+
+def psnr(jpeg_a: bytes, jpeg_b: bytes) -> float:
+    """Peak signal-to-noise ratio between two equally sized JPEGs, in dB."""
+    with Image.open(io.BytesIO(jpeg_a)) as a, Image.open(io.BytesIO(jpeg_b)) as b:
+        stat = ImageStat.Stat(ImageChops.difference(a.convert('RGB'), b.convert('RGB')))
+        mse = sum(stat.sum2) / (3 * a.width * a.height)
+    return float('inf') if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def benchmark_preprocess(args) -> int:
+    """Compare the standard and fast (draft + reduce) preprocessing paths."""
+    temp_dir = Path(tempfile.mkdtemp(prefix="preprocess-bench-"))
+    try:
+        if args.images:
+            images = sorted(p for p in Path(args.images).iterdir()
+                            if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+        else:
+            images = []
+            for megapixels in args.megapixels:
+                path = temp_dir / f"photo_{megapixels:g}mp.jpg"
+                make_synthetic_photo(path, megapixels)
+                images.append(path)
+
+        failed = 0
+        # A new process per run, so peak RSS reflects that image alone
+        context = multiprocessing.get_context('spawn')
+        for path in images:
+            results = {}
+            for fast in (False, True):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    results[fast] = pool.submit(_preprocess_in_child, str(path), fast).result()
+            with Image.open(path) as img:
+                print(f"{path.name} ({img.width}x{img.height}, {img.width * img.height / 1e6:.0f} MP)")
+            for fast, label in ((False, "standard"), (True, "fast")):
+                elapsed, peak, _ = results[fast]
+                peak_text = f"{peak:7.1f} MB" if peak is not None else "    n/a"
+                print(f"  {label:<9} {elapsed:6.3f}s  peak RSS +{peak_text}")
+            quality = psnr(results[False][2], results[True][2])
+            ok = quality >= args.min_psnr
+            failed += not ok
+            print(f"  speedup {results[False][0] / results[True][0]:.1f}x, "
+                  f"PSNR {quality:.1f} dB ({'ok' if ok else 'BELOW'} {args.min_psnr:g} dB threshold)\n")
+        return 1 if failed else 0
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Runway batch automation benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    scan = subparsers.add_parser("scan", help="Input folder scanning")
+    scan.add_argument("--files", type=int, default=100_000, help="Files in the synthetic tree")
+    scan.add_argument("--files-per-folder", type=int, default=100)
+    scan.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16],
+                      help="Worker counts compared with a serial scan")
+    scan.add_argument("--latency-ms", type=float, default=0.0,
+                      help="Delay added to every directory listing (network share simulation)")
+    scan.add_argument("--repeat", type=int, default=3, help="Runs per setting; the best is reported")
+    scan.set_defaults(func=benchmark_scan)
+
+    body = subparsers.add_parser("body", help="Task request body memory use")
+    body.add_argument("--driver-mb", type=int, default=64, help="Size of the synthetic driver video")
+    body.set_defaults(func=benchmark_body)
+
+    preprocess = subparsers.add_parser("preprocess", help="Character image preprocessing")
+    preprocess.add_argument("--megapixels", type=float, nargs="+", default=[12, 24, 48],
+                            help="Sizes of the synthetic photos")
+    preprocess.add_argument("--images", help="Folder of real photos to use instead")
+    preprocess.add_argument("--min-psnr", type=float, default=38.0,
+                            help="Lowest acceptable PSNR of the fast path against the standard path")
+    preprocess.set_defaults(func=benchmark_preprocess)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
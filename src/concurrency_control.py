@@ -0,0 +1,169 @@
+"""
+Adaptive (AIMD) concurrency control for Act-Two task submissions.
+Raises the number of concurrent submissions while the API accepts them and
+cuts it back on HTTP 429, Retry-After and bursts of 5xx errors.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveConcurrencyController:
+    """Additive-increase / multiplicative-decrease limit on concurrent submissions."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, increase_after: int = 3,
+                 decrease_factor: float = 0.5, error_window: int = 10,
+                 error_threshold: float = 0.3, default_backoff: float = 30.0,
+                 decrease_cooldown: float = 5.0):
+        """
+        Initialize the controller.
+
+        Args:
+            max_limit: Upper bound for concurrent submissions (max_in_flight)
+            min_limit: Lower bound for concurrent submissions
+            increase_after: Consecutive accepted submissions before the limit grows by one
+            decrease_factor: Multiplier applied to the limit on throttling
+            error_window: Number of recent responses used for the 5xx rate
+            error_threshold: 5xx rate above which the limit is cut
+            default_backoff: Pause after a 429 without a Retry-After header
+            decrease_cooldown: Minimum seconds between two decreases, so one
+                burst of rejections only counts once
+        """
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.increase_after = max(1, increase_after)
+        self.decrease_factor = decrease_factor
+        self.error_threshold = error_threshold
+        self.default_backoff = default_backoff
+        self.decrease_cooldown = decrease_cooldown
+
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self._successes = 0
+        self._recent = deque(maxlen=error_window)  # True for 5xx responses
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left before submissions may resume."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def can_start(self) -> bool:
+        """True if another submission may start right now."""
+        with self._condition:
+            return self.in_flight < self.limit and self.paused_for == 0
+
+    def acquire(self):
+        """Block until a submission slot is free and no backoff is active."""
+        with self._condition:
+            while self.in_flight >= self.limit or self.paused_for > 0:
+                self._condition.wait(timeout=self.paused_for or None)
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Take a submission slot if one is free right now, without blocking."""
+        with self._condition:
+            if self.in_flight >= self.limit or self.paused_for > 0:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        """Free a submission slot."""
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._condition.notify_all()
+
+    def wait_for_resume(self):
+        """Block while a Retry-After or backoff pause is active."""
+        with self._condition:
+            while self.paused_for > 0:
+                self._condition.wait(timeout=self.paused_for)
+
+    def record_success(self):
+        """An accepted submission: grow the limit additively."""
+        with self._condition:
+            self._recent.append(False)
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                logger.info(f"Concurrency limit raised to {self.limit}")
+                self._condition.notify_all()
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        """An HTTP 429: pause for Retry-After and cut the limit."""
+        with self._condition:
+            self.throttled += 1
+            pause = retry_after if retry_after is not None else self.default_backoff
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._decrease(f"HTTP 429 (retry after {pause:.0f}s)")
+
+    def record_server_error(self, retry_after: Optional[float] = None):
+        """An HTTP 5xx: cut the limit once the recent error rate is too high."""
+        with self._condition:
+            self.server_errors += 1
+            self._recent.append(True)
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            error_rate = sum(self._recent) / len(self._recent)
+            if len(self._recent) >= 3 and error_rate > self.error_threshold:
+                self._decrease(f"{error_rate:.0%} server errors")
+
+    def _decrease(self, reason: str):
+        """Multiplicative decrease (caller holds the lock)."""
+        self._successes = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit != self.limit:
+            logger.warning(f"Concurrency limit lowered from {self.limit} to {new_limit}: {reason}")
+            self.limit = new_limit
+
+    def describe(self) -> str:
+        """Short status line for progress displays."""
+        with self._condition:
+            text = f"Concurrency {self.in_flight}/{self.limit} (max {self.max_limit})"
+            if self.throttled:
+                text += f" • 429s: {self.throttled}"
+            if self.server_errors:
+                text += f" • 5xx: {self.server_errors}"
+            paused = self.paused_for
+            if paused > 0:
+                text += f" • backing off {paused:.0f}s"
+            return text
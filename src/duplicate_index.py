@@ -0,0 +1,272 @@
+"""
+Index of existing videos for duplicate detection.
+The Downloads/output tree is indexed once and saved to disk together with the
+modification time of every directory; on the next launch only directories whose
+mtime changed are listed again. Lookups only touch the index entries for each
+part of a person's name.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from path_utils import path_manager
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.webm'}
+
+INDEX_VERSION = 1
+
+# Directories modified this recently are rescanned next time, because a file
+# added within the same mtime tick would not change the recorded value
+_MTIME_SETTLE_SECONDS = 2.0
+
+# Name tokens are runs of (Unicode) letters/digits; separators (space, _, -, .) split them
+_TOKEN_SPLIT = re.compile(r'[\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a file stem or person name into upper-cased tokens."""
+    # NFC keeps decomposed accents (as in macOS file names) inside their letter
+    text = unicodedata.normalize('NFC', text).upper()
+    return [token for token in _TOKEN_SPLIT.split(text) if token]
+
+
+def default_index_path() -> Path:
+    """Location of the saved index next to the configuration file."""
+    return path_manager.project_dir / "config" / "duplicate_index.json"
+
+
+class DuplicateIndex:
+    """Token index of video file stems found under a folder (thread-safe lookups and adds)."""
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Create an empty index for a folder.
+
+        Args:
+            root: Folder whose videos the index describes
+        """
+        self.root = Path(root)
+        # Relative directory path -> {"mtime_ns", "videos", "subdirs"}
+        self._dirs: Dict[str, Dict] = {}
+        self._names: List[str] = []
+        self._tokens: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @classmethod
+    def build(cls, root: Union[str, Path]) -> 'DuplicateIndex':
+        """
+        Walk a folder and index every video in it.
+
+        Args:
+            root: Folder to scan recursively
+
+        Returns:
+            Populated DuplicateIndex (empty if the folder does not exist)
+        """
+        index = cls(root)
+        index.refresh()
+        return index
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the folder.
+
+        Directories whose mtime is unchanged since the last scan reuse their
+        recorded contents; only new or modified directories are listed.
+
+        Returns:
+            Number of directories that were listed again
+        """
+        if not self.root.is_dir():
+            logger.warning(f"Downloads folder does not exist: {self.root}")
+            changed = bool(self._dirs)
+            self._dirs = {}
+            if changed:
+                self._reindex()
+            return 0
+
+        now = time.time()
+        visited = {}
+        rescanned = 0
+        stack = ['.']
+        while stack:
+            relative = stack.pop()
+            directory = self.root / relative
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+
+            record = self._dirs.get(relative)
+            if record is None or record['mtime_ns'] != mtime_ns:
+                record = self._scan_directory(directory, mtime_ns, now)
+                rescanned += 1
+            visited[relative] = record
+            stack.extend(os.path.join(relative, name) if relative != '.' else name
+                         for name in record['subdirs'])
+
+        removed = len(set(self._dirs) - set(visited))
+        self._dirs = visited
+        if rescanned or removed or not self._names:
+            self._reindex()
+        logger.info(f"Indexed {len(self)} existing videos in {self.root} "
+                    f"({rescanned} of {len(visited)} directories rescanned)")
+        return rescanned + removed
+
+    @staticmethod
+    def _scan_directory(directory: Path, mtime_ns: int, now: float) -> Dict:
+        """List one directory's videos and subdirectories."""
+        videos, subdirs = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS:
+                            videos.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not list {directory}: {e}")
+
+        settled = now - mtime_ns / 1e9 > _MTIME_SETTLE_SECONDS
+        return {'mtime_ns': mtime_ns if settled else None, 'videos': videos, 'subdirs': subdirs}
+
+    def _reindex(self):
+        """Rebuild the token postings from the directory records."""
+        with self._lock:
+            self._names = []
+            self._tokens = {}
+        for record in self._dirs.values():
+            for name in record['videos']:
+                self.add(name)
+
+    def add(self, filename: Union[str, Path]):
+        """Add a video file to the index."""
+        name = Path(filename).name
+        tokens = set(tokenize(Path(name).stem))
+        with self._lock:
+            entry = len(self._names)
+            self._names.append(name)
+            for token in tokens:
+                self._tokens.setdefault(token, set()).add(entry)
+
+    def covers(self, path: Union[str, Path]) -> bool:
+        """True if a path lies inside the indexed folder."""
+        try:
+            Path(path).resolve().relative_to(self.root.resolve())
+            return True
+        except ValueError:
+            return False
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        Find an existing video whose name contains every part of a person's name.
+
+        Args:
+            name: Person name, e.g. "CIRILA MUNYON"
+
+        Returns:
+            File name of a matching video, or None
+        """
+        parts = tokenize(name)
+        if not parts:
+            return None
+
+        with self._lock:
+            # Intersect the smallest posting lists first
+            postings = sorted((self._tokens.get(part, set()) for part in parts), key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting
+                if not matches:
+                    return None
+            if not matches:
+                return None
+            return self._names[min(matches)]
+
+    @classmethod
+    def load(cls, root: Union[str, Path], index_path: Union[str, Path]) -> 'DuplicateIndex':
+        """
+        Load the saved directory records for a folder without refreshing them.
+
+        Args:
+            root: Folder whose videos the index describes
+            index_path: Saved index file
+
+        Returns:
+            DuplicateIndex (empty if nothing usable was saved for this folder)
+        """
+        index = cls(root)
+        saved = _read_index_file(Path(index_path)).get(str(index.root.resolve()))
+        if saved:
+            index._dirs = saved
+            index._reindex()
+        return index
+
+    def save(self, index_path: Union[str, Path]):
+        """
+        Save the directory records, keeping entries stored for other folders.
+
+        Args:
+            index_path: Saved index file
+        """
+        index_path = Path(index_path)
+        roots = _read_index_file(index_path)
+        roots[str(self.root.resolve())] = self._dirs
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = index_path.with_name(index_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'roots': roots}, f)
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            logger.warning(f"Could not save duplicate index to {index_path}: {e}")
+
+
+def _read_index_file(index_path: Path) -> Dict[str, Dict]:
+    """Read the saved index file, returning {} if it is missing or outdated."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable duplicate index {index_path}: {e}")
+        return {}
+    if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('roots') or {}
+
+
+def load_duplicate_index(root: Union[str, Path], index_path: Union[str, Path, None] = None,
+                         rebuild: bool = False) -> DuplicateIndex:
+    """
+    Get an up-to-date index for a folder, reusing the saved one where possible.
+
+    Args:
+        root: Folder to index
+        index_path: Saved index file (defaults to config/duplicate_index.json)
+        rebuild: Ignore the saved index and scan every directory
+
+    Returns:
+        Refreshed DuplicateIndex; the saved file is updated if anything changed
+    """
+    index_path = Path(index_path or default_index_path())
+    index = DuplicateIndex(root) if rebuild else DuplicateIndex.load(root, index_path)
+    if index.refresh() or rebuild:
+        index.save(index_path)
+    return index
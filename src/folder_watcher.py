@@ -0,0 +1,344 @@
+"""
+Watch an input root for images that arrive or change while running.
+Uses inotify on Linux, so new files are seen as soon as they are written,
+and falls back to polling with scandir snapshots elsewhere (and on network
+shares, where inotify does not see remote writes). Matching uses the same
+ImageScanner as a full scan (image_search_pattern, exact_match, scan depth),
+and an image is only reported once its size and modification time have
+stopped changing, so files still being copied are never picked up.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from image_scanner import ImageScanner, ScannedImage
+
+logger = logging.getLogger(__name__)
+
+# Seconds between snapshots when polling
+DEFAULT_POLL_INTERVAL = 5.0
+
+# Seconds an image's size and modification time must stay unchanged before it is reported
+DEFAULT_SETTLE_TIME = 2.0
+
+# Full rescans while using inotify, catching anything the events missed
+DEFAULT_RESYNC_INTERVAL = 300.0
+
+# Change kinds
+NEW = 'new'          # Not seen before (or removed and added again)
+CHANGED = 'changed'  # Seen before, with a different size or modification time
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+Signature = Tuple[int, float]  # Size and modification time
+
+
+@dataclass(frozen=True)
+class ImageChange:
+    """An image that arrived or changed and has finished being written."""
+    kind: str
+    image: ScannedImage
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes (Linux only)."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.folders: Dict[int, str] = {}  # Watch descriptor -> folder
+
+    def add(self, folder: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), folder)
+        self.folders[wd] = folder
+        return wd
+
+    def read(self) -> List[Tuple[Optional[str], str, int]]:
+        """Drain pending events as (watched folder, name, mask)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((self.folders.get(wd), name, mask))
+                if mask & _IN_IGNORED:
+                    self.folders.pop(wd, None)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """Reports images that arrive or change below an input root."""
+
+    def __init__(self, root: Union[str, Path], scanner: Optional[ImageScanner] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, settle_time: float = DEFAULT_SETTLE_TIME,
+                 use_inotify: bool = True, resync_interval: float = DEFAULT_RESYNC_INTERVAL):
+        """
+        Initialize the watcher.
+
+        Args:
+            root: Input folder whose batch folders are watched
+            scanner: Scanner defining which images and folders count (default 'genx')
+            poll_interval: Seconds between snapshots when polling
+            settle_time: Seconds an image must stay unchanged before it is reported
+            use_inotify: Use inotify where available (disable for network shares)
+            resync_interval: Seconds between safety rescans while using inotify
+        """
+        self.root = str(root)
+        self.scanner = scanner or ImageScanner()
+        self.poll_interval = max(0.1, float(poll_interval))
+        self.settle_time = max(0.0, float(settle_time))
+        self.use_inotify = use_inotify
+        self.resync_interval = max(self.poll_interval, float(resync_interval))
+        self.backend = None  # 'inotify' or 'polling' once watching
+        self._inotify: Optional[_Inotify] = None
+        self._known: Dict[str, Signature] = {}  # Reported (or baseline) images
+        self._pending: Dict[str, Tuple[Signature, float]] = {}  # Path -> (signature, unchanged since)
+        self._stopped = threading.Event()
+        self._wake_read, self._wake_write = None, None
+
+    @property
+    def stopped(self) -> bool:
+        """True once stop() has been called."""
+        return self._stopped.is_set()
+
+    def stop(self):
+        """Make changes() return after its current wait (safe from any thread or signal handler)."""
+        self._stopped.set()
+        if self._wake_write is not None:
+            try:
+                os.write(self._wake_write, b'x')
+            except OSError:
+                pass
+
+    def _depth(self, folder: str) -> int:
+        return len(Path(folder).relative_to(self.root).parts)
+
+    def _start_inotify(self):
+        if not self.use_inotify:
+            return
+        try:
+            self._inotify = _Inotify()
+            self._wake_read, self._wake_write = os.pipe()
+            os.set_blocking(self._wake_read, False)
+            self._inotify.add(self.root)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable, polling every {self.poll_interval:g}s: {e}")
+            self._stop_inotify()
+
+    def _stop_inotify(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+        for fd in (self._wake_read, self._wake_write):
+            if fd is not None:
+                os.close(fd)
+        self._wake_read, self._wake_write = None, None
+
+    def _watch_folders(self, folders) -> List[str]:
+        """Add inotify watches for folders not watched yet; returns the new ones."""
+        if not self._inotify:
+            return []
+        watched = set(self._inotify.folders.values())
+        added = []
+        for folder in folders:
+            if folder in watched:
+                continue
+            try:
+                self._inotify.add(folder)
+                added.append(folder)
+            except OSError as e:
+                if os.path.isdir(folder):
+                    # Typically the max_user_watches limit; polling still sees everything
+                    logger.warning(f"Could not watch {folder}, switching to polling: {e}")
+                    self._stop_inotify()
+                    self.backend = 'polling'
+                    return []
+        return added
+
+    def _observe(self, path: str, now: float, signature: Optional[Signature] = None):
+        """Record the current state of one image path (stat'ed unless the scan already did)."""
+        if signature is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._known.pop(path, None)
+                self._pending.pop(path, None)
+                return
+            signature = (stat.st_size, stat.st_mtime)
+        if self._known.get(path) == signature:
+            self._pending.pop(path, None)
+        elif path not in self._pending or self._pending[path][0] != signature:
+            self._pending[path] = (signature, now)
+
+    def _matches(self, folder: Optional[str], name: str) -> bool:
+        if folder is None or os.path.splitext(name)[1].lower() not in self.scanner.extensions:
+            return False
+        # Images directly in the root are not part of a batch
+        return self._depth(folder) >= 1 and self.scanner.matcher.matches(name)
+
+    def _resync(self, now: float):
+        """Take a full snapshot and compare it with the known images."""
+        plan = self.scanner.scan(self.root)
+        current = {image.path: (image.size, image.mtime) for image in plan.images}
+        for path in list(self._known):
+            if path not in current:
+                del self._known[path]
+        for path in list(self._pending):
+            if path not in current:
+                del self._pending[path]
+        for path, signature in current.items():
+            self._observe(path, now, signature)
+        # Images written before a new folder's watch was in place
+        for folder in self._watch_folders((self.root,) + plan.folders):
+            if self._depth(folder) >= 1:
+                for image in self.scanner.scan_folder(folder)[0]:
+                    self._observe(image.path, now, (image.size, image.mtime))
+
+    def _settled(self, now: float) -> List[ImageChange]:
+        """Pending images that have stopped changing, checked once more on disk."""
+        ready = []
+        for path, (signature, since) in list(self._pending.items()):
+            if now - since < self.settle_time:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime) != signature:
+                self._pending[path] = ((stat.st_size, stat.st_mtime), now)
+                continue
+            del self._pending[path]
+            kind = CHANGED if path in self._known else NEW
+            self._known[path] = signature
+            ready.append(ImageChange(kind, ScannedImage(path=path, name=os.path.basename(path),
+                                                        folder=os.path.dirname(path),
+                                                        size=signature[0], mtime=signature[1])))
+        ready.sort(key=lambda change: change.image.path.upper())
+        return ready
+
+    def _wait_for_events(self, timeout: float, now: float) -> bool:
+        """Wait for inotify events, observing touched images; True if a rescan is needed."""
+        readable, _, _ = select.select([self._inotify.fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            try:
+                os.read(self._wake_read, 1024)
+            except BlockingIOError:
+                pass
+        if self._inotify.fd not in readable:
+            return False
+        resync = False
+        for folder, name, mask in self._inotify.read():
+            if mask & (_IN_Q_OVERFLOW | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                resync = True
+            elif mask & _IN_ISDIR:
+                # A folder came or went; rescan to update watches and images
+                resync = resync or bool(mask & (_IN_CREATE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE) and self._matches(folder, name):
+                self._observe(os.path.join(folder, name), now)
+        return resync
+
+    def changes(self, include_existing: bool = False) -> Iterator[List[ImageChange]]:
+        """
+        Watch until stop() is called, yielding each group of settled changes.
+
+        A watcher is used once: after stop(), changes() returns immediately.
+
+        Args:
+            include_existing: Report the images already present as NEW first;
+                otherwise they are the baseline and only later changes are reported
+
+        Yields:
+            Non-empty lists of ImageChange, sorted by path
+        """
+        self._known.clear()
+        self._pending.clear()
+        # Watch before the first scan, so nothing written during it is missed
+        self._start_inotify()
+        self.backend = 'inotify' if self._inotify else 'polling'
+        try:
+            now = time.monotonic()
+            self._resync(now)
+            if include_existing:
+                # Files that have not been written to recently are ready at once
+                cutoff = time.time() - self.settle_time
+                for path, (signature, _) in self._pending.items():
+                    if signature[1] <= cutoff:
+                        self._pending[path] = (signature, now - self.settle_time)
+            else:
+                for path, (signature, _) in self._pending.items():
+                    self._known[path] = signature
+                self._pending.clear()
+            logger.info(f"Watching {self.root} ({self.backend}): {len(self._known) + len(self._pending)} images")
+
+            last_scan = now
+            while not self._stopped.is_set():
+                now = time.monotonic()
+                ready = self._settled(now)
+                if ready:
+                    yield ready
+                    continue
+
+                scan_interval = self.resync_interval if self._inotify else self.poll_interval
+                timeout = last_scan + scan_interval - now
+                if self._pending:
+                    timeout = min(timeout, min(since for _, since in self._pending.values()) + self.settle_time - now)
+                timeout = max(0.05, timeout)
+
+                resync = False
+                if self._inotify:
+                    resync = self._wait_for_events(timeout, time.monotonic())
+                elif self._stopped.wait(timeout):
+                    break
+                now = time.monotonic()
+                if resync or now - last_scan >= scan_interval:
+                    self._resync(now)
+                    last_scan = now
+        finally:
+            self._stop_inotify()
@@ -0,0 +1,91 @@
+"""
+Generator construction from configuration.
+Maps the settings stored in config/runway_config.json to a configured
+RunwayActTwoBatchGenerator, its caches and image scanner. Kept free of UI
+imports so the interactive menu, the async API and scripts all build
+generators the same way.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from path_utils import path_manager
+from runway_generator import RunwayActTwoBatchGenerator
+from rate_limiter import RateLimiter, create_rate_limiter
+from image_scanner import ImageScanner, DEFAULT_SCAN_DEPTH
+from directory_walker import DEFAULT_WALK_WORKERS
+from folder_watcher import FolderWatcher, DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_TIME
+from preprocessing_stage import DEFAULT_PREPROCESS_WORKERS, DEFAULT_PREPROCESS_LOOKAHEAD
+from payload_cache import (DriverPayloadCache, PreprocessedImageCache, DEFAULT_DRIVER_CACHE_BYTES,
+                           DEFAULT_IMAGE_CACHE_BYTES)
+
+
+def create_payload_cache(config: Dict[str, Any]) -> DriverPayloadCache:
+    """Driver video payload cache sized from the configuration"""
+    max_mb = config.get('driver_cache_mb', DEFAULT_DRIVER_CACHE_BYTES // (1024 * 1024))
+    return DriverPayloadCache(max_bytes=int(max_mb) * 1024 * 1024)
+
+
+def create_image_cache(config: Dict[str, Any]) -> Optional[PreprocessedImageCache]:
+    """Preprocessed image cache sized from the configuration (None when set to 0)"""
+    max_mb = int(config.get('image_cache_mb', DEFAULT_IMAGE_CACHE_BYTES // (1024 * 1024)))
+    if max_mb <= 0:
+        return None
+    return PreprocessedImageCache(max_bytes=max_mb * 1024 * 1024,
+                                  fast=config.get('fast_preprocessing', True))
+
+
+def create_request_limiter(config: Dict[str, Any]) -> RateLimiter:
+    """Rate limiter the generator enforces, including the create limit derived from delay_between_generations"""
+    return create_rate_limiter(config.get('rate_limits'), config.get('delay_between_generations'))
+
+
+def create_image_scanner(config: Dict[str, Any]) -> ImageScanner:
+    """Image scanner for the configured search pattern and scan settings"""
+    return ImageScanner(
+        config.get('image_search_pattern', 'genx'),
+        config.get('exact_match', False),
+        workers=config.get('scan_workers', DEFAULT_WALK_WORKERS),
+        max_depth=config.get('scan_max_depth', DEFAULT_SCAN_DEPTH)
+    )
+
+
+def create_folder_watcher(config: Dict[str, Any], root: Union[str, Path]) -> FolderWatcher:
+    """Watcher for an input folder, matching images like the configured scanner"""
+    return FolderWatcher(
+        root,
+        scanner=create_image_scanner(config),
+        poll_interval=config.get('watch_poll_interval', DEFAULT_POLL_INTERVAL),
+        settle_time=config.get('watch_settle_seconds', DEFAULT_SETTLE_TIME),
+        use_inotify=config.get('watch_use_inotify', True)
+    )
+
+
+def create_generator(config: Dict[str, Any], verbose: bool = False) -> RunwayActTwoBatchGenerator:
+    """
+    Build a generator from configuration.
+
+    Args:
+        config: Configuration values (keys as in config/runway_config.json);
+            missing keys use the same defaults as the interactive menu
+        verbose: Verbose generator output
+
+    Returns:
+        RunwayActTwoBatchGenerator; close() it when done
+    """
+    return RunwayActTwoBatchGenerator(
+        config.get('api_key', ''),
+        verbose=verbose,
+        driver_video_path=config.get('driver_video'),
+        base_url=config.get('base_url'),
+        polling_strategy=config.get('polling_strategy', 'eta'),
+        rate_limiter=create_request_limiter(config),
+        payload_cache=create_payload_cache(config),
+        driver_upload=config.get('driver_upload', True),
+        preprocessed_debug_dir=(str(path_manager.project_dir / "temp_resized")
+                                if config.get('keep_preprocessed_images', False) else None),
+        image_cache=create_image_cache(config),
+        fast_preprocessing=config.get('fast_preprocessing', True),
+        preprocess_workers=int(config.get('preprocess_workers', DEFAULT_PREPROCESS_WORKERS)),
+        preprocess_lookahead=int(config.get('preprocess_lookahead', DEFAULT_PREPROCESS_LOOKAHEAD))
+    )
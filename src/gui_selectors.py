@@ -6,118 +6,22 @@ Provides easy file/folder selection with validation and video duration detection
 import os
 import sys
 import json
-import subprocess
 from pathlib import Path
 from typing import Optional, Tuple
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import threading
 
-# Try to import video duration libraries
-try:
-    import cv2
-    HAS_CV2 = True
-except ImportError:
-    HAS_CV2 = False
-
-try:
-    from moviepy.editor import VideoFileClip
-    HAS_MOVIEPY = True
-except ImportError:
-    HAS_MOVIEPY = False
-
 try:
     from .path_utils import path_manager
+    from .video_info import VideoInfo
+    from .rate_limiter import create_rate_limiter
+    from .image_scanner import scan_images
 except ImportError:
     from path_utils import path_manager
-
-class VideoInfo:
-    """Utility class for video file information."""
-
-    @staticmethod
-    def get_duration_ffprobe(video_path: str) -> Optional[float]:
-        """Get video duration using ffprobe (if available)."""
-        try:
-            cmd = [
-                'ffprobe', '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(video_path)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except (subprocess.SubprocessError, ValueError, FileNotFoundError):
-            pass
-        return None
-
-    @staticmethod
-    def get_duration_cv2(video_path: str) -> Optional[float]:
-        """Get video duration using OpenCV."""
-        if not HAS_CV2:
-            return None
-        try:
-            cap = cv2.VideoCapture(str(video_path))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            cap.release()
-            if fps > 0:
-                return frame_count / fps
-        except:
-            pass
-        return None
-
-    @staticmethod
-    def get_duration_moviepy(video_path: str) -> Optional[float]:
-        """Get video duration using MoviePy."""
-        if not HAS_MOVIEPY:
-            return None
-        try:
-            clip = VideoFileClip(str(video_path))
-            duration = clip.duration
-            clip.close()
-            return duration
-        except:
-            pass
-        return None
-
-    @staticmethod
-    def get_duration(video_path: str) -> Tuple[Optional[float], str]:
-        """
-        Get video duration using available methods.
-
-        Returns:
-            Tuple of (duration_in_seconds, formatted_string)
-        """
-        if not video_path or not Path(video_path).exists():
-            return None, "File not found"
-
-        # Try different methods in order of preference
-        methods = [
-            ('ffprobe', VideoInfo.get_duration_ffprobe),
-            ('opencv', VideoInfo.get_duration_cv2),
-            ('moviepy', VideoInfo.get_duration_moviepy),
-        ]
-
-        for method_name, method_func in methods:
-            duration = method_func(video_path)
-            if duration is not None:
-                # Format duration nicely
-                if duration < 60:
-                    formatted = f"{duration:.1f}s"
-                else:
-                    minutes = int(duration // 60)
-                    seconds = int(duration % 60)
-                    formatted = f"{minutes}:{seconds:02d}"
-                return duration, formatted
-
-        # If no method worked, return file size as fallback info
-        try:
-            size_mb = Path(video_path).stat().st_size / (1024 * 1024)
-            return None, f"{size_mb:.1f}MB"
-        except:
-            return None, "Unknown"
-
+    from video_info import VideoInfo
+    from rate_limiter import create_rate_limiter
+    from image_scanner import scan_images
 
 class GUISelectors:
     """GUI file and folder selection dialogs."""
@@ -279,12 +183,16 @@ class GUISelectors:
             return str(folder_path), 0
         return None
 
-    def select_input_folder_with_scan(self, current_folder: Optional[str] = None) -> Optional[Tuple[str, int]]:
+    def select_input_folder_with_scan(self, current_folder: Optional[str] = None,
+                                      search_pattern: str = 'genx',
+                                      exact_match: bool = False) -> Optional[Tuple[str, int]]:
         """
         Open dialog to select input folder and scan for images.
 
         Args:
             current_folder: Currently selected folder path
+            search_pattern: Image search pattern
+            exact_match: Match the pattern as a complete filename segment
 
         Returns:
             Tuple of (folder_path, image_count) or None if cancelled
@@ -309,15 +217,10 @@ class GUISelectors:
         if folder_path:
             path = Path(folder_path)
 
-            # Scan for images recursively
-            image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'}
-            image_files = []
-
-            for ext in image_extensions:
-                image_files.extend(path.rglob(f"*{ext}"))
-
-            # Filter for GenX images if needed (or all images)
-            genx_images = [img for img in image_files if 'genx' in img.name.lower()]
+            # Scan the batch folders once
+            plan = scan_images(path, search_pattern, exact_match)
+            genx_images = plan.images
+            total_images = len(plan) + plan.unmatched_images
 
             # Show scan results
             self._ensure_tk_root()
@@ -327,24 +230,24 @@ class GUISelectors:
                 message += f"Folder: {path.name}\n"
                 message += f"Full path: {path}\n"
                 message += f"Total GenX images: {len(genx_images)}\n"
-                message += f"Total all images: {len(image_files)}"
+                message += f"Total all images: {total_images}"
 
                 messagebox.showinfo("Images Found", message)
                 self._cleanup_tk()
                 return str(path), len(genx_images)
-            elif image_files:
+            elif total_images:
                 # No GenX images but other images found
                 self._ensure_tk_root()
                 result = messagebox.askyesno(
                     "No GenX Images",
-                    f"No 'GenX' images found, but {len(image_files)} other images exist.\n\n"
-                    f"Process all {len(image_files)} images?",
+                    f"No '{search_pattern}' images found, but {total_images} other images exist.\n\n"
+                    f"Process all {total_images} images?",
                     icon="question"
                 )
                 self._cleanup_tk()
 
                 if result:
-                    return str(path), len(image_files)
+                    return str(path), total_images
             else:
                 # No images at all
                 messagebox.showwarning(
@@ -408,7 +311,7 @@ class GUISelectors:
         lines.append("\nSettings:")
         lines.append(f"• Verbose Logging: {'Enabled' if config.get('verbose_logging') else 'Disabled'}")
         lines.append(f"• Duplicate Detection: {'Enabled' if config.get('duplicate_detection') else 'Disabled'}")
-        lines.append(f"• Generation Delay: {config.get('delay_between_generations', 1)} seconds")
+        lines.append(f"• Rate Limits: {create_rate_limiter(config.get('rate_limits'), config.get('delay_between_generations')).describe()}")
 
         message = "\n".join(lines)
 
@@ -0,0 +1,93 @@
+"""
+Shared HTTP transport for RunwayML requests.
+One requests.Session per generator keeps connections to the API and the
+output CDN alive between calls, so task submissions, status polls and
+downloads reuse TCP/TLS connections instead of handshaking every time.
+Every request gets a timeout, and idempotent requests are retried on
+connection failures.
+"""
+
+import logging
+import threading
+from typing import Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Connections kept per host; enough for several tasks in flight plus polling and downloads
+DEFAULT_POOL_SIZE = 10
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (10, 60)
+SUBMIT_TIMEOUT = (10, 180)   # Task creation reads the whole inline payload first
+
+# Retries of idempotent requests (GET/HEAD) after connection errors. HTTP 429
+# and 5xx answers are not retried here: the poller and the adaptive
+# concurrency controller act on them.
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class HTTPTransport:
+    """Pooled, keep-alive requests session with timeouts and a retry policy."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: Timeout = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Connections kept open per host
+            timeout: Default (connect, read) timeout for requests that don't pass one
+            retries: Attempts after a failed connection or read on GET/HEAD requests
+            backoff_factor: Base of the exponential delay between retries
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = 0
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self.ensure_pool_size(pool_size)
+
+    def _retry_policy(self) -> Retry:
+        return Retry(total=self.retries, connect=self.retries, read=self.retries,
+                     status=0, allowed_methods=frozenset({'GET', 'HEAD'}),
+                     backoff_factor=self.backoff_factor, raise_on_status=False)
+
+    def ensure_pool_size(self, pool_size: int):
+        """
+        Grow the connection pools, e.g. before raising the number of tasks in flight.
+
+        Args:
+            pool_size: Connections needed per host
+        """
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size,
+                                  max_retries=self._retry_policy())
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session, applying the default timeout."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
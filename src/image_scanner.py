@@ -0,0 +1,242 @@
+"""
+Single-pass image scanner shared by the UI, dry run and generator.
+Folders are listed once with os.scandir (in parallel via ParallelDirectoryWalker),
+the search pattern is compiled once, and the result is returned as an
+immutable ScanPlan that every caller reuses.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from directory_walker import ParallelDirectoryWalker, DEFAULT_WALK_WORKERS
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'})
+
+# Batch folders are the direct subfolders of the input root
+DEFAULT_SCAN_DEPTH = 1
+
+
+class PatternMatcher:
+    """Filename matcher for the configured image search pattern, compiled once."""
+
+    def __init__(self, pattern: str = 'genx', exact_match: bool = False):
+        """
+        Initialize the matcher.
+
+        Args:
+            pattern: Text that must appear in the filename (case-insensitive)
+            exact_match: Require the pattern as a complete segment, bounded by
+                non-alphanumeric characters or the start/end of the name
+        """
+        self.pattern = pattern.lower()
+        self.exact_match = exact_match
+        self._regex = None
+        if exact_match:
+            self._regex = re.compile(r'(^|[^a-z0-9])' + re.escape(self.pattern) + r'([^a-z0-9]|$)')
+
+    def matches(self, filename: str) -> bool:
+        """True if a filename matches the pattern."""
+        filename_lower = filename.lower()
+        if self._regex is not None:
+            return self._regex.search(filename_lower) is not None
+        return self.pattern in filename_lower
+
+
+@dataclass(frozen=True)
+class ScannedImage:
+    """An image file found by the scanner, with the stat data read during the scan."""
+    path: str
+    name: str
+    folder: str
+    size: int
+    mtime: float
+
+
+@dataclass(frozen=True)
+class ScanPlan:
+    """Result of scanning an input root: its batch folders and matching images."""
+    root: str
+    pattern: str
+    exact_match: bool
+    folders: Tuple[str, ...]               # Batch folders, in sorted pre-order
+    images: Tuple[ScannedImage, ...]       # Matching images, in folder then name order
+    unmatched_images: int = 0              # Images that did not match the pattern
+    _by_folder: Dict[str, Tuple[ScannedImage, ...]] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        by_folder: Dict[str, List[ScannedImage]] = {}
+        for image in self.images:
+            by_folder.setdefault(image.folder, []).append(image)
+        object.__setattr__(self, '_by_folder', {k: tuple(v) for k, v in by_folder.items()})
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    @property
+    def total_size(self) -> int:
+        return sum(image.size for image in self.images)
+
+    @property
+    def folders_with_images(self) -> Tuple[str, ...]:
+        """Batch folders that contain at least one matching image."""
+        return tuple(folder for folder in self.folders if folder in self._by_folder)
+
+    def images_in(self, folder: str) -> Tuple[ScannedImage, ...]:
+        """Matching images directly inside one batch folder."""
+        return self._by_folder.get(str(folder), ())
+
+    def relative_path(self, image: ScannedImage) -> Path:
+        """Path of an image relative to the scanned root."""
+        return Path(image.path).relative_to(self.root)
+
+
+class ImageScanner:
+    """Finds images matching a pattern using one os.scandir pass per folder."""
+
+    def __init__(self, pattern: str = 'genx', exact_match: bool = False,
+                 extensions: frozenset = IMAGE_EXTENSIONS, workers: int = DEFAULT_WALK_WORKERS,
+                 max_depth: Optional[int] = DEFAULT_SCAN_DEPTH,
+                 walker: Optional[ParallelDirectoryWalker] = None):
+        """
+        Initialize the scanner.
+
+        Args:
+            pattern: Image search pattern
+            exact_match: Match the pattern as a complete segment
+            extensions: Lower-case file extensions treated as images
+            workers: Folders listed in parallel
+            max_depth: Deepest folder level scanned below the root (1 = direct
+                subfolders only, None = unlimited); every folder found is a batch folder
+            walker: Pre-configured walker, overriding workers and max_depth
+        """
+        self.pattern = pattern
+        self.exact_match = exact_match
+        self.matcher = PatternMatcher(pattern, exact_match)
+        self.extensions = extensions
+        self.walker = walker or ParallelDirectoryWalker(workers=workers, max_depth=max_depth)
+        self.walker.file_handler = self._collect_images
+
+    def _collect_images(self, folder: str, entries: List[os.DirEntry]) -> Tuple[List[ScannedImage], int]:
+        """Filter one folder's entries to matching images (runs on walker threads)."""
+        matching = []
+        unmatched = 0
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                if not self.matcher.matches(entry.name):
+                    unmatched += 1
+                    continue
+                # DirEntry caches stat data (free on Windows, one call elsewhere)
+                stat = entry.stat()
+            except OSError:
+                continue
+            matching.append(ScannedImage(path=entry.path, name=entry.name, folder=folder,
+                                         size=stat.st_size, mtime=stat.st_mtime))
+
+        matching.sort(key=lambda image: image.name.upper())
+        return matching, unmatched
+
+    def scan_folder(self, folder: Union[str, Path]) -> Tuple[List[ScannedImage], int]:
+        """
+        List the images directly inside one folder.
+
+        Args:
+            folder: Folder to list (not recursive)
+
+        Returns:
+            Tuple of (matching images sorted by name, number of non-matching images)
+        """
+        folder = str(folder)
+        try:
+            with os.scandir(folder) as entries:
+                return self._collect_images(folder, list(entries))
+        except OSError as e:
+            logger.warning(f"Could not scan folder {folder}: {e}")
+            return [], 0
+
+    def list_folders(self, root: Union[str, Path]) -> List[str]:
+        """Direct subfolders of a root, sorted alphabetically by name."""
+        folders = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            folders.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not scan root directory {root}: {e}")
+        folders.sort(key=lambda path: os.path.basename(path).upper())
+        return folders
+
+    def iter_folders(self, root: Union[str, Path]) -> Iterator[Tuple[str, List[ScannedImage], int]]:
+        """
+        Scan an input root lazily, one batch folder at a time.
+
+        Every folder below the root (down to max_depth) is a batch folder whose
+        images are processed. Folders are listed in parallel but yielded in
+        sorted order as soon as they are ready, so callers can start working
+        before the whole tree has been scanned.
+
+        Args:
+            root: Input folder selected by the user
+
+        Yields:
+            Tuples of (folder, matching images, number of non-matching images)
+        """
+        for listing in self.walker.walk(str(root)):
+            if listing.depth == 0:
+                continue  # Images directly in the root are not part of a batch
+            matching, unmatched = listing.files
+            yield listing.path, matching, unmatched
+
+    def scan(self, root: Union[str, Path]) -> ScanPlan:
+        """
+        Scan a whole input root.
+
+        Args:
+            root: Input folder selected by the user
+
+        Returns:
+            ScanPlan with every matching image
+        """
+        root = str(root)
+        folders = []
+        images = []
+        unmatched = 0
+        for folder, matching, skipped in self.iter_folders(root):
+            folders.append(folder)
+            images.extend(matching)
+            unmatched += skipped
+
+        logger.info(f"Scanned {len(folders)} folders in {root}: {len(images)} images match '{self.pattern}'")
+        return ScanPlan(root=root, pattern=self.pattern, exact_match=self.exact_match,
+                        folders=tuple(folders), images=tuple(images), unmatched_images=unmatched)
+
+
+def scan_images(root: Union[str, Path], pattern: str = 'genx', exact_match: bool = False,
+                workers: int = DEFAULT_WALK_WORKERS, max_depth: Optional[int] = DEFAULT_SCAN_DEPTH) -> ScanPlan:
+    """
+    Scan an input root for images matching the search pattern.
+
+    Args:
+        root: Input folder
+        pattern: Image search pattern
+        exact_match: Match the pattern as a complete segment
+        workers: Folders listed in parallel
+        max_depth: Deepest folder level scanned below the root
+
+    Returns:
+        ScanPlan shared by counting, previews and processing
+    """
+    return ImageScanner(pattern, exact_match, workers=workers, max_depth=max_depth).scan(root)
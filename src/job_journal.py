@@ -0,0 +1,181 @@
+"""
+Persistent SQLite journal of Act-Two jobs.
+Every state transition is committed immediately, so a crashed batch can be
+resumed: tasks already created are adopted instead of paid for again.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Union
+
+from path_utils import path_manager
+
+logger = logging.getLogger(__name__)
+
+# Job states, in the order a job normally moves through them
+PENDING = 'PENDING'          # About to be submitted; no task ID known yet
+SUBMITTED = 'SUBMITTED'      # Task created on the server, not finished yet
+SUCCEEDED = 'SUCCEEDED'      # Task finished on the server, video not downloaded yet
+DOWNLOADED = 'DOWNLOADED'    # Video saved to output_path
+FAILED = 'FAILED'            # Submission, generation or download failed
+
+# States whose task can be adopted on restart instead of submitting again
+ADOPTABLE_STATES = (SUBMITTED, SUCCEEDED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    image_path   TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    root         TEXT,
+    task_id      TEXT,
+    state        TEXT NOT NULL,
+    output_path  TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    submitted_at REAL,
+    updated_at   REAL NOT NULL,
+    download_failures INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (image_path, content_hash)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+"""
+
+
+def default_journal_path() -> Path:
+    """Location of the journal next to the configuration file."""
+    return path_manager.project_dir / "config" / "job_journal.sqlite3"
+
+
+@dataclass
+class JournalEntry:
+    """One row of the job journal."""
+    image_path: str
+    content_hash: str
+    root: Optional[str]
+    task_id: Optional[str]
+    state: str
+    output_path: Optional[str]
+    error: Optional[str]
+    created_at: float
+    submitted_at: Optional[float]
+    updated_at: float
+    download_failures: int = 0  # Failed downloads of the current task's video
+
+
+class JobJournal:
+    """Thread-safe SQLite journal keyed by (image path, content hash)."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (or create) the journal database.
+
+        Args:
+            db_path: Location of the SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if 'download_failures' not in columns:
+                # Journal created before download failures were counted
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN download_failures INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def lookup(self, image_path: str, content_hash: str) -> Optional[JournalEntry]:
+        """Get the journal entry for an image, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE image_path = ? AND content_hash = ?",
+                (image_path, content_hash)
+            ).fetchone()
+        return JournalEntry(**dict(row)) if row else None
+
+    def record(self, image_path: str, content_hash: str, state: str, root: Optional[str] = None,
+               task_id: Optional[str] = None, output_path: Optional[str] = None,
+               error: Optional[str] = None):
+        """
+        Record a state transition and commit it immediately.
+
+        Fields passed as None keep their previous value, except error: every
+        transition replaces it, so one recorded without an error clears it.
+        A new submission (PENDING or SUBMITTED) resets the download failure count.
+        """
+        now = time.time()
+        submitted_at = now if state == SUBMITTED else None
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (image_path, content_hash, root, task_id, state, output_path,
+                                  error, created_at, submitted_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (image_path, content_hash) DO UPDATE SET
+                    root = COALESCE(excluded.root, root),
+                    task_id = COALESCE(excluded.task_id, task_id),
+                    state = excluded.state,
+                    output_path = COALESCE(excluded.output_path, output_path),
+                    error = excluded.error,
+                    submitted_at = COALESCE(excluded.submitted_at, submitted_at),
+                    updated_at = excluded.updated_at,
+                    download_failures = CASE WHEN excluded.state IN (?, ?) THEN 0
+                                             ELSE download_failures END
+                """,
+                (image_path, content_hash, root, task_id, state, output_path, error,
+                 now, submitted_at, now, PENDING, SUBMITTED)
+            )
+            self._conn.commit()
+
+    def record_download_failure(self, image_path: str, content_hash: str, error: str,
+                                root: Optional[str] = None) -> int:
+        """
+        Record a failed download of a succeeded task's video; the entry stays SUCCEEDED.
+
+        Returns:
+            Number of failed downloads of this task so far
+        """
+        self.record(image_path, content_hash, SUCCEEDED, root=root, error=error)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET download_failures = download_failures + 1 "
+                "WHERE image_path = ? AND content_hash = ?",
+                (image_path, content_hash)
+            )
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT download_failures FROM jobs WHERE image_path = ? AND content_hash = ?",
+                (image_path, content_hash)
+            ).fetchone()
+        return row['download_failures']
+
+    def entries(self, root: Optional[str] = None, states: Optional[tuple] = None) -> List[JournalEntry]:
+        """
+        List journal entries.
+
+        Args:
+            root: Only entries recorded for this input root
+            states: Only entries in one of these states
+        """
+        query = "SELECT * FROM jobs WHERE 1 = 1"
+        params = []
+        if root is not None:
+            query += " AND root = ?"
+            params.append(root)
+        if states:
+            query += f" AND state IN ({', '.join('?' for _ in states)})"
+            params.extend(states)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return [JournalEntry(**dict(row)) for row in rows]
@@ -0,0 +1,320 @@
+"""
+Local stand-in for the RunwayML API.
+Serves /character_performance, /tasks/{id}, /uploads and task outputs from a
+background thread so the generator, poller and pipeline can be exercised offline.
+"""
+
+import json
+import re
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+def mp4_box(box_type: bytes, payload: bytes = b'') -> bytes:
+    """Encode an MP4 box."""
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def make_mock_video(media_bytes: int = 1024) -> bytes:
+    """Smallest file that passes VideoInfo.check_mp4: ftyp, moov and mdat boxes."""
+    return (mp4_box(b'ftyp', b'isom\x00\x00\x02\x00isomiso2mp41') + mp4_box(b'moov')
+            + mp4_box(b'mdat', b'\x00' * media_bytes))
+
+
+class _MockTask:
+    """A fake generation task that succeeds after a fixed duration."""
+
+    def __init__(self, task_id: str, duration: float, fail: bool = False):
+        self.task_id = task_id
+        self.created_at = time.monotonic()
+        self.duration = duration
+        self.fail = fail
+
+    def status(self) -> str:
+        elapsed = time.monotonic() - self.created_at
+        if elapsed < self.duration * 0.2:
+            return 'PENDING'
+        if elapsed < self.duration:
+            return 'RUNNING'
+        return 'FAILED' if self.fail else 'SUCCEEDED'
+
+
+class MockRunwayAPI:
+    """In-process HTTP server imitating the RunwayML endpoints used by this tool."""
+
+    def __init__(self, task_duration: float = 2.0, output_bytes: Optional[bytes] = None,
+                 fail_every: int = 0, throttle_creates: int = 0, retry_after: float = 1.0,
+                 interrupt_downloads: int = 0):
+        """
+        Initialize the mock API.
+
+        Args:
+            task_duration: Seconds each task takes before it succeeds
+            output_bytes: Content served as the generated video (a minimal MP4 by default)
+            fail_every: If set, every Nth created task ends in FAILED
+            throttle_creates: Number of task creations answered with HTTP 429 first
+            retry_after: Retry-After seconds sent with throttled responses
+            interrupt_downloads: Number of output downloads cut off halfway through first
+        """
+        self.task_duration = task_duration
+        self.output_bytes = output_bytes if output_bytes is not None else make_mock_video()
+        self.fail_every = fail_every
+        self.throttle_creates = throttle_creates
+        self.retry_after = retry_after
+        self.interrupt_downloads = interrupt_downloads
+
+        self.tasks: Dict[str, _MockTask] = {}
+        self.uploads: Dict[str, Optional[int]] = {}  # Upload ID -> bytes received (None until uploaded)
+        self.reference_bytes = 0  # Total length of reference URIs received in task requests
+        self.connections = 0  # TCP connections accepted (keep-alive reuse keeps this low)
+        self.ranged_downloads = 0  # Output requests answered with 206 Partial Content
+        self.requests: List[tuple] = []  # (monotonic time, method, path)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def request_count(self, method: Optional[str] = None, prefix: str = '') -> int:
+        """Count recorded requests, optionally filtered by method and path prefix."""
+        with self._lock:
+            return sum(1 for _, m, p in self.requests
+                       if (method is None or m == method) and p.startswith(prefix))
+
+    def start(self) -> 'MockRunwayAPI':
+        """Start serving on a free localhost port."""
+        handler = self._make_handler()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-runway-api",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockRunwayAPI':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _create_task(self) -> _MockTask:
+        with self._lock:
+            count = len(self.tasks) + 1
+            fail = bool(self.fail_every) and count % self.fail_every == 0
+            task = _MockTask(str(uuid.uuid4()), self.task_duration, fail=fail)
+            self.tasks[task.task_id] = task
+            return task
+
+    def expire_uploads(self):
+        """Forget every upload, as if their validity window had passed."""
+        with self._lock:
+            self.uploads.clear()
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass  # Keep test output quiet
+
+            def setup(self):
+                super().setup()
+                with api._lock:
+                    api.connections += 1
+
+            def _record(self):
+                with api._lock:
+                    api.requests.append((time.monotonic(), self.command, self.path))
+
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    return self.rfile.read(length)
+                # Chunked request bodies
+                chunks = []
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    while True:
+                        size = int(self.rfile.readline().strip() or b'0', 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            break
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                return b''.join(chunks)
+
+            def do_POST(self):
+                self._record()
+                body = self._read_body()
+                parts = self.path.strip('/').split('/')
+                if self.path.rstrip('/').endswith('/uploads'):
+                    try:
+                        filename = json.loads(body or b'{}').get('filename')
+                    except ValueError:
+                        filename = None
+                    if not filename:
+                        self._send_json(400, {'error': 'filename is required'})
+                        return
+                    upload_id = str(uuid.uuid4())
+                    with api._lock:
+                        api.uploads[upload_id] = None
+                    host, port = api._server.server_address[:2]
+                    self._send_json(200, {
+                        'uploadUrl': f"http://{host}:{port}/upload-bucket/{upload_id}",
+                        'fields': {'key': upload_id},
+                        'runwayUri': f"runway://uploads/{upload_id}/{filename}",
+                    })
+                    return
+                if len(parts) == 2 and parts[0] == 'upload-bucket':
+                    with api._lock:
+                        known = parts[1] in api.uploads
+                        if known:
+                            api.uploads[parts[1]] = len(body)
+                    if not known:
+                        self._send_json(403, {'error': 'Unknown upload'})
+                        return
+                    self.send_response(204)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if self.path.rstrip('/').endswith('/character_performance'):
+                    with api._lock:
+                        throttle = api.throttle_creates > 0
+                        if throttle:
+                            api.throttle_creates -= 1
+                    if throttle:
+                        data = json.dumps({'error': 'Too many requests'}).encode('utf-8')
+                        self.send_response(429)
+                        self.send_header('Retry-After', f"{api.retry_after:g}")
+                        self.send_header('Content-Type', 'application/json')
+                        self.send_header('Content-Length', str(len(data)))
+                        self.end_headers()
+                        self.wfile.write(data)
+                        return
+                    try:
+                        payload = json.loads(body or b'{}')
+                    except ValueError:
+                        self._send_json(400, {'error': 'Invalid JSON body'})
+                        return
+                    reference = payload.get('reference', {}).get('uri')
+                    if not payload.get('character', {}).get('uri') or not reference:
+                        self._send_json(400, {'error': 'character and reference are required'})
+                        return
+                    if reference.startswith('runway://'):
+                        upload_id = reference.split('/')[3] if reference.count('/') >= 3 else ''
+                        with api._lock:
+                            uploaded = api.uploads.get(upload_id) is not None
+                        if not uploaded:
+                            self._send_json(400, {'error': 'Invalid or expired asset URI'})
+                            return
+                    with api._lock:
+                        api.reference_bytes += len(reference)
+                    task = api._create_task()
+                    self._send_json(200, {'id': task.task_id})
+                    return
+                self._send_json(404, {'error': 'Not found'})
+
+            def do_GET(self):
+                self._record()
+                parts = self.path.strip('/').split('/')
+                if len(parts) >= 2 and parts[-2] == 'tasks':
+                    task = api.tasks.get(parts[-1])
+                    if not task:
+                        self._send_json(404, {'error': 'Task not found'})
+                        return
+                    status = task.status()
+                    body = {'id': task.task_id, 'status': status}
+                    if status == 'SUCCEEDED':
+                        host, port = api._server.server_address[:2]
+                        body['output'] = [f"http://{host}:{port}/outputs/{task.task_id}.mp4"]
+                    elif status == 'FAILED':
+                        body['failure'] = 'Mock failure'
+                    self._send_json(200, body)
+                    return
+                if len(parts) == 2 and parts[0] == 'outputs':
+                    self._send_output()
+                    return
+                self._send_json(404, {'error': 'Not found'})
+
+            def _send_output(self):
+                """Serve the video, honouring a "bytes=N-" Range and injected interruptions."""
+                data = api.output_bytes
+                start = 0
+                match = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+                if match:
+                    start = int(match.group(1))
+                    if start >= len(data):
+                        self.send_response(416)
+                        self.send_header('Content-Range', f"bytes */{len(data)}")
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header('Content-Range', f"bytes {start}-{len(data) - 1}/{len(data)}")
+                    with api._lock:
+                        api.ranged_downloads += 1
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Type', 'video/mp4')
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('Content-Length', str(len(data) - start))
+                self.end_headers()
+
+                with api._lock:
+                    interrupt = api.interrupt_downloads > 0
+                    if interrupt:
+                        api.interrupt_downloads -= 1
+                if interrupt:
+                    # Send half of the body, then drop the connection
+                    self.wfile.write(data[start:start + (len(data) - start) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(data[start:])
+
+        return Handler
+
+
+if __name__ == "__main__":
+    # Exercise the shared poller against the mock endpoint
+    from polling_strategy import ExponentialBackoffStrategy
+    from task_poller import TaskStatusPoller
+
+    with MockRunwayAPI(task_duration=3.0) as api:
+        import requests
+        poller = TaskStatusPoller(api.base_url, {}, min_spacing=0.1,
+                                  strategy=ExponentialBackoffStrategy(initial=0.5, maximum=2.0))
+        task_ids = []
+        for _ in range(5):
+            response = requests.post(f"{api.base_url}/character_performance",
+                                     json={'character': {'uri': 'x'}, 'reference': {'uri': 'y'}})
+            task_ids.append(response.json()['id'])
+
+        futures = [poller.track(task_id) for task_id in task_ids]
+        for task_id, future in zip(task_ids, futures):
+            print(f"{task_id}: {future.result()['status']}")
+        poller.stop()
+        print(f"Status requests: {api.request_count('GET', '/v1/tasks/')}")
@@ -5,6 +5,7 @@ Handles user directories, relative paths, and environment variables.
 
 import os
 import sys
+import hashlib
 from pathlib import Path
 from typing import Optional, Union
 
@@ -199,5 +200,22 @@ class PathManager:
             # Path is not relative to script directory
             return str(path)
 
+def file_sha256(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's contents without loading it into memory at once.
+
+    Args:
+        path: File to hash
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 # Global instance for convenience
 path_manager = PathManager()
\ No newline at end of file
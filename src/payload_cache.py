@@ -0,0 +1,330 @@
+"""
+Persistent caches for request payloads.
+DiskLRUCache stores blobs on disk with size-bounded least-recently-used
+eviction; DriverPayloadCache uses it to keep the base64 data URI of each
+driver video, so a launch or a driver switch does not re-encode the video,
+and PreprocessedImageCache keeps resized character images, so reruns and
+retries skip the decode, resize and JPEG encode.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Executor
+from pathlib import Path
+from typing import Callable, Dict, IO, Optional, Tuple, Union
+
+from path_utils import path_manager, file_sha256
+from image_preprocessing import preprocess_to_jpeg_bytes, TARGET_SIZE, JPEG_QUALITY, RESAMPLE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRIVER_CACHE_BYTES = 512 * 1024 * 1024
+DEFAULT_IMAGE_CACHE_BYTES = 1024 * 1024 * 1024
+
+# Raw bytes encoded per step; a multiple of 3 so chunks concatenate to valid base64
+_ENCODE_CHUNK = 3 * 1024 * 1024
+
+VIDEO_MIME_TYPES = {'.mp4': 'video/mp4', '.mov': 'video/quicktime', '.webm': 'video/webm'}
+
+
+def default_cache_dir() -> Path:
+    """Root folder for on-disk caches."""
+    return path_manager.project_dir / "cache"
+
+
+def video_mime_type(video_path: Union[str, Path]) -> str:
+    """MIME type for a driver video, defaulting to MP4."""
+    return VIDEO_MIME_TYPES.get(Path(video_path).suffix.lower(), 'video/mp4')
+
+
+class DiskLRUCache:
+    """Directory of cached blobs, evicting the least recently used beyond max_bytes."""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int, suffix: str = '.bin'):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder holding the cached files
+            max_bytes: Total size above which old entries are evicted
+            suffix: File extension of cached entries
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            Path of the cached file, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mtime doubles as the last-used time
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, writer: Callable[[IO[bytes]], None]) -> Optional[Path]:
+        """
+        Create an entry by streaming it to disk, then evict old entries.
+
+        Args:
+            key: Cache key (used as the file name)
+            writer: Called with a binary file object to write the content to
+
+        Returns:
+            Path of the cached file, or None if it could not be written
+        """
+        path = self.path_for(key)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                writer(f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {e}")
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return None
+        self.evict(keep=key)
+        return path
+
+    def evict(self, keep: Optional[str] = None):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(self.suffix) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            keep_path = str(self.path_for(keep)) if keep else None
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep_path:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    logger.info(f"Evicted cache entry {os.path.basename(path)}")
+                except OSError:
+                    pass
+
+
+class FileHashIndex:
+    """Remembers file hashes by (path, size, mtime) so unchanged files are not rehashed."""
+
+    def __init__(self, index_path: Union[str, Path], save_interval: float = 0.0):
+        """
+        Load the index.
+
+        Args:
+            index_path: JSON file holding the index
+            save_interval: Minimum seconds between writes of the index file;
+                later changes are written by the next save or by flush()
+        """
+        self.index_path = Path(index_path)
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._entries: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def lookup(self, path: Union[str, Path]) -> Tuple[str, int, int]:
+        """
+        Get a file's hash, size and mtime.
+
+        Returns:
+            Tuple of (sha256 hex digest, size, mtime_ns)
+        """
+        path = str(Path(path).resolve())
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256'], stat.st_size, stat.st_mtime_ns
+
+        digest = file_sha256(path)
+        with self._lock:
+            self._entries[path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                self._save()
+        return digest, stat.st_size, stat.st_mtime_ns
+
+    def flush(self):
+        """Write changes not saved yet because of the save interval."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        """Write the index atomically (caller holds the lock)."""
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not save hash index {self.index_path}: {e}")
+
+
+class DriverPayloadCache:
+    """On-disk cache of driver video data URIs keyed by (content hash, size, mtime)."""
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None,
+                 max_bytes: int = DEFAULT_DRIVER_CACHE_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder for cached payloads (defaults to cache/driver_payloads)
+            max_bytes: Total size of cached payloads before old ones are evicted
+        """
+        cache_dir = Path(cache_dir or default_cache_dir() / "driver_payloads")
+        self.store = DiskLRUCache(cache_dir, max_bytes, suffix='.b64')
+        self.hashes = FileHashIndex(cache_dir / "hash_index.json")
+
+    def payload_key(self, video_path: Union[str, Path]) -> str:
+        """Cache key of a video's current contents."""
+        digest, size, mtime_ns = self.hashes.lookup(video_path)
+        return f"{digest[:32]}-{size}-{mtime_ns}"
+
+    def get_path(self, video_path: Union[str, Path]) -> Optional[Path]:
+        """
+        Get the cached data URI file for a video, encoding it on a miss.
+
+        The video is encoded in chunks straight to disk, so neither the raw
+        video nor a second copy of the encoded text is held in memory.
+
+        Returns:
+            Path of a file containing the complete data URI, or None on failure
+        """
+        key = self.payload_key(video_path)
+        cached = self.store.get(key)
+        if cached:
+            logger.debug(f"Driver video payload loaded from cache: {Path(video_path).name}")
+            return cached
+
+        logger.info(f"Encoding driver video to cache: {video_path}")
+
+        def write_data_uri(out: IO[bytes]):
+            out.write(f"data:{video_mime_type(video_path)};base64,".encode('ascii'))
+            with open(video_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_ENCODE_CHUNK), b''):
+                    out.write(base64.b64encode(chunk))
+
+        return self.store.put(key, write_data_uri)
+
+    def get_data_uri(self, video_path: Union[str, Path]) -> Optional[str]:
+        """
+        Get a video's base64 data URI from the cache.
+
+        Returns:
+            The data URI, or None if the video could not be read or cached
+        """
+        try:
+            path = self.get_path(video_path)
+            if path is None:
+                return None
+            with open(path, 'r', encoding='ascii') as f:
+                return f.read()
+        except OSError as e:
+            logger.error(f"Error loading driver video payload {video_path}: {e}")
+            return None
+
+
+class PreprocessedImageCache:
+    """On-disk cache of resized character images, keyed by source content and settings."""
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None,
+                 max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
+                 size: Tuple[int, int] = TARGET_SIZE, quality: int = JPEG_QUALITY,
+                 resample: int = RESAMPLE, fast: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder for cached images (defaults to cache/preprocessed_images)
+            max_bytes: Total size of cached images before old ones are evicted
+            size: Output resolution
+            quality: JPEG quality
+            resample: Pillow resampling filter
+            fast: Use the fast (draft decoding) preprocessing path
+        """
+        cache_dir = Path(cache_dir or default_cache_dir() / "preprocessed_images")
+        self.store = DiskLRUCache(cache_dir, max_bytes, suffix='.jpg')
+        # Batches hash thousands of images; don't rewrite the index after each one
+        self.hashes = FileHashIndex(cache_dir / "hash_index.json", save_interval=5.0)
+        self.size = size
+        self.quality = quality
+        self.resample = resample
+        self.fast = fast
+
+    def image_key(self, image_path: Union[str, Path]) -> str:
+        """Cache key of an image's contents and the preprocessing settings."""
+        digest, _, _ = self.hashes.lookup(image_path)
+        mode = "-fast" if self.fast else ""
+        return f"{digest[:32]}-{self.size[0]}x{self.size[1]}-r{int(self.resample)}-q{self.quality}{mode}"
+
+    def get(self, image_path: Union[str, Path], executor: Optional[Executor] = None) -> Optional[bytes]:
+        """
+        Get the preprocessed JPEG for an image, preprocessing it on a miss.
+
+        Args:
+            image_path: Source image
+            executor: Runs the preprocessing on a miss (e.g. a process pool);
+                the calling thread is used if omitted
+
+        Returns:
+            Encoded JPEG bytes, or None if the image could not be processed
+        """
+        try:
+            key = self.image_key(image_path)
+            cached = self.store.get(key)
+            if cached:
+                logger.debug(f"Preprocessed image loaded from cache: {Path(image_path).name}")
+                return cached.read_bytes()
+        except OSError as e:
+            logger.warning(f"Preprocessed image cache unavailable for {image_path}: {e}")
+            return self._preprocess(image_path, executor)
+
+        data = self._preprocess(image_path, executor)
+        if data is not None:
+            self.store.put(key, lambda f: f.write(data))
+        return data
+
+    def _preprocess(self, image_path: Union[str, Path], executor: Optional[Executor]) -> Optional[bytes]:
+        args = (str(image_path), self.size, self.quality, self.resample, self.fast)
+        if executor is not None:
+            try:
+                return executor.submit(preprocess_to_jpeg_bytes, *args).result()
+            except (BrokenExecutor, RuntimeError) as e:
+                logger.warning(f"Preprocessing executor unavailable, continuing in-process: {e}")
+        return preprocess_to_jpeg_bytes(*args)
+
+    def flush(self):
+        """Save pending hash index changes."""
+        self.hashes.flush()
@@ -0,0 +1,159 @@
+"""
+Polling schedules for RunwayML task status checks.
+Provides exponential backoff with jitter and an ETA-aware schedule that learns
+how long tasks usually take, plus the task timeout derived from driver length.
+"""
+
+import logging
+import random
+import statistics
+import threading
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Task timeout used when the driver video duration is unknown (10 minutes)
+DEFAULT_TASK_TIMEOUT = 600.0
+
+# Seconds of generation time allowed per second of driver video
+TIMEOUT_SECONDS_PER_VIDEO_SECOND = 60.0
+
+POLLING_STRATEGIES = ('exponential', 'eta')
+
+
+class PollingStrategy:
+    """Base class: decides how long to wait before the next status poll."""
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        """
+        Get the delay before the next poll.
+
+        Args:
+            attempt: Number of polls already made for this task
+            elapsed: Seconds since the task was submitted
+
+        Returns:
+            Seconds to wait before polling again
+        """
+        raise NotImplementedError
+
+    def record_completion(self, duration: float):
+        """Record how long a finished task took (ignored by default)."""
+
+
+class ExponentialBackoffStrategy(PollingStrategy):
+    """Exponential backoff with proportional jitter (10s -> 60s by default)."""
+
+    def __init__(self, initial: float = 10.0, maximum: float = 60.0, factor: float = 1.5,
+                 jitter: float = 0.2):
+        """
+        Initialize the strategy.
+
+        Args:
+            initial: Delay before the first poll
+            maximum: Upper bound for the delay
+            factor: Growth factor applied after every poll
+            jitter: Fraction of the delay randomized in both directions
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        delay = min(self.maximum, self.initial * (self.factor ** attempt))
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, delay)
+
+
+class EtaAwareStrategy(PollingStrategy):
+    """
+    Stays quiet until a task is likely done, then polls quickly.
+
+    The expected duration is the median of recently observed task durations.
+    Until enough samples exist, and once a task overruns its estimate, the
+    fallback strategy is used instead.
+    """
+
+    def __init__(self, fallback: Optional[PollingStrategy] = None, fast_interval: float = 3.0,
+                 quiet_fraction: float = 0.85, overrun_factor: float = 1.5, min_samples: int = 3,
+                 history_size: int = 50, initial_estimate: Optional[float] = None):
+        """
+        Initialize the strategy.
+
+        Args:
+            fallback: Strategy used without an estimate or after an overrun
+            fast_interval: Poll interval around the expected completion time
+            quiet_fraction: Fraction of the expected duration spent without polling
+            overrun_factor: Multiple of the estimate after which fast polling stops
+            min_samples: Observed durations required before trusting the median
+            history_size: Number of recent durations kept
+            initial_estimate: Optional expected duration to use before samples exist
+        """
+        self.fallback = fallback or ExponentialBackoffStrategy()
+        self.fast_interval = fast_interval
+        self.quiet_fraction = quiet_fraction
+        self.overrun_factor = overrun_factor
+        self.min_samples = min_samples
+        self.initial_estimate = initial_estimate
+        self._durations = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def expected_duration(self) -> Optional[float]:
+        """Median observed task duration, or the initial estimate."""
+        with self._lock:
+            if len(self._durations) >= self.min_samples:
+                return statistics.median(self._durations)
+        return self.initial_estimate
+
+    def record_completion(self, duration: float):
+        with self._lock:
+            self._durations.append(duration)
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        eta = self.expected_duration()
+        if eta is None:
+            return self.fallback.next_delay(attempt, elapsed)
+
+        quiet_until = eta * self.quiet_fraction
+        if elapsed < quiet_until:
+            return quiet_until - elapsed
+        if elapsed < eta * self.overrun_factor:
+            return self.fast_interval
+        return self.fallback.next_delay(attempt, elapsed)
+
+
+def create_polling_strategy(name: Optional[str] = None) -> PollingStrategy:
+    """
+    Build a polling strategy from its configuration name.
+
+    Args:
+        name: 'exponential' or 'eta' (default); any other name logs a
+            warning and uses the default
+
+    Returns:
+        PollingStrategy instance
+    """
+    if name == 'exponential':
+        return ExponentialBackoffStrategy()
+    if name not in (None, 'eta'):
+        logger.warning(f"Unknown polling_strategy {name!r} (expected one of "
+                       f"{', '.join(POLLING_STRATEGIES)}); using 'eta'")
+    return EtaAwareStrategy()
+
+
+def compute_task_timeout(driver_duration: Optional[float]) -> float:
+    """
+    Scale the task timeout with the driver video length.
+
+    Args:
+        driver_duration: Driver video duration in seconds, if known
+
+    Returns:
+        Seconds to wait for a task before giving up (never below the default)
+    """
+    if not driver_duration or driver_duration <= 0:
+        return DEFAULT_TASK_TIMEOUT
+    return max(DEFAULT_TASK_TIMEOUT, driver_duration * TIMEOUT_SECONDS_PER_VIDEO_SECOND)
@@ -0,0 +1,79 @@
+"""
+Process-pool preprocessing stage.
+Character images are resized and JPEG-encoded in worker processes while
+earlier generations are still being submitted or awaited, so CPU work
+overlaps with network waits instead of running on the submitting thread.
+The pipeline's preprocess stage hands images to the pool; the queue behind
+it holds at most lookahead prepared images, which caps the memory held by
+finished-but-unsent results.
+"""
+
+import logging
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from typing import Optional
+
+from image_preprocessing import preprocess_to_jpeg_bytes, TARGET_SIZE, JPEG_QUALITY, RESAMPLE
+from payload_cache import PreprocessedImageCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREPROCESS_WORKERS = min(4, os.cpu_count() or 1)
+
+# Images prepared ahead of submission
+DEFAULT_PREPROCESS_LOOKAHEAD = 4
+
+
+class PreprocessingStage:
+    """Prepares character images in a process pool ahead of their submission."""
+
+    def __init__(self, workers: int = DEFAULT_PREPROCESS_WORKERS,
+                 lookahead: int = DEFAULT_PREPROCESS_LOOKAHEAD,
+                 image_cache: Optional[PreprocessedImageCache] = None, fast: bool = False):
+        """
+        Initialize the stage.
+
+        Args:
+            workers: Preprocessing processes
+            lookahead: Most prepared images waiting for their submission
+            image_cache: Cache checked before an image is sent to a worker process
+            fast: Use the fast (draft decoding) preprocessing path when no cache is given
+        """
+        self.workers = max(1, int(workers))
+        self.lookahead = max(1, int(lookahead))
+        self.image_cache = image_cache
+        self.fast = fast
+        self._processes = ProcessPoolExecutor(max_workers=self.workers)
+        self._pool_broken = False
+
+    def process(self, image_path: str) -> Optional[bytes]:
+        """
+        Prepare an image, blocking the calling thread until it is done.
+
+        Cache lookups and hashing run on the calling thread; the CPU work is
+        handed to a worker process.
+
+        Returns:
+            Encoded JPEG bytes, or None if the image could not be processed
+        """
+        if self.image_cache:
+            return self.image_cache.get(image_path, executor=self._executor())
+        return self._preprocess(image_path)
+
+    def _executor(self):
+        return None if self._pool_broken else self._processes
+
+    def _preprocess(self, image_path: str) -> Optional[bytes]:
+        """Preprocess in a worker process, or on this thread if the pool is unusable."""
+        if not self._pool_broken:
+            try:
+                return self._processes.submit(preprocess_to_jpeg_bytes, image_path, TARGET_SIZE,
+                                              JPEG_QUALITY, RESAMPLE, self.fast).result()
+            except (BrokenExecutor, RuntimeError) as e:
+                logger.warning(f"Preprocessing processes unavailable, continuing in-process: {e}")
+                self._pool_broken = True
+        return preprocess_to_jpeg_bytes(image_path, fast=self.fast)
+
+    def close(self):
+        """Stop the worker processes."""
+        self._processes.shutdown(wait=True, cancel_futures=True)
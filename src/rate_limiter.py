@@ -0,0 +1,128 @@
+"""
+Token-bucket rate limiting for RunwayML API calls.
+Task creation, status polling and video downloads each get their own bucket,
+configured through the "rate_limits" key in runway_config.json.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Endpoint classes that share a bucket
+CREATE = 'create'
+POLL = 'poll'
+DOWNLOAD = 'download'
+
+# Requests per minute and burst size for each endpoint class
+DEFAULT_RATE_LIMITS = {
+    CREATE: {"per_minute": 20, "burst": 2},
+    POLL: {"per_minute": 120, "burst": 10},
+    DOWNLOAD: {"per_minute": 30, "burst": 5},
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve a token and sleep until it is due."""
+
+    def __init__(self, per_minute: Optional[float], burst: int = 1):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Sustained requests per minute (None or 0 disables limiting)
+            burst: Number of requests allowed back to back
+        """
+        self.per_minute = per_minute
+        self.rate = (per_minute or 0) / 60.0
+        self.capacity = max(1, int(burst or 1))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        if self.unlimited:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """One token bucket per endpoint class."""
+
+    def __init__(self, rate_limits: Optional[Dict[str, Dict]] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate_limits: Mapping of endpoint class to {"per_minute": ..., "burst": ...};
+                classes missing from the mapping use DEFAULT_RATE_LIMITS
+        """
+        limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.buckets = {}
+        for endpoint_class, limit in limits.items():
+            limit = limit or {}
+            self.buckets[endpoint_class] = TokenBucket(limit.get("per_minute"), limit.get("burst", 1))
+
+    def acquire(self, endpoint_class: str):
+        """Block until a request of the given class may be sent."""
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is None:
+            return
+        delay = bucket.reserve()
+        if delay > 0:
+            logger.info(f"Rate limit: waiting {delay:.1f}s before next {endpoint_class} request")
+            time.sleep(delay)
+
+    def describe(self) -> str:
+        """Short human-readable summary, e.g. for settings displays."""
+        parts = []
+        for endpoint_class, bucket in self.buckets.items():
+            if bucket.unlimited:
+                parts.append(f"{endpoint_class} unlimited")
+            else:
+                parts.append(f"{endpoint_class} {bucket.per_minute:g}/min")
+        return ", ".join(parts)
+
+
+def create_rate_limiter(rate_limits: Optional[Dict[str, Dict]] = None,
+                        delay_between_generations: Optional[float] = None) -> RateLimiter:
+    """
+    Build a rate limiter from configuration.
+
+    Args:
+        rate_limits: The "rate_limits" configuration value
+        delay_between_generations: Legacy setting, only used to derive the
+            task creation limit when rate_limits does not define one
+
+    Returns:
+        RateLimiter instance
+    """
+    rate_limits = dict(rate_limits or {})
+    if CREATE not in rate_limits and delay_between_generations and delay_between_generations > 0:
+        rate_limits[CREATE] = {"per_minute": 60.0 / delay_between_generations, "burst": 1}
+    return RateLimiter(rate_limits)
@@ -2,6 +2,8 @@ import os
 import sys
 import json
 import time
+import threading
+import multiprocessing
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
@@ -12,8 +14,20 @@ from path_utils import path_manager
 # Import GUI selectors for file/folder selection
 from gui_selectors import GUISelectors, VideoInfo
 
-# Import your existing RunwayActTwoBatchGenerator
-from runway_generator import RunwayActTwoBatchGenerator
+# Generators are built from the configuration by the shared factory
+from generator_factory import (create_generator, create_payload_cache, create_image_cache, create_image_scanner,
+                               create_request_limiter)
+from task_pipeline import (ConcurrentGenerationPipeline, StreamingJobQueue, DEFAULT_MAX_IN_FLIGHT,
+                           DEFAULT_DOWNLOAD_WORKERS)
+from rate_limiter import DEFAULT_RATE_LIMITS
+from job_journal import JobJournal, default_journal_path, ADOPTABLE_STATES
+from duplicate_index import load_duplicate_index, default_index_path
+from image_scanner import ImageScanner, ScanPlan, DEFAULT_SCAN_DEPTH
+from directory_walker import DEFAULT_WALK_WORKERS
+from folder_watcher import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_TIME
+from preprocessing_stage import DEFAULT_PREPROCESS_WORKERS, DEFAULT_PREPROCESS_LOOKAHEAD
+from payload_cache import (DriverPayloadCache, PreprocessedImageCache, DEFAULT_DRIVER_CACHE_BYTES,
+                           DEFAULT_IMAGE_CACHE_BYTES)
 
 class RunwayAutomationUI:
     def __init__(self):
@@ -37,9 +51,25 @@ class RunwayAutomationUI:
             "verbose_logging": False,  # Default OFF
             "duplicate_detection": True,
             "delay_between_generations": 1,
+            "max_in_flight": DEFAULT_MAX_IN_FLIGHT,  # Act-Two tasks kept running at the same time
+            "download_workers": DEFAULT_DOWNLOAD_WORKERS,  # Finished videos downloaded at the same time
+            "polling_strategy": "eta",  # "eta" (learns task durations) or "exponential"
+            "rate_limits": DEFAULT_RATE_LIMITS,  # Requests per minute and burst per endpoint class
+            "scan_workers": DEFAULT_WALK_WORKERS,  # Folders listed in parallel (raise for network shares)
+            "scan_max_depth": DEFAULT_SCAN_DEPTH,  # Folder levels scanned below the input folder
+            "driver_cache_mb": DEFAULT_DRIVER_CACHE_BYTES // (1024 * 1024),  # Encoded driver videos kept on disk
+            "image_cache_mb": DEFAULT_IMAGE_CACHE_BYTES // (1024 * 1024),  # Resized character images kept on disk
+            "driver_upload": True,  # Upload the driver video once instead of inlining it in every request
+            "preprocess_workers": DEFAULT_PREPROCESS_WORKERS,  # Processes resizing images ahead of submission (0 = one thread)
+            "preprocess_lookahead": DEFAULT_PREPROCESS_LOOKAHEAD,  # Images prepared ahead of submission
+            "fast_preprocessing": True,  # Decode large photos at a reduced scale before resizing
+            "keep_preprocessed_images": False,  # Debug: save resized character images to temp_resized/
             "first_run": True,  # Track if this is first time setup
             "image_search_pattern": "genx",  # Default pattern to search for in image filenames
             "exact_match": False,  # If true, requires exact pattern match (e.g., "-selfie" won't match "selfie")
+            "watch_poll_interval": DEFAULT_POLL_INTERVAL,  # Watch mode: seconds between folder snapshots when polling
+            "watch_settle_seconds": DEFAULT_SETTLE_TIME,  # Watch mode: seconds a new image must stay unchanged
+            "watch_use_inotify": True,  # Watch mode: use inotify on Linux (turn off for network shares)
             "output_location": "centralized"  # "centralized" or "co-located"
         }
 
@@ -237,6 +267,7 @@ class RunwayAutomationUI:
         print(f"  \033[93m10\033[0m - Edit output folder path (manual text entry)")
         print(f"  \033[93m11\033[0m - Toggle verbose logging (currently: {verbose_status})")
         print(f"  \033[93m12\033[0m - Show all settings in detail")
+        print(f"  \033[93m13\033[0m - Rebuild duplicate index (rescan Downloads)")
 
         # System
         print()
@@ -295,6 +326,7 @@ class RunwayAutomationUI:
         print()
         print("  \033[96m── FEATURES ────────────────────────────────────────────\033[0m")
         print("  • Duplicate detection (checks Downloads folder)")
+        print("    Index is saved and refreshed incrementally; Option 13 rebuilds it")
         print("  • Recursive folder scanning")
         print("  • GenX image filtering")
         print("  • Progress tracking with Rich UI")
@@ -309,7 +341,10 @@ class RunwayAutomationUI:
     def select_input_folder_gui(self):
         """Select input folder using GUI browser"""
         gui = GUISelectors()
-        result = gui.select_input_folder_with_scan()
+        result = gui.select_input_folder_with_scan(
+            search_pattern=self.config.get('image_search_pattern', 'genx'),
+            exact_match=self.config.get('exact_match', False)
+        )
 
         if result:
             folder_path, image_count = result
@@ -333,6 +368,21 @@ class RunwayAutomationUI:
         print(f"\nVerbose logging {status}")
         input("Press Enter to continue...")
     
+    def create_payload_cache(self) -> DriverPayloadCache:
+        """Driver video payload cache sized from the configuration"""
+        return create_payload_cache(self.config)
+
+    def create_image_cache(self) -> Optional[PreprocessedImageCache]:
+        """Preprocessed image cache sized from the configuration (None when set to 0)"""
+        return create_image_cache(self.config)
+
+    def warm_driver_payload_cache(self):
+        """Encode the selected driver video in the background so the next batch starts instantly"""
+        driver_video = self.config.get('driver_video')
+        if driver_video and Path(driver_video).exists():
+            threading.Thread(target=self.create_payload_cache().get_path, args=(driver_video,),
+                             name="driver-cache-warmup", daemon=True).start()
+
     def edit_driver_video(self):
         """Edit the driver video path"""
         print(f"\n\033[92mCurrent driver video:\033[0m {self.config['driver_video']}")
@@ -341,6 +391,7 @@ class RunwayAutomationUI:
         if new_path and Path(new_path).exists():
             self.config['driver_video'] = new_path
             self.save_config()
+            self.warm_driver_payload_cache()
             print(f"Driver video updated to: {new_path}")
         elif new_path:
             self.print_red(f"File not found: {new_path}")
@@ -400,6 +451,7 @@ class RunwayAutomationUI:
                     selected = str(assets_videos[idx])
                     self.config['driver_video'] = selected
                     self.save_config()
+                    self.warm_driver_payload_cache()
                     self.print_green(f"✅ Selected: {assets_videos[idx].name}")
                     input("\nPress Enter to return to menu...")
                     return
@@ -420,6 +472,7 @@ class RunwayAutomationUI:
         if selected:
             self.config['driver_video'] = selected
             self.save_config()
+            self.warm_driver_payload_cache()
 
             print()
             self.print_green("✅ SUCCESS! Driver video updated:")
@@ -610,43 +663,18 @@ class RunwayAutomationUI:
         console.print(f"🎯 Match Type: [yellow]{'Exact' if exact_match else 'Contains'}[/yellow]")
         console.print(f"📁 Root Folder: [cyan]{input_folder}[/cyan]\n")
 
-        # Scan for matching images
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'}
+        # Scan for matching images (the same plan processing uses)
+        plan = self.scan_input_folder(input_folder)
+        total_size = plan.total_size
         matching_files = []
-        total_size = 0
-
-        # Scan recursively
-        for root, dirs, files in os.walk(input_folder):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in image_extensions:
-                    filename_lower = file.lower()
-                    pattern_lower = pattern.lower()
-
-                    # Check if file matches pattern
-                    matches = False
-                    if exact_match:
-                        # For exact match, check if pattern appears as a complete word/segment
-                        import re
-                        # Pattern should match as a complete segment (bounded by non-alphanumeric or start/end)
-                        pattern_regex = r'(^|[^a-z0-9])' + re.escape(pattern_lower) + r'([^a-z0-9]|$)'
-                        if re.search(pattern_regex, filename_lower):
-                            matches = True
-                    else:
-                        # Simple contains check
-                        if pattern_lower in filename_lower:
-                            matches = True
-
-                    if matches:
-                        file_size = file_path.stat().st_size
-                        total_size += file_size
-                        relative_path = file_path.relative_to(input_folder)
-                        matching_files.append({
-                            'path': str(relative_path),
-                            'name': file,
-                            'size': file_size,
-                            'folder': str(relative_path.parent) if relative_path.parent != Path('.') else 'root'
-                        })
+        for image in plan.images:
+            relative_path = plan.relative_path(image)
+            matching_files.append({
+                'path': str(relative_path),
+                'name': image.name,
+                'size': image.size,
+                'folder': str(relative_path.parent) if relative_path.parent != Path('.') else 'root'
+            })
 
         # Sort files by folder then by name
         matching_files.sort(key=lambda x: (x['folder'], x['name']))
@@ -724,7 +752,23 @@ class RunwayAutomationUI:
             ("Exact Match", "Yes" if self.config.get('exact_match', False) else "No", "✓"),
             ("Verbose Logging", "ON" if self.config.get('verbose_logging', False) else "OFF", "✓"),
             ("Duplicate Detection", "ON" if self.config.get('duplicate_detection', True) else "OFF", "✓"),
-            ("Generation Delay", f"{self.config.get('delay_between_generations', 1)} seconds", "✓"),
+            ("Max Tasks In Flight", str(self.config.get('max_in_flight', DEFAULT_MAX_IN_FLIGHT)), "✓"),
+            ("Download Workers", str(self.config.get('download_workers', DEFAULT_DOWNLOAD_WORKERS)), "✓"),
+            ("Polling Strategy", self.config.get('polling_strategy', 'eta'), "✓"),
+            # As enforced: a missing create limit comes from delay_between_generations
+            ("Rate Limits", create_request_limiter(self.config).describe(), "✓"),
+            ("Scan Workers", str(self.config.get('scan_workers', DEFAULT_WALK_WORKERS)), "✓"),
+            ("Scan Depth", str(self.config.get('scan_max_depth', DEFAULT_SCAN_DEPTH)), "✓"),
+            ("Driver Cache", f"{self.config.get('driver_cache_mb', DEFAULT_DRIVER_CACHE_BYTES // (1024 * 1024))} MB", "✓"),
+            ("Image Cache", f"{self.config.get('image_cache_mb', DEFAULT_IMAGE_CACHE_BYTES // (1024 * 1024))} MB", "✓"),
+            ("Driver Upload", "ON" if self.config.get('driver_upload', True) else "OFF (inline)", "✓"),
+            ("Preprocessing", f"{self.config.get('preprocess_workers', DEFAULT_PREPROCESS_WORKERS)} processes, "
+                              f"{self.config.get('preprocess_lookahead', DEFAULT_PREPROCESS_LOOKAHEAD)} ahead", "✓"),
+            ("Fast Preprocessing", "ON" if self.config.get('fast_preprocessing', True) else "OFF", "✓"),
+            ("Keep Resized Images", "ON" if self.config.get('keep_preprocessed_images', False) else "OFF", "✓"),
+            ("Watch Mode", f"{'inotify, ' if self.config.get('watch_use_inotify', True) else ''}"
+                           f"poll {self.config.get('watch_poll_interval', DEFAULT_POLL_INTERVAL)}s, "
+                           f"settle {self.config.get('watch_settle_seconds', DEFAULT_SETTLE_TIME)}s", "✓"),
         ]
 
         for setting, value, status in settings:
@@ -756,6 +800,19 @@ class RunwayAutomationUI:
 
         input("\n\nPress Enter to continue...")
 
+    def rebuild_duplicate_index(self):
+        """Rescan the Downloads folder from scratch and save a fresh duplicate index"""
+        downloads_folder = path_manager.downloads_dir
+        self.print_cyan(f"\nRebuilding duplicate index for {downloads_folder}...")
+
+        start = time.time()
+        index = load_duplicate_index(downloads_folder, rebuild=True)
+        elapsed = time.time() - start
+
+        self.print_green(f"✓ Indexed {len(index)} existing videos in {elapsed:.1f}s")
+        print(f"  Saved to: \033[90m{default_index_path()}\033[0m")
+        time.sleep(2)
+
     def run_setup_wizard(self):
         """Manually run the setup wizard to reconfigure all settings"""
         from first_run_setup import FirstRunSetup
@@ -829,6 +886,10 @@ class RunwayAutomationUI:
                 # Show all settings in detail
                 self.show_detailed_settings()
                 continue
+            elif choice == '13':
+                # Full rescan of existing videos
+                self.rebuild_duplicate_index()
+                continue
             elif choice.lower() == 's':
                 # Run setup wizard manually
                 self.run_setup_wizard()
@@ -845,34 +906,15 @@ class RunwayAutomationUI:
     
     def count_genx_files(self, root_directory: str) -> int:
         """Count total files matching the configured pattern"""
-        count = 0
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'}
-        pattern = self.config.get('image_search_pattern', 'genx').lower()
-        exact_match = self.config.get('exact_match', False)
+        return len(self.scan_input_folder(root_directory))
 
-        try:
-            for folder_path in Path(root_directory).iterdir():
-                if folder_path.is_dir():
-                    for file_path in folder_path.iterdir():
-                        if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                            filename_lower = file_path.name.lower()
-
-                            # Check pattern match
-                            matches = False
-                            if exact_match:
-                                import re
-                                pattern_regex = r'(^|[^a-z0-9])' + re.escape(pattern) + r'([^a-z0-9]|$)'
-                                if re.search(pattern_regex, filename_lower):
-                                    matches = True
-                            else:
-                                if pattern in filename_lower:
-                                    matches = True
+    def create_image_scanner(self) -> ImageScanner:
+        """Image scanner for the configured search pattern and scan settings"""
+        return create_image_scanner(self.config)
 
-                            if matches:
-                                count += 1
-        except Exception:
-            pass
-        return count
+    def scan_input_folder(self, root_directory: str) -> ScanPlan:
+        """Scan an input folder once with the configured search pattern"""
+        return self.create_image_scanner().scan(root_directory)
     
     def start_processing(self, input_folder: str):
         """Start the video generation process with Rich UI exactly like reference"""
@@ -884,7 +926,6 @@ class RunwayAutomationUI:
         from rich.text import Text
         from rich.table import Table
         from rich.align import Align
-        import threading
         
         console = Console(force_terminal=True, width=100)  # Reduced from 120 to 100
         self.clear_screen()
@@ -908,35 +949,28 @@ class RunwayAutomationUI:
         # Show loading message with Rich Live spinner
         from rich.spinner import Spinner
         from rich.live import Live
-        from rich.console import Group
         
         # Create animated loading display with Rich Spinner
         def create_loading_spinner(message):
             return Spinner("dots", text=message, style="green bold")
         
-        with Live(create_loading_spinner("Analyzing folders and checking for duplicates..."), 
-                  console=console, refresh_per_second=10) as loading_live:
+        with Live(create_loading_spinner("Loading duplicate index..."), 
+                  console=console, refresh_per_second=10):
             
             # Start actual processing
-            generator = RunwayActTwoBatchGenerator(
-                self.config['api_key'],
-                verbose=self.verbose_logging,
-                driver_video_path=self.config.get('driver_video')
-            )
+            generator = create_generator(self.config, verbose=self.verbose_logging)
             
-            genx_count = self.count_genx_files(input_folder)
-            folders = self.get_all_folders(input_folder)
-            
-            # Update loading message with new spinner
-            loading_live.update(create_loading_spinner("Filtering out duplicates..."))
-            
-            # Get actual count of files to be processed (after duplicate filtering)
-            pattern = self.config.get('image_search_pattern', 'genx')
-            exact_match = self.config.get('exact_match', False)
-            total_files = 0
-            for folder in folders:
-                genx_images = generator.get_genx_image_files(folder, search_pattern=pattern, exact_match=exact_match)
-                total_files += len(genx_images)
+            # Journal every job so a crashed batch resumes instead of paying again
+            journal = JobJournal(default_journal_path())
+            generator.attach_journal(journal, root=str(Path(input_folder).resolve()))
+            resumable = len(journal.entries(root=generator.journal_root, states=ADOPTABLE_STATES))
+
+            # Index existing videos once; every duplicate check below reuses it
+            generator.build_duplicate_index()
+        
+        max_in_flight = self.config.get('max_in_flight', DEFAULT_MAX_IN_FLIGHT)
+        download_workers = self.config.get('download_workers', DEFAULT_DOWNLOAD_WORKERS)
+        job_stream = None
         
         # FORCE clear screen completely - remove all duplicates and loading messages
         console.clear()
@@ -946,21 +980,33 @@ class RunwayAutomationUI:
         # Show header ONLY ONCE after clearing
         console.print(header_panel)
         
-        # Start timer here
-        start_time = time.time()
-        
         # Main processing - single clean display
         try:
             if not self.verbose_logging:
+                # Scan in the background and feed new images to a bounded queue,
+                # so the first submissions start while later folders are scanned
+                job_stream = StreamingJobQueue(
+                    generator.iter_generations(
+                        input_folder,
+                        scanner=self.create_image_scanner(),
+                        output_directory=self.config['output_folder'],
+                        co_located_output=self.config.get("output_location", "centralized") == "co-located"
+                    ),
+                    maxsize=4 * max_in_flight
+                ).start()
+
                 # Configuration panel - show once only
                 config_table = Table.grid(padding=0)
                 config_table.add_column(style="cyan", justify="left", width=15)
                 config_table.add_column(style="white", justify="left")
                 
-                config_table.add_row("Files Amt:", f"{total_files} GenX files")
+                config_table.add_row("Files Amt:", "Counted live while folders are scanned")
                 config_table.add_row("Driver video:", Path(self.config['driver_video']).name)
                 config_table.add_row("Output folder:", "Downloads")
                 config_table.add_row("Verbose mode:", "Hidden")
+                config_table.add_row("Max in flight:", str(max_in_flight))
+                if resumable:
+                    config_table.add_row("Resuming:", f"{resumable} task(s) from an earlier run")
                 
                 config_panel = Panel(
                     config_table,
@@ -982,11 +1028,13 @@ class RunwayAutomationUI:
                     console=console
                 ) as progress:
                     
-                    main_task = progress.add_task("📊 [cyan]0% complete[/cyan] • 🎬 Processing GenX files... 🚀", total=total_files)
+                    main_task = progress.add_task("📊 [cyan]0% complete[/cyan] • 🎬 Processing GenX files... 🚀", total=len(job_stream))
                     
                     # Add colorful spinners below progress bar
                     status_text = "Loading..."
+                    action_status = "Monitoring for interrupts..."
                     processed = 0
+                    started = 0
                     
                     def create_colorful_spinners():
                         from rich.text import Text
@@ -1009,6 +1057,10 @@ class RunwayAutomationUI:
                             filename = status_text.replace("Failed: ", "")
                             activity_text.append("❌ Failed: ", style="bright_red")
                             activity_text.append(filename, style="white")
+                        elif "Skipped:" in status_text:
+                            filename = status_text.replace("Skipped: ", "")
+                            activity_text.append("⏭️  Skipped: ", style="bright_yellow")
+                            activity_text.append(filename, style="white")
                         else:
                             activity_text.append(status_text, style="bright_cyan")
                         activity_spinner = Spinner("dots", text=activity_text, style="bright_green")
@@ -1016,25 +1068,15 @@ class RunwayAutomationUI:
                         # Action spinner - bright blue with emoji
                         action_text = Text()
                         action_text.append("⚡ Action: ", style="bright_blue bold")
-                        action_text.append("Monitoring for interrupts...", style="bright_white")
+                        action_text.append(action_status, style="bright_white")
                         action_spinner = Spinner("dots", text=action_text, style="bright_blue")
                         
                         # Next spinner - bright magenta with emoji (show only FUTURE files)
                         next_text = Text()
                         next_text.append("🔮 Next: ", style="bright_magenta bold")
                         
-                        # Get all remaining files that come AFTER current one
-                        all_remaining = []
-                        current_found = False
-                        for folder in folders:
-                            genx_images = generator.get_genx_image_files(folder, search_pattern=pattern, exact_match=exact_match)
-                            for img in genx_images:
-                                img_name = Path(img).name
-                                if current_found:
-                                    all_remaining.append(Path(folder).name)
-                                    break
-                                elif "Generating:" in status_text and img_name in status_text:
-                                    current_found = True
+                        # Folders of the files not started yet
+                        all_remaining = job_stream.upcoming_folders(started)
                         
                         if all_remaining:
                             display = all_remaining[:3]
@@ -1042,6 +1084,8 @@ class RunwayAutomationUI:
                             if len(all_remaining) > 3:
                                 folder_list += f" (+{len(all_remaining)-3} more)"
                             next_text.append(folder_list, style="bright_yellow")
+                        elif not job_stream.scan_complete:
+                            next_text.append("Scanning folders...", style="bright_yellow")
                         else:
                             next_text.append("All processing complete", style="bright_green")
                         next_spinner = Spinner("dots", text=next_text, style="bright_magenta")
@@ -1056,185 +1100,75 @@ class RunwayAutomationUI:
                             status_text = new_status
                             live.update(create_colorful_spinners())
                         
-                        # Process files with BOTH progress bar AND spinner updates
-                        for folder in folders:
-                            folder_name = Path(folder).name
-                            genx_images = generator.get_genx_image_files(folder, search_pattern=pattern, exact_match=exact_match)
-                            
-                            if not genx_images:
-                                continue
-                            
-                            specific_output = Path(self.config['output_folder'])
-                            
-                            for image_path in genx_images:
-                                image_name = Path(image_path).name
-                                
-                                # Update progress bar to show percentage during processing
-                                status_text = f"Generating: {image_name}"
-                                current_pct = int((processed / total_files) * 100) if total_files > 0 else 0
-                                progress.update(main_task, description=f"📊 [cyan]{current_pct}% complete[/cyan] • ⏳")
-                                update_spinners(status_text)
-                                
-                                try:
-                                    result = generator.create_act_two_generation(
-                                        character_image_path=image_path,
-                                        output_folder=str(specific_output)
-                                    )
-                                except Exception as e:
-                                    result = None
-                                
-                                processed += 1
-                                completion_pct = int((processed / total_files) * 100) if total_files > 0 else 0
-                                
-                                # Update main progress bar with dynamic percentage
-                                if result:
-                                    progress.update(main_task, 
-                                        completed=processed,
-                                        description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ✅")
-                                    update_spinners(f"Completed: {image_name}")
-                                else:
-                                    progress.update(main_task, 
-                                        completed=processed,
-                                        description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ❌")
-                                    update_spinners(f"Failed: {image_name}")
-                                
-                                if self.config['delay_between_generations'] > 0:
-                                    time.sleep(self.config['delay_between_generations'])
-                        
+                        # The pipeline keeps up to max_in_flight generations running
+                        # at once, re-validating each job before submission; finished
+                        # videos are downloaded and verified by their own stages
+                        pipeline = ConcurrentGenerationPipeline(generator, max_in_flight=max_in_flight,
+                                                                download_workers=download_workers)
+                        in_flight = 0
+
+                        def refresh_controller_status():
+                            # Show the adaptive concurrency state (limit, 429s, backoff) and
+                            # the stage queue depths, and grow the progress total as the
+                            # scan finds more files
+                            nonlocal action_status
+                            action_status = f"{pipeline.controller.describe()} | {pipeline.describe_stages()}"
+                            progress.update(main_task, total=len(job_stream))
+                            live.update(create_colorful_spinners())
+
+                        def on_start(job):
+                            nonlocal in_flight, started
+                            in_flight += 1
+                            started += 1
+                            # Update progress bar to show percentage during processing
+                            total_files = len(job_stream)
+                            current_pct = int((processed / total_files) * 100) if total_files > 0 else 0
+                            progress.update(main_task, description=f"📊 [cyan]{current_pct}% complete[/cyan] • ⏳ {in_flight} in flight")
+                            update_spinners(f"Generating: {job.name}")
+                            refresh_controller_status()
+
+                        def on_complete(result):
+                            nonlocal processed, in_flight, started
+                            if result.skipped:
+                                # Dropped right before submission; never counted as in flight
+                                started += 1
+                            else:
+                                in_flight -= 1
+                            processed += 1
+                            total_files = len(job_stream)
+                            completion_pct = int((processed / total_files) * 100) if total_files > 0 else 0
+
+                            # Update main progress bar with dynamic percentage
+                            if result.skipped:
+                                progress.update(main_task,
+                                    completed=processed,
+                                    description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ⏭️")
+                                update_spinners(f"Skipped: {result.job.name}")
+                            elif result.succeeded:
+                                progress.update(main_task,
+                                    completed=processed,
+                                    description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ✅")
+                                update_spinners(f"Completed: {result.job.name}")
+                            else:
+                                progress.update(main_task,
+                                    completed=processed,
+                                    description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ❌")
+                                update_spinners(f"Failed: {result.job.name}")
+                            refresh_controller_status()
+
+                        pipeline.run(job_stream, on_start=on_start, on_complete=on_complete,
+                                     on_tick=refresh_controller_status,
+                                     validate=generator.revalidate_job)
+
                         # Final update
+                        total_files = len(job_stream)
                         if total_files > 0:
                             progress.update(main_task, completed=total_files, 
                                 description="📊 [cyan]100% complete[/cyan] • 🎉 All files processed!")
                             update_spinners("Processing complete!")
                         
                         time.sleep(2)
-                        # Calculate elapsed time
-                        elapsed = time.time() - start_time
-                        elapsed_str = f"{int(elapsed//60)}:{int(elapsed%60):02d}"
-                        
-                        # Main progress with cyan colors
-                        main_text = Text()
-                        if processed > 0:
-                            pct = int((processed / total_files) * 100) if total_files > 0 else 0
-                            main_text.append(f"{pct}% complete • ", style="bright_cyan")
-                            if "Generating:" in status_text:
-                                filename = status_text.replace("Generating: ", "") 
-                                main_text.append("Generating: ", style="bright_cyan bold")
-                                main_text.append(filename, style="white")
-                            else:
-                                main_text.append("Processing GenX files...", style="bright_cyan")
-                            
-                            # Add colorful progress bar
-                            bar_length = 25
-                            filled = int((pct / 100) * bar_length)
-                            bar = "█" * filled + "░" * (bar_length - filled)
-                            main_text.append(f"  {bar}  {processed}/{total_files} • {elapsed_str}", style="bright_cyan")
-                        else:
-                            main_text.append("Processing GenX files... ", style="bright_cyan")
-                            bar = "░" * 25
-                            main_text.append(f"  {bar}  0/{total_files} • {elapsed_str}", style="bright_cyan")
-                        main_spinner = Spinner("dots", text=main_text, style="bright_cyan")
-                        
-                        # Activity with bright green spinner
-                        activity_text = Text()
-                        activity_text.append("Activity: ", style="bright_green bold")
-                        activity_text.append(status_text, style="bright_cyan")
-                        activity_spinner = Spinner("dots", text=activity_text, style="bright_green")
-                        
-                        # Action with bright blue spinner
-                        action_text = Text()
-                        action_text.append("Action: ", style="bright_blue bold")
-                        action_text.append("Monitoring for interrupts...", style="bright_white")
-                        action_spinner = Spinner("dots", text=action_text, style="bright_blue")
-                        
-                        # Next with bright magenta spinner
-                        next_text = Text()
-                        next_text.append("Next: ", style="bright_magenta bold")
-                        remaining = [Path(f).name for f in folders if generator.get_genx_image_files(f, search_pattern=pattern, exact_match=exact_match)]
-                        if remaining and processed < total_files:
-                            display = remaining[:3]
-                            folder_list = ", ".join(display) 
-                            if len(remaining) > 3:
-                                folder_list += f" (+{len(remaining)-3} more)"
-                            next_text.append(folder_list, style="bright_yellow")
-                        else:
-                            next_text.append("All processing complete", style="bright_green")
-                        next_spinner = Spinner("dots", text=next_text, style="bright_magenta")
-                        
-                        return Group(main_spinner, activity_spinner, action_spinner, next_spinner)
-                
-                # Use Rich Live display with Rich Spinners
-                with Live(create_status_display(), console=console, refresh_per_second=10) as live:
-                    def update_status_live(new_text):
-                        nonlocal status_text
-                        status_text = new_text
-                        live.update(create_status_display())
-                    
-                    # Process files with spinner updates only
-                    for folder in folders:
-                            folder_name = Path(folder).name
-                            # Use generator's duplicate-filtered method instead of local method
-                            genx_images = generator.get_genx_image_files(folder, search_pattern=pattern, exact_match=exact_match)
-                            
-                            if not genx_images:
-                                continue
-                            
-                            # Determine output location based on configuration
-                            if self.config.get("output_location", "centralized") == "co-located":
-                                # Save to same folder as source image
-                                specific_output = Path(image_path).parent if genx_images else Path(self.config['output_folder'])
-                            else:
-                                # Save to centralized output folder
-                                specific_output = Path(self.config['output_folder'])
-
-                            status_text = f"Processing folder: {folder_name}"
-                            progress.update(main_task, description=f"📂 Processing: {folder_name}")
-                            update_status_live(status_text)
-
-                            for image_path in genx_images:
-                                image_name = Path(image_path).name
-                                status_text = f"Generating: {image_name}"
-                                progress.update(main_task, description=f"🎬 [cyan]Generating:[/cyan] {image_name}")
-                                update_status_live(status_text)
-
-                                # Determine output folder for this specific image
-                                if self.config.get("output_location", "centralized") == "co-located":
-                                    output_for_this_image = str(Path(image_path).parent)
-                                else:
-                                    output_for_this_image = str(specific_output)
-
-                                try:
-                                    result = generator.create_act_two_generation(
-                                        character_image_path=image_path,
-                                        output_folder=output_for_this_image
-                                    )
-                                except Exception as e:
-                                    result = None
-                                    update_status_live(f"Error: {image_name}")
-                                
-                                processed += 1
-                                completion_pct = int((processed / total_files) * 100) if total_files > 0 else 0
-                                
-                                if result:
-                                    progress.update(main_task, 
-                                        completed=processed,
-                                        description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ✅ {image_name}")
-                                    update_status_live(f"Completed: {image_name}")
-                                else:
-                                    progress.update(main_task, 
-                                        completed=processed,
-                                        description=f"📊 [cyan]{completion_pct}% complete[/cyan] • ❌ {image_name}")
-                                    update_status_live(f"Failed: {image_name}")
-                                
-                                if self.config['delay_between_generations'] > 0:
-                                    time.sleep(self.config['delay_between_generations'])
-                    
-                    # Final update
-                    if total_files > 0:
-                        update_status_live("Processing complete!")
-                    
-                    time.sleep(2)
-                        
+
             else:
                 # Verbose processing - let all logs show
                 print("Processing started with verbose logging...")
@@ -1248,7 +1182,10 @@ class RunwayAutomationUI:
                     target_directory=input_folder,
                     output_directory=self.config['output_folder'] if output_location == "centralized" else None,
                     delay_between_generations=self.config['delay_between_generations'],
-                    co_located_output=(output_location == "co-located")
+                    co_located_output=(output_location == "co-located"),
+                    max_in_flight=max_in_flight,
+                    scanner=self.create_image_scanner(),
+                    download_workers=download_workers
                 )
                     
         except Exception as e:
@@ -1256,6 +1193,11 @@ class RunwayAutomationUI:
             if self.verbose_logging:
                 import traceback
                 print(f"{traceback.format_exc()}")
+        finally:
+            if job_stream:
+                job_stream.stop()
+            generator.close()
+            journal.close()
         
         print("\nProcessing complete!")
         if self.config.get("output_location", "centralized") == "co-located":
@@ -1266,44 +1208,12 @@ class RunwayAutomationUI:
     
     def get_all_folders(self, root_directory: str):
         """Get all folders that contain images matching the configured pattern"""
-        folders = []
-        try:
-            for folder_path in Path(root_directory).iterdir():
-                if folder_path.is_dir():
-                    if self.get_genx_files_in_folder(str(folder_path)):
-                        folders.append(str(folder_path))
-        except Exception:
-            pass
-        return folders
+        return list(self.scan_input_folder(root_directory).folders_with_images)
     
     def get_genx_files_in_folder(self, folder_path: str):
         """Get files matching the configured pattern in a specific folder"""
-        matching_files = []
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'}
-        pattern = self.config.get('image_search_pattern', 'genx').lower()
-        exact_match = self.config.get('exact_match', False)
-
-        try:
-            for file_path in Path(folder_path).iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                    filename_lower = file_path.name.lower()
-
-                    # Check pattern match
-                    matches = False
-                    if exact_match:
-                        import re
-                        pattern_regex = r'(^|[^a-z0-9])' + re.escape(pattern) + r'([^a-z0-9]|$)'
-                        if re.search(pattern_regex, filename_lower):
-                            matches = True
-                    else:
-                        if pattern in filename_lower:
-                            matches = True
-
-                    if matches:
-                        matching_files.append(str(file_path))
-        except Exception:
-            pass
-        return matching_files
+        images, _ = self.create_image_scanner().scan_folder(folder_path)
+        return [image.path for image in images]
     
     def run(self):
         """Main application loop"""
@@ -1363,4 +1273,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Preprocessing workers in the frozen build
     main()
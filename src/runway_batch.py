@@ -0,0 +1,332 @@
+"""
+Headless batch mode for servers, cron jobs and CI.
+Runs the same staged generation pipeline as the interactive menu without
+Rich, tkinter or prompts, and never imports the UI modules, so it starts
+quickly and runs on machines without a display. Run from the src folder:
+
+    python -m runway_batch run --root D:/Batches --driver ../assets/driver_video.mp4 --out D:/Videos
+    python -m runway_batch watch --root D:/Batches --out D:/Videos
+
+`run` processes the images present now and exits; `watch` keeps running and
+processes images as they are added or changed, until Ctrl+C or SIGTERM
+(in-flight generations are finished first).
+
+Progress is written to stdout as JSON lines (one object per event, see
+emit); logs go to stderr. The exit code is 0 when every image was generated
+or skipped, 1 when any image failed, 2 for invalid settings and 130 when
+interrupted.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from path_utils import path_manager
+from generator_factory import create_generator, create_image_scanner, create_folder_watcher
+from job_journal import JobJournal, default_journal_path, ADOPTABLE_STATES
+from task_pipeline import (ConcurrentGenerationPipeline, GenerationResult, StreamingJobQueue,
+                           DEFAULT_MAX_IN_FLIGHT, DEFAULT_DOWNLOAD_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+DEFAULT_CONFIG_FILE = path_manager.project_dir / "config" / "runway_config.json"
+
+# Seconds between progress events
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+_emit_lock = threading.Lock()
+
+
+def emit(event: str, **fields):
+    """
+    Write one progress event to stdout as a JSON line.
+
+    Every object has "event" and "time" (Unix seconds); the other fields
+    depend on the event: plan, started, completed, progress, summary or error.
+    """
+    record = {"event": event, "time": round(time.time(), 3), **fields}
+    with _emit_lock:
+        sys.stdout.write(json.dumps(record, default=str) + "\n")
+        sys.stdout.flush()
+
+
+def load_config(config_file: Optional[str]) -> Dict[str, Any]:
+    """
+    Read the settings saved by the interactive menu.
+
+    Args:
+        config_file: JSON configuration file; a missing default file is not an error
+
+    Returns:
+        Configuration values (empty if there is no file)
+    """
+    path = Path(config_file) if config_file else DEFAULT_CONFIG_FILE
+    if not path.exists():
+        if config_file:
+            raise ValueError(f"Config file not found: {path}")
+        return {}
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read config file {path}: {e}")
+    for key in ('driver_video', 'output_folder'):
+        if config.get(key):
+            config[key] = str(path_manager.resolve_path(config[key]))
+    return config
+
+
+def _absolute(path: Optional[str]) -> Optional[str]:
+    return str(Path(path).expanduser().resolve()) if path else path
+
+
+def build_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Merge command line options over the config file and check the result"""
+    config = load_config(args.config)
+    overrides = {
+        'api_key': args.api_key or os.environ.get('RUNWAYML_API_SECRET'),
+        # Relative to the current directory, not the project folder the generator resolves against
+        'driver_video': _absolute(args.driver),
+        'output_folder': _absolute(args.out),
+        'image_search_pattern': args.pattern,
+        'max_in_flight': args.max_in_flight,
+        'download_workers': args.download_workers,
+        'base_url': args.base_url,
+    }
+    if args.command == 'watch':
+        overrides.update(watch_poll_interval=args.poll_interval, watch_settle_seconds=args.settle)
+        if args.no_inotify:
+            config['watch_use_inotify'] = False
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    if args.exact_match:
+        config['exact_match'] = True
+    if args.co_located:
+        config['output_location'] = 'co-located'
+    elif args.out:
+        config['output_location'] = 'centralized'
+
+    if not config.get('api_key'):
+        raise ValueError("No API key: pass --api-key, set RUNWAYML_API_SECRET or save one in the config file")
+    if not config.get('driver_video'):
+        default_driver = path_manager.get_default_driver_video()
+        if default_driver:
+            config['driver_video'] = str(default_driver)
+    if not config.get('driver_video') or not Path(config['driver_video']).is_file():
+        raise ValueError(f"Driver video not found: {config.get('driver_video') or '(none)'}")
+    if config.get('output_location', 'centralized') != 'co-located':
+        config['output_folder'] = config.get('output_folder') or str(path_manager.downloads_dir)
+    return config
+
+
+def _result_fields(result: GenerationResult) -> Dict[str, Any]:
+    if result.skipped:
+        status = 'skipped'
+    elif result.succeeded:
+        status = 'succeeded'
+    else:
+        status = 'failed'
+    return {"image": result.job.image_path, "status": status,
+            "output": result.output_path, "error": result.error}
+
+
+class _StopOnSignal:
+    """Stops a folder watcher on SIGINT/SIGTERM; a second Ctrl+C interrupts at once."""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self._previous = {}
+
+    def _handle(self, signum, frame):
+        if self.watcher.stopped and signum == signal.SIGINT:
+            raise KeyboardInterrupt
+        logger.warning("Stopping: finishing generations in flight (Ctrl+C again to abort)")
+        self.watcher.stop()
+
+    def __enter__(self):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._previous[signum] = signal.signal(signum, self._handle)
+        return self
+
+    def __exit__(self, *exc):
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
+
+
+def run_batch(config: Dict[str, Any], root: str, use_journal: bool = True,
+              progress_interval: float = DEFAULT_PROGRESS_INTERVAL, watch: bool = False,
+              include_existing: bool = True) -> int:
+    """
+    Generate videos for every new image below root, reporting on stdout.
+
+    Args:
+        config: Configuration values (see build_config)
+        root: Folder whose subfolders hold the images
+        use_journal: Record jobs in the job journal so an interrupted run resumes
+        progress_interval: Seconds between progress events
+        watch: Keep watching root for new and changed images until stopped
+        include_existing: When watching, start with the images already present
+
+    Returns:
+        Process exit code
+    """
+    co_located = config.get('output_location', 'centralized') == 'co-located'
+    max_in_flight = int(config.get('max_in_flight', DEFAULT_MAX_IN_FLIGHT))
+    download_workers = int(config.get('download_workers', DEFAULT_DOWNLOAD_WORKERS))
+    generator = create_generator(config)
+    journal = None
+    job_stream = None
+    watcher = None
+    counts = {'succeeded': 0, 'failed': 0, 'skipped': 0}
+    start_time = time.monotonic()
+    try:
+        if use_journal:
+            journal = JobJournal(default_journal_path())
+            generator.attach_journal(journal, root=str(Path(root).resolve()))
+        resumable = len(journal.entries(root=generator.journal_root, states=ADOPTABLE_STATES)) if journal else 0
+        generator.build_duplicate_index()
+        emit("plan", root=str(root), output=None if co_located else config['output_folder'],
+             co_located=co_located, max_in_flight=max_in_flight, resumable=resumable,
+             mode="watch" if watch else "run")
+
+        if watch:
+            # The watcher blocks the pipeline's feeder thread until images arrive
+            watcher = create_folder_watcher(config, root)
+            jobs = generator.watch_generations(watcher, output_directory=config.get('output_folder'),
+                                               co_located_output=co_located,
+                                               include_existing=include_existing)
+        else:
+            jobs = job_stream = StreamingJobQueue(
+                generator.iter_generations(root, scanner=create_image_scanner(config),
+                                           output_directory=config.get('output_folder'),
+                                           co_located_output=co_located),
+                maxsize=4 * max_in_flight
+            ).start()
+        pipeline = ConcurrentGenerationPipeline(generator, max_in_flight=max_in_flight,
+                                                download_workers=download_workers)
+        last_progress = time.monotonic()
+        last_state = None
+
+        def on_start(job):
+            emit("started", image=job.image_path)
+
+        def on_complete(result: GenerationResult):
+            fields = _result_fields(result)
+            counts[fields['status']] += 1
+            emit("completed", **fields)
+
+        def on_tick():
+            nonlocal last_progress, last_state
+            if time.monotonic() - last_progress < progress_interval:
+                return
+            last_progress = time.monotonic()
+            if job_stream:
+                fields = {"found": len(job_stream), "scan_complete": job_stream.scan_complete}
+            else:
+                fields = {"watching": watcher.backend}
+            fields.update(counts, stages=pipeline.stage_depths(), concurrency=pipeline.controller.describe())
+            # An idle watcher stays quiet until something happens
+            if fields != last_state:
+                last_state = fields
+                emit("progress", **fields)
+
+        if watcher:
+            with _StopOnSignal(watcher):
+                pipeline.run(jobs, on_start=on_start, on_complete=on_complete, on_tick=on_tick,
+                             validate=generator.revalidate_job)
+        else:
+            pipeline.run(jobs, on_start=on_start, on_complete=on_complete, on_tick=on_tick,
+                         validate=generator.revalidate_job)
+    finally:
+        if watcher:
+            watcher.stop()
+        if job_stream:
+            job_stream.stop()
+        generator.close()
+        if journal:
+            journal.close()
+
+    emit("summary", **counts, total=sum(counts.values()),
+         elapsed=round(time.monotonic() - start_time, 1))
+    return EXIT_FAILURES if counts['failed'] else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="runway_batch", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Generate videos for every new image below a folder")
+    _add_batch_options(run)
+
+    watch = commands.add_parser("watch", help="Keep generating videos for images added below a folder")
+    _add_batch_options(watch)
+    watch.add_argument("--skip-existing", action="store_true",
+                       help="Only process images added or changed after watching starts")
+    watch.add_argument("--poll-interval", type=float, help="Seconds between folder snapshots when polling")
+    watch.add_argument("--settle", type=float, help="Seconds a new image must stay unchanged before it is used")
+    watch.add_argument("--no-inotify", action="store_true", help="Always poll (e.g. for network shares)")
+    return parser
+
+
+def _add_batch_options(run: argparse.ArgumentParser):
+    """Options shared by the run and watch commands"""
+    run.add_argument("--root", required=True, help="Folder whose subfolders hold the images")
+    run.add_argument("--driver", help="Driver video (default: config file, then assets/)")
+    output = run.add_mutually_exclusive_group()
+    output.add_argument("--out", help="Folder for the videos (default: config file, then Downloads)")
+    output.add_argument("--co-located", action="store_true", help="Save each video next to its image")
+    run.add_argument("--config", help=f"Settings file (default: {DEFAULT_CONFIG_FILE}, if present)")
+    run.add_argument("--api-key", help="Runway API key (default: RUNWAYML_API_SECRET, then config file)")
+    run.add_argument("--pattern", help="Image filename search pattern (default: config file, then 'genx')")
+    run.add_argument("--exact-match", action="store_true", help="Match the pattern as a whole filename segment")
+    run.add_argument("--max-in-flight", type=int, help="Act-Two tasks kept running at the same time")
+    run.add_argument("--download-workers", type=int, help="Finished videos downloaded at the same time")
+    run.add_argument("--no-journal", action="store_true", help="Don't record jobs in the job journal")
+    run.add_argument("--base-url", help="API base URL (e.g. a mock_runway_api server)")
+    run.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                     help="Seconds between progress events")
+    run.add_argument("-v", "--verbose", action="store_true", help="Log progress details to stderr")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    # runway_generator configures the root logger on import; logs always go to stderr
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    if not Path(args.root).is_dir():
+        emit("error", error=f"Input folder not found: {args.root}")
+        return EXIT_USAGE
+    try:
+        config = build_config(args)
+    except ValueError as e:
+        emit("error", error=str(e))
+        return EXIT_USAGE
+
+    try:
+        return run_batch(config, args.root, use_journal=not args.no_journal,
+                         progress_interval=args.progress_interval, watch=args.command == 'watch',
+                         include_existing=not getattr(args, 'skip_existing', False))
+    except KeyboardInterrupt:
+        emit("error", error="Interrupted")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        logger.exception("Batch failed")
+        emit("error", error=str(e))
+        return EXIT_FAILURES
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
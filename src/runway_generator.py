@@ -1,21 +1,62 @@
 import os
 import base64
 import time
+import threading
+from concurrent.futures import CancelledError, Future
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, Iterator, List, Dict, Optional, Union
 import requests
 import logging
-from PIL import Image
 
 # Import path utilities
-from path_utils import path_manager
+from path_utils import path_manager, file_sha256
+from image_scanner import ImageScanner, ScanPlan, ScannedImage
+from duplicate_index import DuplicateIndex, default_index_path, load_duplicate_index
+from payload_cache import DriverPayloadCache, PreprocessedImageCache, video_mime_type
+from image_preprocessing import preprocess_to_jpeg_bytes, save_debug_copy
+from preprocessing_stage import PreprocessingStage, DEFAULT_PREPROCESS_LOOKAHEAD
+from streaming_body import JSONStreamBody, StreamedField, Base64Field, FileField, image_mime_type
+from asset_uploads import DriverUploadCache
+from folder_watcher import FolderWatcher, NEW as NEW_IMAGE, CHANGED as CHANGED_IMAGE
+from job_journal import JobJournal, PENDING, SUBMITTED, SUCCEEDED, DOWNLOADED, FAILED, ADOPTABLE_STATES
+from video_info import VideoInfo
+from polling_strategy import create_polling_strategy, compute_task_timeout
+from rate_limiter import RateLimiter, CREATE, DOWNLOAD
+from concurrency_control import AdaptiveConcurrencyController, parse_retry_after
+from task_poller import TaskStatusPoller
+from http_transport import HTTPTransport, SUBMIT_TIMEOUT
+from task_pipeline import (ConcurrentGenerationPipeline, ExecutionPlan, GenerationJob, GenerationTask,
+                           GenerationResult, DEFAULT_MAX_IN_FLIGHT, DEFAULT_DOWNLOAD_WORKERS)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Attempts per task submission when the API answers 429 or 5xx
+MAX_SUBMIT_ATTEMPTS = 5
+
+# Attempts per video download; each one resumes the partial file
+MAX_DOWNLOAD_ATTEMPTS = 4
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+PART_SUFFIX = '.part'
+
+# Runs in which a succeeded task's video may fail to download before the
+# journal gives the task up, so the next run submits the image again
+MAX_DOWNLOAD_FAILURES = 3
+
+# Download responses meaning the signed output URL has expired or is gone
+EXPIRED_OUTPUT_STATUSES = (403, 404, 410)
+
+
 class RunwayActTwoBatchGenerator:
-    def __init__(self, api_key: str, verbose: bool = True, driver_video_path: Optional[str] = None):
+    def __init__(self, api_key: str, verbose: bool = True, driver_video_path: Optional[str] = None,
+                 base_url: Optional[str] = None, polling_strategy: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 payload_cache: Optional[DriverPayloadCache] = None,
+                 driver_upload: bool = False, preprocessed_debug_dir: Optional[str] = None,
+                 image_cache: Optional[PreprocessedImageCache] = None,
+                 fast_preprocessing: bool = False, preprocess_workers: int = 0,
+                 preprocess_lookahead: int = DEFAULT_PREPROCESS_LOOKAHEAD):
         self.api_key = api_key
         self.verbose = verbose
 
@@ -26,15 +67,48 @@ class RunwayActTwoBatchGenerator:
             default_video = path_manager.get_default_driver_video()
             self.driver_video_path = str(default_video) if default_video else ""
 
-        self.driver_video_data_uri = None  # Will store encoded driver video
-        self.base_url = "https://api.dev.runwayml.com/v1"
+        self._driver_video_lock = threading.Lock()  # Guards driver video caching across worker threads
+        self.payload_cache = payload_cache  # Encoded driver videos reused across launches
+        self.base_url = (base_url or "https://api.dev.runwayml.com/v1").rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "X-Runway-Version": "2024-11-06"
         }
+        # One pooled keep-alive session for submissions, polling, uploads and downloads
+        self.transport = HTTPTransport()
+        # Upload the driver video once and reference it by URI instead of inlining it
+        self.driver_uploads = (DriverUploadCache(self.base_url, self.headers, transport=self.transport)
+                               if driver_upload else None)
+        self._driver_upload_failed = False  # Set once uploads fail; the data URI is used from then on
+        # Resized character images are only written to disk when debugging
+        self.preprocessed_debug_dir = preprocessed_debug_dir
+        # Resized character images reused by reruns and retries
+        self.image_cache = image_cache
+        # Decode large JPEGs at a reduced scale before resizing
+        self.fast_preprocessing = fast_preprocessing
+        # Worker processes preparing the next images while earlier tasks are in flight
+        self.preprocessor: Optional[PreprocessingStage] = None
+        if preprocess_workers > 0:
+            self.preprocessor = PreprocessingStage(preprocess_workers, preprocess_lookahead,
+                                                   image_cache=image_cache, fast=fast_preprocessing)
         # Downloads folder for duplicate checking
         self.downloads_folder = str(path_manager.downloads_dir)
+        self._duplicate_indexes: Dict[str, DuplicateIndex] = {}  # Built once per run, keyed by folder
+        self.duplicate_index_path = default_index_path()
+        # Adaptive limit on concurrent submissions; pipelines replace it with their own
+        self.concurrency = AdaptiveConcurrencyController(DEFAULT_MAX_IN_FLIGHT)
+        # Token buckets shared by task creation, polling and downloads
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # One shared poller watches every task this generator has in flight
+        self.task_poller = TaskStatusPoller(self.base_url, self.headers,
+                                            strategy=create_polling_strategy(polling_strategy),
+                                            rate_limiter=self.rate_limiter,
+                                            transport=self.transport)
+        self._task_timeout = None  # Derived from the driver video length on first use
+        # Optional crash-safe job journal (see attach_journal)
+        self.journal: Optional[JobJournal] = None
+        self.journal_root: Optional[str] = None
         
     def encode_image_to_data_uri(self, image_path: str) -> str:
         """Convert local image file to base64 data URI"""
@@ -92,61 +166,38 @@ class RunwayActTwoBatchGenerator:
         
         Args:
             image_path: Path to original image
-            temp_folder: Temporary folder for resized images
+            temp_folder: Folder the resized image is written to
         """
-        try:
-            # Create temp folder if it doesn't exist
-            temp_path = Path(temp_folder)
-            temp_path.mkdir(exist_ok=True)
-            
-            # Open the image
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary (handles RGBA, P, etc.)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                original_width, original_height = img.size
-                logger.info(f"Original image size: {original_width}x{original_height}")
-                
-                # Calculate 16:9 dimensions
-                target_aspect = 16 / 9
-                current_aspect = original_width / original_height
-                
-                if current_aspect > target_aspect:
-                    # Image is wider than 16:9, crop width
-                    new_width = int(original_height * target_aspect)
-                    new_height = original_height
-                    left = (original_width - new_width) // 2
-                    top = 0
-                    right = left + new_width
-                    bottom = original_height
-                else:
-                    # Image is taller than 16:9, crop height
-                    new_width = original_width
-                    new_height = int(original_width / target_aspect)
-                    left = 0
-                    top = (original_height - new_height) // 2
-                    right = original_width
-                    bottom = top + new_height
-                
-                # Crop the image to 16:9
-                cropped_img = img.crop((left, top, right, bottom))
-                
-                # Resize to standard resolution (1280x720 for 16:9)
-                resized_img = cropped_img.resize((1280, 720), Image.LANCZOS)
-                
-                # Save the resized image
-                original_name = Path(image_path).stem
-                resized_path = temp_path / f"{original_name}_16x9.jpg"
-                resized_img.save(resized_path, "JPEG", quality=95)
-                
-                logger.info(f"Resized image saved: {resized_path} (1280x720)")
-                return str(resized_path)
-                
-        except Exception as e:
-            logger.error(f"Error resizing image {image_path}: {str(e)}")
+        data = preprocess_to_jpeg_bytes(image_path)
+        if data is None:
             # Return original path if resizing fails
-            return image_path        
+            return image_path
+        saved = save_debug_copy(data, image_path, temp_folder)
+        return str(saved) if saved else image_path
+
+    def preprocess_image(self, image_path: str) -> StreamedField:
+        """
+        Crop and resize a character image to 16:9 in memory for the task payload
+
+        Args:
+            image_path: Path to original image
+
+        Returns:
+            Data URI field with the 1280x720 JPEG (the original image if resizing fails)
+        """
+        logger.info(f"Resizing image to 16:9: {image_path}")
+        if self.preprocessor:
+            data = self.preprocessor.process(image_path)
+        elif self.image_cache:
+            data = self.image_cache.get(image_path)
+        else:
+            data = preprocess_to_jpeg_bytes(image_path, fast=self.fast_preprocessing)
+        if data is None:
+            return Base64Field(image_path, image_mime_type(image_path))
+        if self.preprocessed_debug_dir:
+            save_debug_copy(data, image_path, self.preprocessed_debug_dir)
+        return Base64Field(data, 'image/jpeg')
+
     def extract_name_from_genx_filename(self, filename: str) -> str:
         """Extract first and last name from genx filename like 'genx CIRILA MUNYON self.jpg'"""
         try:
@@ -165,33 +216,35 @@ class RunwayActTwoBatchGenerator:
             logger.error(f"Error extracting name from filename {filename}: {str(e)}")
             return None
     
+    def build_duplicate_index(self, downloads_folder: str = None, rebuild: bool = False) -> DuplicateIndex:
+        """
+        Load the duplicate index for the downloads folder and cache it for this run
+
+        The saved index is refreshed incrementally (only directories whose
+        mtime changed are listed). Call at the start of a batch;
+        check_existing_videos and get_genx_image_files then query it in memory.
+        """
+        folder = str(downloads_folder or self.downloads_folder)
+        index = load_duplicate_index(folder, self.duplicate_index_path, rebuild=rebuild)
+        self._duplicate_indexes[folder] = index
+        return index
+
+    def get_duplicate_index(self, downloads_folder: str = None) -> DuplicateIndex:
+        """Get the cached duplicate index for a folder, building it on first use"""
+        folder = str(downloads_folder or self.downloads_folder)
+        index = self._duplicate_indexes.get(folder)
+        if index is None:
+            index = self.build_duplicate_index(folder)
+        return index
+
     def check_existing_videos(self, name: str, downloads_folder: str = None) -> bool:
         """Check if videos already exist for this person in downloads folder"""
-        if downloads_folder is None:
-            downloads_folder = self.downloads_folder
-            
         try:
-            downloads_path = Path(downloads_folder)
-            if not downloads_path.exists():
-                logger.warning(f"Downloads folder does not exist: {downloads_folder}")
-                return False
-            
-            # Look for any video files containing this person's name
-            name_parts = name.split()
-            logger.info(f"🔍 Checking for existing videos with name parts: {name_parts}")
-            
-            # Search for video files (mp4, mov, etc.) recursively
-            video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
-            
-            for video_ext in video_extensions:
-                for video_file in downloads_path.rglob(f'*{video_ext}'):
-                    video_name = video_file.stem.upper()
-                    logger.info(f"   Checking video: {video_file.name} (stem: {video_name})")
-                    # Check if all name parts are in the video filename
-                    if all(part.upper() in video_name for part in name_parts):
-                        logger.info(f"🔍 DUPLICATE DETECTED: Found existing video for {name}: {video_file.name}")
-                        return True
-            
+            existing = self.get_duplicate_index(downloads_folder).find(name)
+            if existing:
+                logger.info(f"🔍 DUPLICATE DETECTED: Found existing video for {name}: {existing}")
+                return True
+
             logger.info(f"✅ NO DUPLICATES: No existing videos found for {name}")
             return False
             
@@ -199,109 +252,207 @@ class RunwayActTwoBatchGenerator:
             logger.error(f"Error checking existing videos for {name}: {str(e)}")
             return False
 
+    def filter_new_images(self, images: Iterable[ScannedImage]) -> List[str]:
+        """Drop images whose person already has a video in the downloads folder"""
+        new_images = []
+        for image in images:
+            # Extract name from filename and check for existing videos
+            person_name = self.extract_name_from_genx_filename(image.name)
+            if person_name:
+                if self.check_existing_videos(person_name):
+                    logger.info(f"⏭️  SKIPPING: {image.name} - Videos already exist for {person_name}")
+                    continue
+                else:
+                    logger.info(f"✅ ADDING: {image.name} - No existing videos found for {person_name}")
+            else:
+                logger.warning(f"⚠️  Could not extract name from: {image.name} - Processing anyway")
+
+            new_images.append(image.path)
+        return new_images
+
+    def plan_generations(self, scan_plan: ScanPlan, output_directory: Optional[str] = None,
+                         co_located_output: bool = False) -> ExecutionPlan:
+        """
+        Turn a scan into the immutable list of generations for this batch
+
+        Duplicate checks run once here; the pipeline only re-validates each
+        job right before submitting it (see revalidate_job).
+
+        Args:
+            scan_plan: Result of scanning the input folder
+            output_directory: Directory for videos when co_located_output is False
+            co_located_output: If True, save videos next to their source images
+
+        Returns:
+            ExecutionPlan used for counting, progress display and processing
+        """
+        jobs = []
+        for folder in scan_plan.folders_with_images:
+            for image_path in self.filter_new_images(scan_plan.images_in(folder)):
+                jobs.append(self._make_job(image_path, output_directory, co_located_output))
+        return ExecutionPlan(root=scan_plan.root, jobs=tuple(jobs),
+                             skipped_duplicates=len(scan_plan) - len(jobs))
+
+    def iter_generations(self, target_directory: str, search_pattern: str = 'genx',
+                         exact_match: bool = False, output_directory: Optional[str] = None,
+                         co_located_output: bool = False,
+                         scanner: Optional[ImageScanner] = None) -> Iterator[GenerationJob]:
+        """
+        Scan the input folder lazily and yield new jobs as they are discovered
+
+        Each batch folder is listed and duplicate-checked only when the
+        consumer asks for more jobs, so submissions can start before the
+        scan of a large tree has finished. Feed it to a StreamingJobQueue.
+
+        Args:
+            target_directory: Root directory whose subfolders hold the images
+            search_pattern: Image search pattern
+            exact_match: Match the pattern as a complete filename segment
+            output_directory: Directory for videos when co_located_output is False
+            co_located_output: If True, save videos next to their source images
+            scanner: Pre-configured scanner (overrides search_pattern and exact_match)
+
+        Yields:
+            GenerationJob for every image without an existing video
+        """
+        scanner = scanner or ImageScanner(search_pattern, exact_match)
+        for folder, images, _ in scanner.iter_folders(target_directory):
+            for image_path in self.filter_new_images(images):
+                yield self._make_job(image_path, output_directory, co_located_output)
+
+    @staticmethod
+    def _make_job(image_path: str, output_directory: Optional[str], co_located_output: bool,
+                  replace_existing: bool = False) -> GenerationJob:
+        """Create the job for one image, choosing its output folder"""
+        output_folder = str(Path(image_path).parent) if co_located_output else str(output_directory)
+        return GenerationJob(image_path=image_path, output_folder=output_folder,
+                             replace_existing=replace_existing)
+
+    def watch_generations(self, watcher: FolderWatcher, output_directory: Optional[str] = None,
+                          co_located_output: bool = False,
+                          include_existing: bool = True) -> Iterator[GenerationJob]:
+        """
+        Yield jobs for images as they arrive in a watched input folder
+
+        New images get the same duplicate check as a full scan; images that
+        changed after they were seen are yielded again without it, marked to
+        replace the video made from their earlier version. Runs until
+        watcher.stop() is called.
+
+        Args:
+            watcher: Watcher for the input folder
+            output_directory: Directory for videos when co_located_output is False
+            co_located_output: If True, save videos next to their source images
+            include_existing: Start with the images already in the folder
+
+        Yields:
+            GenerationJob for every new or changed image
+        """
+        for changes in watcher.changes(include_existing=include_existing):
+            new_images = [change.image for change in changes if change.kind == NEW_IMAGE]
+            for image_path in self.filter_new_images(new_images):
+                yield self._make_job(image_path, output_directory, co_located_output)
+            for change in changes:
+                if change.kind == CHANGED_IMAGE:
+                    logger.info(f"Image changed: {change.image.path}")
+                    yield self._make_job(change.image.path, output_directory, co_located_output,
+                                         replace_existing=True)
+
+    def revalidate_job(self, job: GenerationJob) -> Optional[str]:
+        """
+        Check a planned job is still worth submitting
+
+        An existing video skips the job, unless the job replaces existing
+        videos and the video is older than the image.
+
+        Returns:
+            Reason to skip the job, or None if it should be submitted
+        """
+        try:
+            image_stat = os.stat(job.image_path)
+        except OSError:
+            return "Image no longer exists"
+        output_path = Path(job.output_folder) / f"{Path(job.image_path).stem}_act_two.mp4"
+        try:
+            output_mtime = output_path.stat().st_mtime
+        except OSError:
+            return None
+        # ctime is when a copied-in image arrived, even if the copy kept its mtime
+        if job.replace_existing and output_mtime < max(image_stat.st_mtime, image_stat.st_ctime):
+            return None
+        return f"Video already exists: {output_path.name}"
+
     def get_genx_image_files(self, folder_path: str, search_pattern: str = 'genx', exact_match: bool = False) -> List[str]:
         """Get all image files matching the search pattern, excluding duplicates"""
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'}
-        matching_image_files = []
-        pattern_lower = search_pattern.lower()
-
-        folder = Path(folder_path)
-        if not folder.exists():
+        if not Path(folder_path).exists():
             logger.warning(f"Folder {folder_path} does not exist")
-            return matching_image_files
-
-        for file_path in folder.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                filename_lower = file_path.name.lower()
-
-                # Check if filename matches pattern
-                matches = False
-                if exact_match:
-                    import re
-                    # Pattern should match as a complete segment
-                    pattern_regex = r'(^|[^a-z0-9])' + re.escape(pattern_lower) + r'([^a-z0-9]|$)'
-                    if re.search(pattern_regex, filename_lower):
-                        matches = True
-                else:
-                    if pattern_lower in filename_lower:
-                        matches = True
-
-                if matches:
-                    # Extract name from filename and check for existing videos
-                    person_name = self.extract_name_from_genx_filename(file_path.name)
-                    if person_name:
-                        if self.check_existing_videos(person_name):
-                            logger.info(f"⏭️  SKIPPING: {file_path.name} - Videos already exist for {person_name}")
-                            continue
-                        else:
-                            logger.info(f"✅ ADDING: {file_path.name} - No existing videos found for {person_name}")
-                    else:
-                        logger.warning(f"⚠️  Could not extract name from: {file_path.name} - Processing anyway")
-
-                    matching_image_files.append(str(file_path))
+            return []
+
+        images, _ = ImageScanner(search_pattern, exact_match).scan_folder(folder_path)
+        matching_image_files = self.filter_new_images(images)
 
         logger.info(f"Found {len(matching_image_files)} new images matching '{search_pattern}' to process in {folder_path}")
-        return matching_image_files    
+        return matching_image_files
+
     def get_all_folders(self, root_directory: str) -> List[str]:
         """Get all folders in the root directory, sorted alphabetically"""
-        folders = []
-        root_path = Path(root_directory)
-        
-        if not root_path.exists():
+        if not Path(root_directory).exists():
             logger.error(f"Root directory {root_directory} does not exist")
-            return folders
-        
-        # Get all direct subdirectories
-        for folder_path in root_path.iterdir():
-            if folder_path.is_dir():
-                folders.append(str(folder_path))
-        
-        # Sort alphabetically by folder name
-        folders.sort(key=lambda x: Path(x).name.upper())
-        
+            return []
+
+        folders = ImageScanner().list_folders(root_directory)
         for folder_path in folders:
             logger.info(f"Found folder: {folder_path}")
-        
-        return folders        
-    def create_act_two_generation(self, character_image_path: str, output_folder: str) -> Optional[str]:
+
+        return folders
+
+    def _driver_video_payload(self) -> StreamedField:
+        """Driver video data URI, streamed from the payload cache or encoded while sending"""
+        with self._driver_video_lock:  # Concurrent cache misses encode the video only once
+            if self.payload_cache:
+                cached = self.payload_cache.get_path(self.driver_video_path)
+                if cached:
+                    return FileField(cached)
+        return Base64Field(self.driver_video_path, video_mime_type(self.driver_video_path))
+
+    def _driver_reference(self) -> Union[str, StreamedField]:
+        """Driver video for task payloads: its upload URI when available, otherwise its data URI"""
+        if self.driver_uploads and not self._driver_upload_failed:
+            uri = self.driver_uploads.get_uri(self.driver_video_path)
+            if uri:
+                return uri
+            logger.warning("Driver video upload unavailable, sending it inline with each request")
+            self._driver_upload_failed = True
+        return self._driver_video_payload()
+
+    def submit_act_two_task(self, character_image_path: str,
+                            character: Optional[StreamedField] = None) -> Optional[str]:
         """
-        Generate Act-Two video using driver video and character image with data URIs
-        
+        Create an Act-Two task for a character image without waiting for it
+
         Args:
             character_image_path: Path to character image
-            output_folder: Folder to save generated video
+            character: Image field prepared by preprocess_image (prepared now if omitted)
+
+        Returns:
+            Task ID of the created task, or None if submission failed
         """
         try:
             # Check if driver video exists
             if not Path(self.driver_video_path).exists():
                 logger.error(f"Driver video not found: {self.driver_video_path}")
                 return None
-            
-            # Encode driver video to data URI if not already done
-            if not hasattr(self, 'driver_video_data_uri') or not self.driver_video_data_uri:
-                logger.info(f"Encoding driver video to data URI: {self.driver_video_path}")
-                self.driver_video_data_uri = self.encode_video_to_data_uri(self.driver_video_path)
-                if not self.driver_video_data_uri:
-                    logger.error("Failed to encode driver video")
-                    return None
-            
-            # Resize image to 16:9 aspect ratio before encoding
-            logger.info(f"Resizing image to 16:9: {character_image_path}")
-            resized_image_path = self.resize_image_to_16_9(character_image_path)
-            
-            # Encode character image to data URI
-            logger.info(f"Encoding character image to data URI: {resized_image_path}")
-            character_image_data_uri = self.encode_image_to_data_uri(resized_image_path)
-            if not character_image_data_uri:
-                logger.error(f"Failed to encode character image: {resized_image_path}")
-                return None
-            
-            # Create output filename
-            image_name = Path(character_image_path).stem
-            output_path = Path(output_folder) / f"{image_name}_act_two.mp4"
-            
+
+            # Upload the driver video once, or send it inline as a data URI
+            driver_video_uri = self._driver_reference()
+
+            # Resize image to 16:9 in memory; both data URIs are base64-encoded
+            # chunk by chunk while the request is sent
+            character_image_data_uri = (character if character is not None
+                                        else self.preprocess_image(character_image_path))
+
             logger.info(f"Starting Act-Two generation for: {character_image_path}")
-            
+
             # Create Act-Two generation task using updated API structure
             payload = {
                 "character": {
@@ -309,86 +460,498 @@ class RunwayActTwoBatchGenerator:
                     "uri": character_image_data_uri
                 },
                 "reference": {
-                    "type": "video", 
-                    "uri": self.driver_video_data_uri
+                    "type": "video",
+                    "uri": driver_video_uri
                 },
                 "bodyControl": False,  # Gestures OFF
                 "expressionIntensity": 1,  # Facial expressiveness set to 1
                 "model": "act_two",
                 "ratio": "1280:720"
-            }            
-            response = requests.post(
-                f"{self.base_url}/character_performance",
-                headers=self.headers,
-                json=payload
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to create Act-Two task: {response.text}")
+            }
+            # Throttled (429) and server-error (5xx) responses are retried after
+            # backing off instead of losing the image
+            attempt = 0
+            while attempt < MAX_SUBMIT_ATTEMPTS:
+                attempt += 1
+                self.concurrency.wait_for_resume()
+                self.rate_limiter.acquire(CREATE)
+                response = self.transport.post(
+                    f"{self.base_url}/character_performance",
+                    headers=self.headers,
+                    data=JSONStreamBody(payload),
+                    timeout=SUBMIT_TIMEOUT
+                )
+
+                if response.status_code == 200:
+                    self.concurrency.record_success()
+                    break
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code == 429:
+                    self.concurrency.record_throttle(retry_after)
+                elif response.status_code >= 500:
+                    self.concurrency.record_server_error(retry_after)
+                    if retry_after is None:
+                        time.sleep(min(60, 2 ** attempt))
+                elif (response.status_code == 400 and isinstance(driver_video_uri, str)
+                      and self._rejects_driver_reference(response, driver_video_uri)):
+                    # The upload expired or was not accepted: fall back to the inline video.
+                    # The rejected request doesn't count as an attempt.
+                    logger.warning(f"Uploaded driver video rejected, sending it inline: {response.text}")
+                    self.driver_uploads.invalidate(self.driver_video_path)
+                    self._driver_upload_failed = True
+                    driver_video_uri = payload["reference"]["uri"] = self._driver_video_payload()
+                    attempt -= 1
+                    continue
+                else:
+                    logger.error(f"Failed to create Act-Two task: {response.text}")
+                    return None
+                logger.warning(f"Act-Two submission rejected with HTTP {response.status_code} "
+                               f"(attempt {attempt}/{MAX_SUBMIT_ATTEMPTS}): {self.concurrency.describe()}")
+            else:
+                logger.error(f"Failed to create Act-Two task after {MAX_SUBMIT_ATTEMPTS} attempts: {response.text}")
                 return None
-            
+
             task_data = response.json()
             task_id = task_data['id']
             logger.info(f"Act-Two task created. Task ID: {task_id}")
-            
-            # Wait for completion (polling)
-            max_wait = 600  # 10 minutes
-            wait_time = 0
-            
-            while wait_time < max_wait:
-                time.sleep(10)  # Check every 10 seconds
-                wait_time += 10
-                
-                # Check task status
-                status_response = requests.get(
-                    f"{self.base_url}/tasks/{task_id}",
-                    headers=self.headers
-                )
-                
-                if status_response.status_code != 200:
-                    logger.error(f"Failed to check task status: {status_response.text}")
-                    return None
-                
-                status_data = status_response.json()
-                status = status_data.get('status', 'UNKNOWN')
-                
-                logger.info(f"Task {task_id} status: {status}")
-                
-                if status == 'SUCCEEDED':
-                    # Get video URL
-                    video_url = status_data.get('output', [None])[0]
-                    if video_url:
-                        logger.info(f"Act-Two generation completed! URL: {video_url}")
-                        
-                        # Download the video
-                        video_response = requests.get(video_url)
-                        if video_response.status_code == 200:
-                            # Ensure output directory exists
-                            output_path.parent.mkdir(parents=True, exist_ok=True)
-                            
-                            with open(output_path, 'wb') as f:
-                                f.write(video_response.content)
-                            
-                            logger.info(f"Video saved to: {output_path}")
-                            return str(output_path)
-                        else:
-                            logger.error(f"Failed to download video: {video_response.status_code}")
-                    else:
-                        logger.error("No video URL in response")
-                    return None
-                    
-                elif status == 'FAILED':
-                    logger.error(f"Task {task_id} failed: {status_data.get('error', 'Unknown error')}")
+            return task_id
+
+        except Exception as e:
+            logger.error(f"Error submitting Act-Two task for {character_image_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _rejects_driver_reference(response: requests.Response, driver_uri: str) -> bool:
+        """True if an HTTP 400 blames the uploaded driver video rather than the character image"""
+        text = response.text or ''
+        if driver_uri in text:
+            return True
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            for issue in body.get('issues') or []:
+                path = issue.get('path') if isinstance(issue, dict) else None
+                if isinstance(path, list) and path and path[0] == 'reference':
+                    return True
+        lowered = text.lower()
+        if 'character' in lowered:
+            return False
+        return any(word in lowered for word in ('reference', 'asset', 'upload'))
+
+    def track_task(self, task_id: str) -> Future:
+        """
+        Start watching a task on the shared status poller without blocking
+
+        Args:
+            task_id: ID returned by submit_act_two_task
+
+        Returns:
+            Future resolved with the task's final status data (see
+            TaskStatusPoller.track); cancelling it stops the polling, and
+            close() cancels it
+        """
+        return self.task_poller.track(task_id, max_wait=self.task_timeout)
+
+    def wait_for_task(self, task_id: str) -> Optional[Dict]:
+        """
+        Wait for a task to finish using the shared status poller
+
+        Args:
+            task_id: ID returned by submit_act_two_task
+
+        Returns:
+            Final task status data if the task succeeded, otherwise None
+        """
+        try:
+            return self._succeeded_status(task_id, self.track_task(task_id).result())
+        except CancelledError:
+            return None
+
+    @staticmethod
+    def _succeeded_status(task_id: str, status_data: Optional[Dict]) -> Optional[Dict]:
+        """The final status data if it reports success, otherwise None (logging why)"""
+        if not status_data:
+            return None
+
+        status = status_data.get('status', 'UNKNOWN')
+        if status != 'SUCCEEDED':
+            logger.error(f"Task {task_id} failed: {status_data.get('error', status_data.get('failure', 'Unknown error'))}")
+            return None
+        return status_data
+
+    @property
+    def task_timeout(self) -> float:
+        """Seconds to wait for a task, scaled with the driver video length"""
+        if self._task_timeout is None:
+            duration, _ = VideoInfo.get_duration(self.driver_video_path)
+            self._task_timeout = compute_task_timeout(duration)
+            logger.info(f"Task timeout set to {self._task_timeout:.0f} seconds")
+        return self._task_timeout
+
+    def close(self):
+        """Stop background polling and preprocessing for this generator"""
+        self.task_poller.stop()
+        self.transport.close()
+        if self.preprocessor:
+            self.preprocessor.close()
+        if self.image_cache:
+            self.image_cache.flush()
+
+    def download_task_output(self, status_data: Dict, output_path: Path) -> Optional[str]:
+        """
+        Download the video produced by a succeeded task
+
+        The video is streamed in chunks to a .part file next to the output and
+        renamed into place once complete and checked, so neither a crash nor a
+        corrupt download ever leaves a bad video under the output name. An
+        existing .part file from an interrupted download is resumed with an
+        HTTP Range request.
+
+        Args:
+            status_data: Task status data returned by wait_for_task
+            output_path: Destination file for the video
+
+        Returns:
+            The output path, or None if the download failed or was not a valid video
+        """
+        try:
+            part_path = self.fetch_task_output(status_data, output_path)
+        except requests.HTTPError as e:
+            logger.error(f"Video URL is no longer available: {e}")
+            return None
+        if part_path is None or self.publish_download(part_path, output_path):
+            return None
+        return str(output_path)
+
+    @staticmethod
+    def _part_path(output_path: Path) -> Path:
+        output_path = Path(output_path)
+        return output_path.with_name(output_path.name + PART_SUFFIX)
+
+    def fetch_task_output(self, status_data: Dict, output_path: Path) -> Optional[Path]:
+        """
+        Download the video of a succeeded task into the .part file next to its output
+
+        Returns:
+            Path of the complete .part file (see publish_download), or None on failure
+
+        Raises:
+            requests.HTTPError: The output URL has expired or is gone (403, 404 or 410)
+        """
+        # Get video URL
+        video_url = (status_data.get('output') or [None])[0]
+        if not video_url:
+            logger.error("No video URL in response")
+            return None
+
+        logger.info(f"Act-Two generation completed! URL: {video_url}")
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = self._part_path(output_path)
+
+        for attempt in range(1, MAX_DOWNLOAD_ATTEMPTS + 1):
+            self.rate_limiter.acquire(DOWNLOAD)
+            try:
+                if self._download_to_part(video_url, part_path):
+                    break
+                return None
+            except requests.HTTPError:
+                raise  # Retrying an expired URL cannot succeed
+            except (requests.RequestException, OSError) as e:
+                # Keep the partial file; the next attempt continues where this one stopped
+                logger.warning(f"Download interrupted (attempt {attempt}/{MAX_DOWNLOAD_ATTEMPTS}): {e}")
+        else:
+            logger.error(f"Failed to download video after {MAX_DOWNLOAD_ATTEMPTS} attempts: {video_url}")
+            return None
+        return part_path
+
+    def publish_download(self, part_path: Path, output_path: Path) -> Optional[str]:
+        """
+        Check a downloaded .part file is a complete MP4 and rename it to the output
+
+        An invalid download is deleted, so the next attempt starts over.
+
+        Returns:
+            None once the video is at output_path, otherwise what is wrong with it
+        """
+        problem = VideoInfo.check_mp4(part_path)
+        if problem:
+            logger.error(f"Downloaded video {output_path} is invalid: {problem}")
+            try:
+                os.remove(part_path)
+            except OSError as e:
+                logger.warning(f"Could not remove invalid download {part_path}: {e}")
+            return problem
+        os.replace(part_path, output_path)
+        logger.info(f"Video saved to: {output_path}")
+        return None
+
+    def _download_to_part(self, video_url: str, part_path: Path) -> bool:
+        """
+        Stream a video into a partial file, resuming from its current size
+
+        Returns:
+            True once the partial file holds the complete video, False if the
+            server refused the download. Connection errors are raised, and so is
+            requests.HTTPError when the output URL has expired.
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {'Range': f"bytes={offset}-"} if offset else {}
+        with self.transport.get(video_url, headers=headers, stream=True) as response:
+            if response.status_code == 416 and offset:
+                # Nothing left to send for this offset; the partial file is stale
+                logger.warning(f"Discarding unusable partial download {part_path}")
+                part_path.unlink()
+                raise requests.ConnectionError("Range not satisfiable, restarting download")
+            if response.status_code in EXPIRED_OUTPUT_STATUSES:
+                response.raise_for_status()
+            if response.status_code not in (200, 206):
+                logger.error(f"Failed to download video: {response.status_code}")
+                return False
+
+            resumed = response.status_code == 206
+            if offset and resumed:
+                logger.info(f"Resuming download of {part_path.name} at {offset} bytes")
+            elif offset:
+                logger.info(f"Server ignored the resume request, downloading {part_path.name} again")
+            expected = response.headers.get('Content-Length')
+            expected = int(expected) + (offset if resumed else 0) if expected else None
+
+            with open(part_path, 'ab' if resumed else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                    f.write(chunk)
+
+        size = part_path.stat().st_size
+        if expected is not None and size != expected:
+            raise requests.ConnectionError(f"Download ended at {size} of {expected} bytes")
+        return True
+
+    def open_generation(self, character_image_path: str,
+                        output_folder: str) -> Union[GenerationTask, str]:
+        """
+        Start tracking a generation, consulting the journal first
+
+        Args:
+            character_image_path: Path to character image
+            output_folder: Folder to save generated video
+
+        Returns:
+            GenerationTask to run (with task_id set if an earlier run's task is
+            adopted), or the output path if the journal shows the video was
+            already downloaded
+        """
+        image_name = Path(character_image_path).stem
+        task = GenerationTask(character_image_path, Path(output_folder) / f"{image_name}_act_two.mp4")
+        if self.journal:
+            task.journal_key = (str(Path(character_image_path).resolve()), file_sha256(character_image_path))
+            entry = self.journal.lookup(*task.journal_key)
+            if entry and entry.state == DOWNLOADED and entry.output_path and Path(entry.output_path).exists():
+                logger.info(f"Journal: {character_image_path} already downloaded to {entry.output_path}")
+                return entry.output_path
+            if entry and entry.task_id and entry.state in ADOPTABLE_STATES:
+                # Task was created by an earlier run; adopt it instead of paying again
+                task.task_id = entry.task_id
+                logger.info(f"Journal: adopting task {task.task_id} ({entry.state}) for {character_image_path}")
+        return task
+
+    def prepare_character(self, task: GenerationTask):
+        """Resize the task's character image so submission only has to send it"""
+        task.character = self.preprocess_image(task.image_path)
+
+    def submit_generation(self, task: GenerationTask) -> bool:
+        """
+        Create the Act-Two task for a generation
+
+        Returns:
+            True if the task was created (task.task_id is set), False otherwise
+        """
+        self._journal_record(task.journal_key, PENDING)
+        try:
+            task.task_id = self.submit_act_two_task(task.image_path, character=task.character)
+        finally:
+            task.character = None  # Sent; don't keep the encoded image around
+        if not task.task_id:
+            task.error = "Submission failed"
+            self._journal_record(task.journal_key, FAILED, error=task.error)
+            return False
+        self._journal_record(task.journal_key, SUBMITTED, task_id=task.task_id)
+        return True
+
+    def await_generation(self, task: GenerationTask) -> bool:
+        """
+        Wait for a submitted (or adopted) task to finish
+
+        Returns:
+            True if the task succeeded (task.status_data is set), False otherwise
+        """
+        try:
+            status_data = self.track_task(task.task_id).result()
+        except CancelledError:
+            # Shutting down; the journal keeps the task SUBMITTED so the next run adopts it
+            task.error = "Stopped before the task finished"
+            return False
+        except Exception as e:
+            logger.error(f"Error waiting for task {task.task_id}: {str(e)}")
+            status_data = None
+        return self.record_task_outcome(task, status_data)
+
+    def record_task_outcome(self, task: GenerationTask, status_data: Optional[Dict]) -> bool:
+        """
+        Record the final status of a task, e.g. as resolved by track_task
+
+        Only a final FAILED or CANCELLED status or a timeout marks the journal
+        entry FAILED; if the status could not be retrieved the task may still
+        finish, so the entry stays SUBMITTED for the next run to adopt.
+
+        Returns:
+            True if the task succeeded (task.status_data is set), False otherwise
+        """
+        if status_data is None:
+            task.error = "Task status unavailable"
+            logger.error(f"Could not get the status of task {task.task_id}; leaving it for the next run")
+            return False
+        task.status_data = self._succeeded_status(task.task_id, status_data)
+        if not task.status_data:
+            task.error = "Task failed or timed out"
+            self._journal_record(task.journal_key, FAILED, error=task.error)
+            return False
+        self._journal_record(task.journal_key, SUCCEEDED)
+        return True
+
+    def download_generation(self, task: GenerationTask) -> bool:
+        """
+        Download the video of a succeeded task into the .part file next to its output
+
+        The verify stage checks it and renames it to task.output_path.
+
+        Returns:
+            True once the complete download is on disk, False otherwise
+        """
+        try:
+            downloaded = self.fetch_task_output(task.status_data, task.output_path)
+        except requests.HTTPError as e:
+            logger.error(f"Video URL for {task.image_path} is no longer available: {str(e)}")
+            self._download_failed(task, "Video URL expired", give_up=True)
+            return False
+        except Exception as e:
+            logger.error(f"Error downloading video for {task.image_path}: {str(e)}")
+            downloaded = None
+        if not downloaded:
+            self._download_failed(task, "Download failed")
+            return False
+        return True
+
+    def _download_failed(self, task: GenerationTask, error: str, give_up: bool = False):
+        """
+        Record a failed download of a succeeded task
+
+        The entry stays SUCCEEDED so the next run retries only the download,
+        until the video has failed MAX_DOWNLOAD_FAILURES times or give_up is
+        set; then it is marked FAILED and the next run submits the image again.
+        """
+        task.error = error
+        if not (self.journal and task.journal_key):
+            return
+        if not give_up:
+            try:
+                failures = self.journal.record_download_failure(*task.journal_key, error,
+                                                                root=self.journal_root)
+            except Exception as e:
+                logger.error(f"Failed to update job journal: {str(e)}")
+                return
+            give_up = failures >= MAX_DOWNLOAD_FAILURES
+        if give_up:
+            logger.warning(f"Giving up on task {task.task_id}; {task.image_path} will be submitted again")
+            self._journal_record(task.journal_key, FAILED, error=error)
+
+    def verify_generation(self, task: GenerationTask) -> bool:
+        """
+        Check a downloaded video is a complete MP4 before counting it as done
+
+        The video only gets its output name once it passes, so neither
+        duplicate detection nor the next run can mistake an invalid download
+        for a finished generation.
+
+        Returns:
+            True if the video is valid and at task.output_path, False otherwise
+        """
+        try:
+            problem = self.publish_download(self._part_path(task.output_path), task.output_path)
+        except OSError as e:
+            problem = f"could not be saved ({e})"
+        if problem:
+            self._download_failed(task, f"Invalid video: {problem}")
+            return False
+
+        # Keep this run's duplicate indexes in sync with the new video
+        for index in list(self._duplicate_indexes.values()):
+            if index.covers(task.output_path):
+                index.add(task.output_path)
+        self._journal_record(task.journal_key, DOWNLOADED, output_path=str(task.output_path))
+        return True
+
+    def create_act_two_generation(self, character_image_path: str, output_folder: str) -> Optional[str]:
+        """
+        Generate Act-Two video using driver video and character image with data URIs
+
+        Runs every pipeline stage for one image on the calling thread. Use
+        ConcurrentGenerationPipeline to keep several generations in flight at once.
+
+        Args:
+            character_image_path: Path to character image
+            output_folder: Folder to save generated video
+
+        Returns:
+            Path to the downloaded video, or None if the generation failed
+        """
+        try:
+            task = self.open_generation(character_image_path, output_folder)
+            if not isinstance(task, GenerationTask):
+                return task
+            if not task.task_id:
+                self.prepare_character(task)
+                if not self.submit_generation(task):
                     return None
-            
-            logger.error(f"Task {task_id} timed out after {max_wait} seconds")
+            if (self.await_generation(task) and self.download_generation(task)
+                    and self.verify_generation(task)):
+                return str(task.output_path)
             return None
-            
         except Exception as e:
             logger.error(f"Error in Act-Two generation for {character_image_path}: {str(e)}")
-            return None        
+            return None
+
+    def attach_journal(self, journal: Optional[JobJournal], root: Optional[str] = None):
+        """
+        Record every job state transition in a persistent journal
+
+        Args:
+            journal: JobJournal to write to (None disables journaling)
+            root: Input root the current batch was started on
+        """
+        self.journal = journal
+        self.journal_root = str(root) if root else None
+        if journal and root:
+            resumable = journal.entries(root=self.journal_root, states=ADOPTABLE_STATES)
+            if resumable:
+                logger.info(f"Journal: {len(resumable)} task(s) from an earlier run will be adopted")
+
+    def _journal_record(self, journal_key: Optional[tuple], state: str, **fields):
+        """Write a state transition to the journal, if one is attached"""
+        if self.journal and journal_key:
+            try:
+                self.journal.record(*journal_key, state, root=self.journal_root, **fields)
+            except Exception as e:
+                logger.error(f"Failed to update job journal: {str(e)}")
+
     def process_all_images(self, target_directory: str, output_directory: str = r"C:\Users\ashrv\Downloads",
-                          delay_between_generations: int = 1, co_located_output: bool = False):
+                          delay_between_generations: int = 1, co_located_output: bool = False,
+                          max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, search_pattern: str = 'genx',
+                          exact_match: bool = False, scanner: Optional[ImageScanner] = None,
+                          download_workers: int = DEFAULT_DOWNLOAD_WORKERS):
         """
         Main function to process all images in genx folders using Act-Two
         NOW WITH DUPLICATE DETECTION!
@@ -396,13 +959,21 @@ class RunwayActTwoBatchGenerator:
         Args:
             target_directory: Root directory to search for genx folders
             output_directory: Directory to save generated videos (used when co_located_output=False)
-            delay_between_generations: Seconds to wait between API calls
+            delay_between_generations: Legacy setting, ignored; requests are paced by
+                the generator's rate limiter (see create_rate_limiter)
             co_located_output: If True, save videos in same folder as source images
+            max_in_flight: Maximum number of Act-Two tasks running at the same time
+            search_pattern: Image search pattern
+            exact_match: Match the pattern as a complete filename segment
+            scanner: Pre-configured scanner (overrides search_pattern and exact_match)
+            download_workers: Finished videos downloaded at the same time
         """
+        scanner = scanner or ImageScanner(search_pattern, exact_match)
+        search_pattern = scanner.pattern
         
         logger.info("=== RUNWAY ACT-TWO BATCH GENERATOR WITH DUPLICATE DETECTION ===")
         logger.info(f"Driver video: {self.driver_video_path}")
-        logger.info(f"Searching for images with 'genx' in filename in: {target_directory}")
+        logger.info(f"Searching for images with '{search_pattern}' in filename in: {target_directory}")
         if co_located_output:
             logger.info("Output location: Same folder as source images (co-located)")
         else:
@@ -426,8 +997,12 @@ class RunwayActTwoBatchGenerator:
             print(f"{RED}Driver video not found: {self.driver_video_path}{RESET}")
             return
         
-        # Get all folders in the target directory
-        all_folders = self.get_all_folders(target_directory)
+        # Index existing videos once for the whole batch
+        self.build_duplicate_index()
+
+        # Scan the target directory once
+        plan = scanner.scan(target_directory)
+        all_folders = plan.folders
         
         if not all_folders:
             logger.warning("No folders found in target directory!")
@@ -438,16 +1013,16 @@ class RunwayActTwoBatchGenerator:
         successful_generations = 0
         failed_generations = 0
         skipped_duplicates = 0
+        jobs = []
         
         for folder in all_folders:
             logger.info(f"\nProcessing folder: {folder}")
             print(f"\n{CYAN}🔍 Processing folder: {Path(folder).name}{RESET}")
             
             # Get all genx images in this folder (with duplicate filtering)
-            genx_image_files = self.get_genx_image_files(folder)
-            total_found = len([f for f in Path(folder).iterdir() 
-                              if f.is_file() and 'genx' in f.name.lower() 
-                              and f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tiff', '.tif'}])
+            folder_images = plan.images_in(folder)
+            genx_image_files = self.filter_new_images(folder_images)
+            total_found = len(folder_images)
             skipped_in_folder = total_found - len(genx_image_files)
             total_images += len(genx_image_files)
             skipped_duplicates += skipped_in_folder
@@ -465,11 +1040,8 @@ class RunwayActTwoBatchGenerator:
             if skipped_in_folder > 0:
                 print(f"{YELLOW}⏭️  Skipped {skipped_in_folder} duplicates{RESET}")
             
-            # Process each genx image
-            for i, image_path in enumerate(genx_image_files, 1):
-                logger.info(f"\n[{i}/{len(genx_image_files)}] Processing: {Path(image_path).name}")
-                print(f"\n{MAGENTA}[{i}/{len(genx_image_files)}] Processing: {Path(image_path).name}{RESET}")
-
+            # Queue each genx image for the pipeline
+            for image_path in genx_image_files:
                 # Determine output folder based on co_located_output setting
                 if co_located_output:
                     # Save to same folder as source image
@@ -478,26 +1050,42 @@ class RunwayActTwoBatchGenerator:
                 else:
                     # Save to centralized output directory
                     specific_output = Path(output_directory)
+                jobs.append(GenerationJob(image_path=image_path, output_folder=str(specific_output)))
+
+        execution_plan = ExecutionPlan(root=str(target_directory), jobs=tuple(jobs),
+                                       skipped_duplicates=skipped_duplicates)
+
+        # Process all queued images, keeping up to max_in_flight tasks running
+        pipeline = ConcurrentGenerationPipeline(self, max_in_flight=max_in_flight,
+                                                download_workers=download_workers)
+        logger.info(f"Processing {len(jobs)} images with up to {pipeline.max_in_flight} tasks in flight")
+        started = 0
+
+        def on_start(job: GenerationJob):
+            nonlocal started
+            started += 1
+            logger.info(f"\n[{started}/{len(jobs)}] Processing: {job.name}")
+            print(f"\n{MAGENTA}[{started}/{len(jobs)}] Processing: {job.name}{RESET}")
+
+        def on_complete(result: GenerationResult):
+            nonlocal successful_generations, failed_generations, skipped_duplicates, total_images
+            if result.skipped:
+                skipped_duplicates += 1
+                total_images -= 1
+                logger.info(f"Skipped: {result.job.name} ({result.error})")
+                print(f"{YELLOW}⏭️  Skipped: {result.job.name} ({result.error}){RESET}")
+            elif result.succeeded:
+                successful_generations += 1
+                logger.info(f"Success: {Path(result.output_path).name}")
+                print(f"{GREEN}✅ Success: {Path(result.output_path).name}{RESET}")
+            else:
+                failed_generations += 1
+                logger.error(f"Failed: {result.job.name}")
+                print(f"{RED}❌ Failed: {result.job.name}{RESET}")
+
+        pipeline.run(execution_plan, on_start=on_start, on_complete=on_complete,
+                     validate=self.revalidate_job)
 
-                result = self.create_act_two_generation(
-                    character_image_path=image_path,
-                    output_folder=str(specific_output)
-                )
-                
-                if result:
-                    successful_generations += 1
-                    logger.info(f"Success: {Path(result).name}")
-                    print(f"{GREEN}✅ Success: {Path(result).name}{RESET}")
-                else:
-                    failed_generations += 1
-                    logger.error(f"Failed: {Path(image_path).name}")
-                    print(f"{RED}❌ Failed: {Path(image_path).name}{RESET}")
-                
-                # Add delay between API calls to avoid rate limiting
-                if i < len(genx_image_files) and delay_between_generations > 0:
-                    logger.info(f"Waiting {delay_between_generations} seconds before next generation...")
-                    print(f"{BLUE}⏳ Waiting {delay_between_generations} seconds...{RESET}")
-                    time.sleep(delay_between_generations)        
         # Final summary
         logger.info("\n" + "=" * 70)
         logger.info("=== BATCH PROCESSING COMPLETE WITH DUPLICATE DETECTION ===")
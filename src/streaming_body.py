@@ -0,0 +1,158 @@
+"""
+Streaming JSON request bodies for payloads that carry large data URIs.
+Building the body with json=payload keeps the raw file, its base64 encoding,
+the decoded string and the serialized JSON in memory at the same time.
+JSONStreamBody instead writes the JSON envelope around fields whose content
+is produced chunk by chunk from a memory-mapped file while the request is
+being sent, so memory per submission stays constant whatever the file size.
+"""
+
+import base64
+import itertools
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterator, List, Union
+
+# Raw bytes encoded per chunk; a multiple of 3 so chunks concatenate to valid base64
+ENCODE_CHUNK_BYTES = 3 * 64 * 1024
+
+# Bytes of pre-encoded text sent per chunk
+COPY_CHUNK_BYTES = 256 * 1024
+
+IMAGE_MIME_TYPES = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.webp': 'image/webp'}
+
+
+def image_mime_type(image_path: Union[str, Path]) -> str:
+    """MIME type for a character image, defaulting to JPEG."""
+    return IMAGE_MIME_TYPES.get(Path(image_path).suffix.lower(), 'image/jpeg')
+
+
+def _iter_mapped(path: Union[str, Path], chunk_size: int) -> Iterator[memoryview]:
+    """Yield a file's contents in slices of a read-only memory map.
+
+    Each slice is released when the next one is requested, so callers must
+    copy or encode it before moving on.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(mapped), chunk_size):
+                    piece = view[offset:offset + chunk_size]
+                    try:
+                        yield piece
+                    finally:
+                        piece.release()
+            finally:
+                view.release()
+
+
+class StreamedField:
+    """A JSON string value whose content is produced while the body is sent.
+
+    The content must not need JSON escaping (base64 and data URI prefixes never do).
+    """
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def chunks(self) -> Iterator[bytes]:
+        raise NotImplementedError
+
+
+class Base64Field(StreamedField):
+    """Data URI of a file or bytes object, base64-encoded chunk by chunk."""
+
+    def __init__(self, source: Union[str, Path, bytes], mime_type: str):
+        """
+        Initialize the field.
+
+        Args:
+            source: Path of the file to encode, or its contents
+            mime_type: MIME type written into the data URI
+        """
+        self.source = source
+        self.prefix = f"data:{mime_type};base64,".encode('ascii')
+
+    def _raw_size(self) -> int:
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            return len(self.source)
+        return os.path.getsize(self.source)
+
+    def __len__(self) -> int:
+        return len(self.prefix) + 4 * ((self._raw_size() + 2) // 3)
+
+    def chunks(self) -> Iterator[bytes]:
+        yield self.prefix
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            view = memoryview(self.source)
+            pieces = (view[i:i + ENCODE_CHUNK_BYTES] for i in range(0, len(view), ENCODE_CHUNK_BYTES))
+        else:
+            pieces = _iter_mapped(self.source, ENCODE_CHUNK_BYTES)
+        for piece in pieces:
+            yield base64.b64encode(piece)
+
+
+class FileField(StreamedField):
+    """Text of a file that already holds an encoded value, e.g. a cached data URI."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = path
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path)
+
+    def chunks(self) -> Iterator[bytes]:
+        for piece in _iter_mapped(self.path, COPY_CHUNK_BYTES):
+            yield bytes(piece)
+
+
+class JSONStreamBody:
+    """
+    Request body serializing a payload whose string values may be StreamedFields.
+
+    Pass it as `data=` to requests: its length sets Content-Length and
+    iterating it produces the body, so it can be sent again on a retry.
+    """
+
+    def __init__(self, payload: Any):
+        """
+        Initialize the body.
+
+        Args:
+            payload: JSON-serializable dict/list, with StreamedField instances
+                anywhere a string value is allowed
+        """
+        fields: List[StreamedField] = []
+        marker = f"__streamed_field_{id(self):x}_"
+
+        def substitute(value):
+            if isinstance(value, StreamedField):
+                fields.append(value)
+                return f"{marker}{len(fields) - 1}"
+            if isinstance(value, dict):
+                return {key: substitute(item) for key, item in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [substitute(item) for item in value]
+            return value
+
+        text = json.dumps(substitute(payload))
+        # Each marker is serialized as a quoted string; keep the quotes and
+        # send the field's content between them
+        self._parts: List[Union[bytes, StreamedField]] = []
+        for index, field in enumerate(fields):
+            before, text = text.split(f'"{marker}{index}"', 1)
+            self._parts.extend([f'{before}"'.encode('utf-8'), field])
+            text = '"' + text
+        self._parts.append(text.encode('utf-8'))
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self._parts)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return itertools.chain.from_iterable(
+            (part,) if isinstance(part, bytes) else part.chunks() for part in self._parts)
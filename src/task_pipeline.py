@@ -0,0 +1,588 @@
+"""
+Concurrent Act-Two generation pipeline.
+Each generation moves through five stages - preprocess, submit, await,
+download and verify - connected by bounded queues. Every stage has its own
+worker threads, so a slow CDN download never delays the next submission,
+and a full queue holds back the stage before it instead of letting
+prepared images or finished tasks pile up.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from concurrency_control import AdaptiveConcurrencyController
+
+logger = logging.getLogger(__name__)
+
+# Default number of Act-Two tasks kept in flight at the same time
+DEFAULT_MAX_IN_FLIGHT = 3
+
+# Default number of finished videos downloaded at the same time
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+# Default number of downloaded videos checked at the same time
+DEFAULT_VERIFY_WORKERS = 1
+
+# Pipeline stages in processing order
+STAGE_NAMES = ('preprocess', 'submit', 'await', 'download', 'verify')
+
+
+@dataclass(frozen=True)
+class GenerationJob:
+    """A single character image waiting to be turned into a video."""
+    image_path: str
+    output_folder: str
+    replace_existing: bool = False  # Image changed after its video was made; regenerate it
+
+    @property
+    def name(self) -> str:
+        return Path(self.image_path).name
+
+
+@dataclass
+class GenerationTask:
+    """State of one generation as it moves through the pipeline stages."""
+    image_path: str
+    output_path: Path
+    journal_key: Optional[tuple] = None
+    character: Any = None  # Prepared image payload field, dropped once submitted
+    task_id: Optional[str] = None  # Set on submission, or by the journal for adopted tasks
+    status_data: Optional[Dict] = None  # Final status of a succeeded task
+    error: Optional[str] = None  # Why the last stage failed
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of a GenerationJob."""
+    job: GenerationJob
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    skipped: bool = False  # Dropped by re-validation right before submission
+
+    @property
+    def succeeded(self) -> bool:
+        return self.output_path is not None
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Immutable list of generations for one batch, built once before processing starts."""
+    root: str
+    jobs: Tuple[GenerationJob, ...]
+    skipped_duplicates: int = 0
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def __iter__(self):
+        return iter(self.jobs)
+
+    @property
+    def folders(self) -> Tuple[str, ...]:
+        """Source folders of the planned images, in processing order."""
+        return tuple(dict.fromkeys(str(Path(job.image_path).parent) for job in self.jobs))
+
+    def upcoming_folders(self, started: int) -> List[str]:
+        """
+        Folder names still to be started.
+
+        Args:
+            started: Number of jobs already handed to the pipeline
+
+        Returns:
+            Names of the source folders of the remaining jobs, without repeats
+        """
+        return list(dict.fromkeys(Path(job.image_path).parent.name for job in self.jobs[started:]))
+
+
+class StreamingJobQueue:
+    """
+    Bounded queue fed by a background thread from a lazy job source.
+
+    Lets the pipeline submit the first images while the input folders are
+    still being scanned; the producer blocks once maxsize jobs are waiting.
+    """
+
+    _DONE = object()
+
+    def __init__(self, source: Iterable[GenerationJob], maxsize: int = 32):
+        """
+        Initialize the queue.
+
+        Args:
+            source: Lazy iterable of jobs, e.g. RunwayActTwoBatchGenerator.iter_generations
+            maxsize: Maximum number of discovered jobs waiting to be started
+        """
+        self._source = source
+        self._queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._finished = False
+        self.discovered: List[GenerationJob] = []  # Every job produced so far, in order
+        self.scan_complete = False
+
+    def start(self) -> 'StreamingJobQueue':
+        """Start consuming the source on a background thread."""
+        self._thread = threading.Thread(target=self._produce, name="job-scanner", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the producer; jobs not yet discovered are dropped."""
+        self._stopped.set()
+        # Unblock a producer waiting for space
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _produce(self):
+        try:
+            for job in self._source:
+                if self._stopped.is_set():
+                    break
+                self.discovered.append(job)
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put(job, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            logger.error(f"Scan failed: {str(e)}")
+        finally:
+            self.scan_complete = True
+            while True:
+                try:
+                    self._queue.put(self._DONE, timeout=0.5)
+                    break
+                except queue.Full:
+                    if self._stopped.is_set():
+                        break
+
+    def __len__(self) -> int:
+        """Number of jobs discovered so far (grows while the scan runs)."""
+        return len(self.discovered)
+
+    @property
+    def finished(self) -> bool:
+        """True once the scan is complete and every job has been taken."""
+        return self._finished
+
+    def get(self, timeout: Optional[float] = None) -> Optional[GenerationJob]:
+        """
+        Take the next job.
+
+        Args:
+            timeout: Seconds to wait for one (0 returns immediately)
+
+        Returns:
+            The next job, or None if none is ready yet or the queue is finished
+        """
+        if self._finished:
+            return None
+        try:
+            if timeout == 0:
+                item = self._queue.get_nowait()
+            else:
+                item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is self._DONE:
+            self._finished = True
+            return None
+        return item
+
+    def upcoming_folders(self, started: int) -> List[str]:
+        """Folder names of discovered jobs that have not been started yet."""
+        return list(dict.fromkeys(Path(job.image_path).parent.name for job in self.discovered[started:]))
+
+
+class PipelineStage:
+    """
+    One step of the generation pipeline: a bounded queue served by worker threads.
+
+    Handlers pass their output on with the next stage's put(), which blocks
+    while that stage's queue is full, so a slow stage applies backpressure
+    to the ones before it.
+    """
+
+    _STOP = object()
+
+    def __init__(self, name: str, handler: Callable[[Any], None], workers: int = 1, capacity: int = 1,
+                 on_error: Optional[Callable[[Any, Exception], None]] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name, used for thread names and monitoring
+            handler: Called on a worker thread for each queued item
+            workers: Worker threads serving the queue
+            capacity: Items that can wait in the queue before put() blocks
+            on_error: Called with the item and the exception when the handler raises
+        """
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.workers = max(1, int(workers))
+        self.capacity = max(1, int(capacity))
+        # The queue itself is unbounded so stop markers never block; the
+        # semaphore bounds the items waiting in it
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(self.capacity)
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def start(self) -> 'PipelineStage':
+        """Start the worker threads."""
+        for number in range(1, self.workers + 1):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    @property
+    def depth(self) -> int:
+        """Items waiting in the queue or being handled."""
+        with self._lock:
+            return self._queue.qsize() + self._active
+
+    def put(self, item) -> bool:
+        """
+        Queue an item for this stage, waiting while the queue is full.
+
+        Returns:
+            True if the item was queued, False if the stage has been stopped
+        """
+        while not self._stopped.is_set():
+            if self._slots.acquire(timeout=0.5):
+                self._queue.put(item)
+                return True
+        return False
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            self._slots.release()
+            if self._stopped.is_set():
+                continue  # Drop items left over after stop()
+            with self._lock:
+                self._active += 1
+            try:
+                self.handler(item)
+            except Exception as e:
+                logger.error(f"Error in {self.name} stage: {str(e)}")
+                if self.on_error:
+                    try:
+                        self.on_error(item, e)
+                    except Exception as handler_error:
+                        logger.error(f"Error handling {self.name} stage failure: {str(handler_error)}")
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def stop(self, wait: bool = True):
+        """
+        Stop the workers; queued items are dropped.
+
+        Args:
+            wait: Wait for items being handled to finish
+        """
+        self._stopped.set()
+        for _ in self._threads:
+            self._queue.put(self._STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class ConcurrentGenerationPipeline:
+    """Runs Act-Two generations through the preprocess, submit, await, download and verify stages."""
+
+    def __init__(self, generator, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 verify_workers: int = DEFAULT_VERIFY_WORKERS):
+        """
+        Initialize the pipeline.
+
+        Request pacing is left to the generator's rate limiter, so failed or
+        skipped images never cost any waiting time here. The number of
+        generations actually running adapts to throttling feedback through
+        an AdaptiveConcurrencyController capped at max_in_flight: a slot is
+        taken right before submission and freed as soon as the task finishes.
+
+        Stage workers and queue capacities:
+            preprocess: one worker per preprocessing process of the generator's
+                preprocessor (one thread without it)
+            submit: max_in_flight workers; its queue holds the preprocessor's
+                lookahead of prepared images
+            await: max_in_flight workers, each waiting on the shared poller
+            download: download_workers workers and queue slots
+            verify: verify_workers workers, queue sized like the download stage
+
+        Args:
+            generator: RunwayActTwoBatchGenerator providing the stage operations
+            max_in_flight: Maximum number of generations running at the same time
+            download_workers: Finished videos downloaded at the same time
+            verify_workers: Downloaded videos checked at the same time
+        """
+        self.generator = generator
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.download_workers = max(1, int(download_workers))
+        self.verify_workers = max(1, int(verify_workers))
+        self.controller = AdaptiveConcurrencyController(self.max_in_flight)
+        # Submissions report 429/5xx responses to the pipeline's controller
+        generator.concurrency = self.controller
+        transport = getattr(generator, 'transport', None)
+        if transport is not None:
+            # A connection per running task and download, plus the poller
+            transport.ensure_pool_size(self.max_in_flight + self.download_workers + 1)
+
+        self.stages: Dict[str, PipelineStage] = {}  # Set up by run()
+        self._events: queue.Queue = queue.Queue()  # ('start' | 'complete', payload) for the calling thread
+        self._validate: Optional[Callable[[GenerationJob], Optional[str]]] = None
+        # Jobs (by identity) that have been reported as started or hold a concurrency slot
+        self._job_lock = threading.Lock()
+        self._started: Set[int] = set()
+        self._holding_slot: Set[int] = set()
+
+    def stage_depths(self) -> Dict[str, int]:
+        """Items queued or being handled in each stage, in processing order."""
+        return {name: stage.depth for name, stage in self.stages.items()}
+
+    def describe_stages(self) -> str:
+        """Short queue depth line for progress displays."""
+        return " • ".join(f"{name} {depth}" for name, depth in self.stage_depths().items())
+
+    def _build_stages(self) -> Dict[str, PipelineStage]:
+        preprocessor = getattr(self.generator, 'preprocessor', None)
+        preprocess_workers = preprocessor.workers if preprocessor is not None else 1
+        lookahead = preprocessor.lookahead if preprocessor is not None else 1
+        verify_capacity = max(self.verify_workers, self.download_workers)
+        failed = self._stage_failed
+        stages = (
+            PipelineStage('preprocess', self._preprocess, preprocess_workers, preprocess_workers, failed),
+            PipelineStage('submit', self._submit, self.max_in_flight, lookahead, failed),
+            PipelineStage('await', self._await, self.max_in_flight, self.max_in_flight, failed),
+            PipelineStage('download', self._download, self.download_workers, self.download_workers, failed),
+            PipelineStage('verify', self._verify, self.verify_workers, verify_capacity, failed),
+        )
+        return {stage.name: stage for stage in stages}
+
+    def _finish(self, job: GenerationJob, output_path: Optional[str] = None,
+                error: Optional[str] = None, skipped: bool = False):
+        self._events.put(('complete', GenerationResult(job, output_path=output_path,
+                                                       error=error, skipped=skipped)))
+
+    def _start(self, job: GenerationJob):
+        with self._job_lock:
+            self._started.add(id(job))
+        self._events.put(('start', job))
+
+    def _take_slot(self, job: GenerationJob):
+        self.controller.acquire()
+        with self._job_lock:
+            self._holding_slot.add(id(job))
+
+    def _free_slot(self, job: GenerationJob):
+        with self._job_lock:
+            if id(job) not in self._holding_slot:
+                return
+            self._holding_slot.discard(id(job))
+        self.controller.release()
+
+    def _stage_failed(self, item: Union[GenerationJob, Tuple[GenerationJob, GenerationTask]], error: Exception):
+        """End a job whose stage handler raised, so every job fed gets exactly one result."""
+        job = item[0] if isinstance(item, tuple) else item
+        self._free_slot(job)
+        with self._job_lock:
+            started = id(job) in self._started
+        if not started:
+            self._start(job)
+        self._finish(job, error=str(error))
+
+    def _skip_reason(self, job: GenerationJob) -> Optional[str]:
+        """Re-validate a job; a skipped job is reported and goes no further."""
+        reason = self._validate(job) if self._validate else None
+        if reason:
+            logger.info(f"Skipping {job.image_path}: {reason}")
+            self._finish(job, error=reason, skipped=True)
+        return reason
+
+    def _preprocess(self, job: GenerationJob):
+        """Look the job up in the journal and prepare its image."""
+        if self._skip_reason(job):
+            return
+        error = "Generation failed"
+        try:
+            task = self.generator.open_generation(job.image_path, job.output_folder)
+            if isinstance(task, GenerationTask) and not task.task_id:
+                self.generator.prepare_character(task)
+        except Exception as e:
+            logger.error(f"Error preparing {job.image_path}: {str(e)}")
+            task = None
+            error = str(e)
+        if isinstance(task, GenerationTask):
+            self.stages['submit'].put((job, task))
+            return
+        # Already downloaded according to the journal, or could not be prepared
+        self._start(job)
+        if task:
+            self._finish(job, output_path=task)
+        else:
+            self._finish(job, error=error)
+
+    def _submit(self, item: Tuple[GenerationJob, GenerationTask]):
+        """Take a concurrency slot and create the task (adopted tasks only take the slot)."""
+        job, task = item
+        # Checked again right before submission: the image may be gone or
+        # its video may have appeared while it waited
+        if self._skip_reason(job):
+            return
+        self._take_slot(job)
+        self._start(job)
+        if not task.task_id and not self.generator.submit_generation(task):
+            self._free_slot(job)
+            self._finish(job, error=task.error)
+            return
+        self.stages['await'].put(item)
+
+    def _await(self, item: Tuple[GenerationJob, GenerationTask]):
+        """Wait for the task to finish, then free its slot."""
+        job, task = item
+        try:
+            succeeded = self.generator.await_generation(task)
+        finally:
+            self._free_slot(job)  # The slot is free while the video downloads
+        if succeeded:
+            self.stages['download'].put(item)
+        else:
+            self._finish(job, error=task.error)
+
+    def _download(self, item: Tuple[GenerationJob, GenerationTask]):
+        job, task = item
+        if self.generator.download_generation(task):
+            self.stages['verify'].put(item)
+        else:
+            self._finish(job, error=task.error)
+
+    def _verify(self, item: Tuple[GenerationJob, GenerationTask]):
+        job, task = item
+        if self.generator.verify_generation(task):
+            self._finish(job, output_path=str(task.output_path))
+        else:
+            self._finish(job, error=task.error)
+
+    def _feed(self, jobs: Union[Iterable[GenerationJob], StreamingJobQueue]):
+        """
+        Hand jobs to the preprocess stage, blocking while its queue is full.
+
+        Runs on its own thread and reports the number of jobs handed over
+        once the source is exhausted.
+        """
+        first = self.stages['preprocess']
+        count = 0
+        try:
+            if isinstance(jobs, StreamingJobQueue):
+                while not jobs.finished:
+                    job = jobs.get(timeout=0.5)
+                    if job is not None:
+                        if not first.put(job):
+                            break
+                        count += 1
+            else:
+                for job in jobs:
+                    if not first.put(job):
+                        break
+                    count += 1
+        except Exception as e:
+            logger.error(f"Error reading jobs: {str(e)}")
+        finally:
+            self._events.put(('fed', count))
+
+    def run(self, jobs: Union[Iterable[GenerationJob], StreamingJobQueue],
+            on_start: Optional[Callable[[GenerationJob], None]] = None,
+            on_complete: Optional[Callable[[GenerationResult], None]] = None,
+            on_tick: Optional[Callable[[], None]] = None,
+            validate: Optional[Callable[[GenerationJob], Optional[str]]] = None) -> List[GenerationResult]:
+        """
+        Process all jobs through the stages.
+
+        Callbacks are invoked on the calling thread, so they can safely
+        update console or Rich displays.
+
+        Args:
+            jobs: Jobs to process, consumed lazily on a feeder thread as the
+                preprocess stage has room, so results keep being handled while
+                a StreamingJobQueue is still being filled by its scan
+            on_start: Called when a job takes a concurrency slot (or is settled
+                without one, e.g. by the journal); not called for skipped jobs
+            on_complete: Called with the result of each finished job
+            on_tick: Called about once a second, e.g. to refresh controller state
+            validate: Called for each job before it is prepared and again just
+                before it is submitted; a returned reason skips the job (reported
+                through on_complete with skipped=True)
+
+        Returns:
+            Results in completion order
+        """
+        results = []
+        self._events = queue.Queue()
+        self._validate = validate
+        self._started, self._holding_slot = set(), set()
+        self.stages = self._build_stages()
+        for stage in self.stages.values():
+            stage.start()
+        feeder = threading.Thread(target=self._feed, args=(jobs,), name="job-feeder", daemon=True)
+        feeder.start()
+        fed = None  # Number of jobs handed to the first stage, known once the source is exhausted
+        finished = 0
+        completed = False
+        last_report = time.monotonic()
+
+        try:
+            while fed is None or finished < fed:
+                try:
+                    events = [self._events.get(timeout=1.0)]
+                except queue.Empty:
+                    events = []
+                while True:
+                    try:
+                        events.append(self._events.get_nowait())
+                    except queue.Empty:
+                        break
+
+                for kind, payload in events:
+                    if kind == 'fed':
+                        fed = payload
+                    elif kind == 'start':
+                        if on_start:
+                            on_start(payload)
+                    else:
+                        finished += 1
+                        results.append(payload)
+                        if on_complete:
+                            on_complete(payload)
+                if on_tick:
+                    on_tick()
+                if time.monotonic() - last_report >= 10:
+                    last_report = time.monotonic()
+                    logger.debug(f"Pipeline queues: {self.describe_stages()}")
+            completed = True
+        finally:
+            # After an error, don't wait for tasks still being awaited
+            for stage in self.stages.values():
+                stage.stop(wait=completed)
+            feeder.join(timeout=None if completed else 1.0)
+
+        return results
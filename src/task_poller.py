@@ -0,0 +1,245 @@
+"""
+Shared status poller for in-flight RunwayML tasks.
+One background thread owns every outstanding task ID and polls /tasks/{id}
+on a staggered schedule, resolving a future per task when it finishes.
+Cancelling a task's future stops its polling; stopping the poller cancels
+every outstanding future, since those tasks are still running on the API.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from http_transport import HTTPTransport
+from polling_strategy import PollingStrategy, ExponentialBackoffStrategy, DEFAULT_TASK_TIMEOUT
+from rate_limiter import RateLimiter, POLL
+from concurrency_control import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# Task states reported by the RunwayML /tasks endpoint that end a task
+TERMINAL_STATUSES = {'SUCCEEDED', 'FAILED', 'CANCELLED'}
+
+# Status reported by the poller for a task still running at its deadline
+TIMED_OUT = 'TIMED_OUT'
+
+# Status used between polls when the API could not be asked (429, 5xx, network errors)
+RETRYING = 'RETRYING'
+
+
+class _TrackedTask:
+    """Book-keeping for a single task owned by the poller."""
+
+    def __init__(self, task_id: str, future: Future, started_at: float, max_wait: float):
+        self.task_id = task_id
+        self.future = future
+        self.started_at = started_at
+        self.max_wait = max_wait
+        self.polls = 0
+        self.status_known = False  # Last poll got the task's status from the API
+
+
+class TaskStatusPoller:
+    """Polls all outstanding tasks from one thread on a shared schedule."""
+
+    def __init__(self, base_url: str, headers: Dict[str, str],
+                 strategy: Optional[PollingStrategy] = None,
+                 max_wait: float = DEFAULT_TASK_TIMEOUT, min_spacing: float = 0.5,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 transport: Optional[HTTPTransport] = None):
+        """
+        Initialize the poller.
+
+        Args:
+            base_url: RunwayML API base URL (or a local mock)
+            headers: Request headers including authorization
+            strategy: Decides the delay before each poll of a task
+            max_wait: Seconds after which a task is reported as timed out
+            min_spacing: Minimum seconds between any two status requests
+            rate_limiter: Shared limiter; status requests use its "poll" bucket
+            transport: Shared HTTP session (a private one is created if omitted)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers
+        self.strategy = strategy or ExponentialBackoffStrategy()
+        self.max_wait = max_wait
+        self.min_spacing = min_spacing
+        self.rate_limiter = rate_limiter
+        self.transport = transport or HTTPTransport()
+
+        self._tasks: Dict[str, _TrackedTask] = {}
+        self._schedule = []  # heap of (due_time, sequence, task_id)
+        self._sequence = itertools.count()
+        self._last_dispatch = float('-inf')  # When the latest status request was sent
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def outstanding(self) -> int:
+        """Number of tasks currently being polled."""
+        with self._condition:
+            return len(self._tasks)
+
+    def track(self, task_id: str, max_wait: Optional[float] = None) -> Future:
+        """
+        Start polling a task.
+
+        Args:
+            task_id: Task ID returned by the API
+            max_wait: Optional per-task timeout overriding the poller default
+
+        Returns:
+            Future resolved with the final status data (status SUCCEEDED,
+            FAILED or CANCELLED, or TIMED_OUT once max_wait has passed), or
+            None if the API refused to report the task's status. Cancelling it
+            stops polling the task; stop() cancels it too.
+        """
+        with self._condition:
+            tracked = self._tasks.get(task_id)
+            if tracked and not tracked.future.cancelled():
+                return tracked.future
+
+            now = time.monotonic()
+            tracked = _TrackedTask(task_id, Future(), now,
+                                   max_wait if max_wait is not None else self.max_wait)
+            self._tasks[task_id] = tracked
+            self._schedule_poll(task_id, now + self.strategy.next_delay(0, 0.0))
+            self._ensure_running()
+            self._condition.notify()
+            return tracked.future
+
+    def wait(self, task_id: str, max_wait: Optional[float] = None) -> Optional[Dict]:
+        """Track a task and block until it reaches a final state."""
+        return self.track(task_id, max_wait=max_wait).result()
+
+    def stop(self):
+        """Stop the polling thread, cancelling the futures of unfinished tasks."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread:
+            thread.join(timeout=5)
+        with self._condition:
+            for tracked in self._tasks.values():
+                # The task keeps running on the API; waiters see CancelledError, not a failure
+                tracked.future.cancel()
+            self._tasks.clear()
+            self._schedule.clear()
+            self._thread = None
+            self._stopping = False
+
+    def _ensure_running(self):
+        """Start the polling thread on first use (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="task-poller", daemon=True)
+            self._thread.start()
+
+    def _schedule_poll(self, task_id: str, due: float):
+        """Queue the next poll of a task (spacing is applied when polls are sent)."""
+        heapq.heappush(self._schedule, (due, next(self._sequence), task_id))
+
+    def _run(self):
+        """Polling loop executed on the background thread."""
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    if self._schedule:
+                        # Keep polls at least min_spacing apart so due polls do not spike
+                        # together; a poll scheduled far ahead never delays earlier ones
+                        ready_at = max(self._schedule[0][0], self._last_dispatch + self.min_spacing)
+                        delay = ready_at - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._condition.wait(timeout=delay)
+                    else:
+                        self._condition.wait()
+                if self._stopping:
+                    return
+                _, _, task_id = heapq.heappop(self._schedule)
+                tracked = self._tasks.get(task_id)
+                if tracked is not None and tracked.future.cancelled():
+                    # Nobody is waiting for this task any more
+                    del self._tasks[task_id]
+                    tracked = None
+                if tracked is not None:
+                    self._last_dispatch = time.monotonic()
+            if tracked is None:
+                continue
+
+            status_data, retry_after = self._poll(tracked)
+
+            with self._condition:
+                elapsed = time.monotonic() - tracked.started_at
+                if status_data is not None and status_data.get('status') not in TERMINAL_STATUSES:
+                    if elapsed < tracked.max_wait:
+                        delay = retry_after if retry_after is not None else self.strategy.next_delay(tracked.polls, elapsed)
+                        # Never sleep past the task deadline
+                        delay = min(delay, max(0.0, tracked.max_wait - elapsed))
+                        self._schedule_poll(task_id, time.monotonic() + delay)
+                        continue
+                    if tracked.status_known:
+                        logger.error(f"Task {task_id} timed out after {tracked.max_wait:.0f} seconds")
+                        status_data = {'id': task_id, 'status': TIMED_OUT,
+                                       'error': f"Timed out after {tracked.max_wait:.0f} seconds"}
+                    else:
+                        # Never heard back in time; the task may well be fine
+                        logger.error(f"Task {task_id} could not be polled before its deadline")
+                        status_data = None
+                self._tasks.pop(task_id, None)
+            if status_data is not None and status_data.get('status') == 'SUCCEEDED':
+                self.strategy.record_completion(elapsed)
+            self._resolve(tracked, status_data)
+
+    @staticmethod
+    def _resolve(tracked: _TrackedTask, status_data: Optional[Dict]):
+        """Hand the final status to the task's waiter, unless it was cancelled."""
+        try:
+            tracked.future.set_result(status_data)
+        except InvalidStateError:
+            pass  # Cancelled by the waiter, or already resolved
+
+    def _poll(self, tracked: _TrackedTask) -> Tuple[Optional[Dict], Optional[float]]:
+        """
+        Fetch the current status of one task.
+
+        Returns:
+            Tuple of (status_data, retry_after). Throttled (429), server error
+            (5xx) responses and network errors keep the task alive with a
+            RETRYING status (and the delay requested by the API, if any).
+        """
+        tracked.polls += 1
+        if self.rate_limiter:
+            self.rate_limiter.acquire(POLL)
+        try:
+            status_response = self.transport.get(
+                f"{self.base_url}/tasks/{tracked.task_id}",
+                headers=self.headers
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Failed to check task status for {tracked.task_id}, retrying: {str(e)}")
+            tracked.status_known = False
+            return {'id': tracked.task_id, 'status': RETRYING}, None
+
+        if status_response.status_code == 429 or status_response.status_code >= 500:
+            retry_after = parse_retry_after(status_response.headers.get('Retry-After'))
+            logger.warning(f"Status check for {tracked.task_id} returned HTTP {status_response.status_code}, retrying")
+            tracked.status_known = False
+            return {'id': tracked.task_id, 'status': RETRYING}, retry_after
+
+        if status_response.status_code != 200:
+            logger.error(f"Failed to check task status: {status_response.text}")
+            return None, None
+
+        status_data = status_response.json()
+        tracked.status_known = True
+        status = status_data.get('status', 'UNKNOWN')
+        logger.info(f"Task {tracked.task_id} status: {status}")
+        return status_data, None
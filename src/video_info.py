@@ -0,0 +1,162 @@
+"""
+Video file information helpers.
+Detects driver video duration with ffprobe, OpenCV or MoviePy, whichever is available,
+and checks the structure of downloaded MP4 files.
+Kept free of GUI imports so headless code paths can use it.
+"""
+
+import struct
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Try to import video duration libraries
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+try:
+    from moviepy.editor import VideoFileClip
+    HAS_MOVIEPY = True
+except ImportError:
+    HAS_MOVIEPY = False
+
+
+class VideoInfo:
+    """Utility class for video file information."""
+
+    @staticmethod
+    def check_mp4(video_path: str) -> Optional[str]:
+        """
+        Check that a file is a complete MP4 container.
+
+        Walks the top-level boxes (reading only their headers): the file must
+        start with an ftyp box, contain a moov box, and the boxes must end
+        exactly at the end of the file, which catches truncated downloads and
+        error pages saved as videos.
+
+        Returns:
+            Description of the problem, or None if the file looks valid
+        """
+        try:
+            size = Path(video_path).stat().st_size
+            offset = 0
+            box_types = []
+            with open(video_path, 'rb') as f:
+                while offset < size:
+                    f.seek(offset)
+                    header = f.read(8)
+                    if len(header) < 8:
+                        return f"Truncated box header at byte {offset}"
+                    box_size, box_type = struct.unpack('>I4s', header)
+                    if box_size == 1:
+                        # 64-bit size follows the type
+                        extended = f.read(8)
+                        if len(extended) < 8:
+                            return f"Truncated box header at byte {offset}"
+                        box_size = struct.unpack('>Q', extended)[0]
+                    elif box_size == 0:
+                        # Box extends to the end of the file
+                        box_size = size - offset
+                    if box_size < 8:
+                        return f"Invalid box size {box_size} at byte {offset}"
+                    if not box_types and box_type != b'ftyp':
+                        return "Not an MP4 file (no ftyp box)"
+                    box_types.append(box_type)
+                    offset += box_size
+        except OSError as e:
+            return f"Cannot read video: {e}"
+
+        if not box_types:
+            return "Empty file"
+        if offset != size:
+            return f"Truncated: last box ends at byte {offset} of {size}"
+        if b'moov' not in box_types:
+            return "No moov box"
+        return None
+
+    @staticmethod
+    def get_duration_ffprobe(video_path: str) -> Optional[float]:
+        """Get video duration using ffprobe (if available)."""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1',
+                str(video_path)
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+            if result.returncode == 0:
+                return float(result.stdout.strip())
+        except (subprocess.SubprocessError, ValueError, FileNotFoundError):
+            pass
+        return None
+
+    @staticmethod
+    def get_duration_cv2(video_path: str) -> Optional[float]:
+        """Get video duration using OpenCV."""
+        if not HAS_CV2:
+            return None
+        try:
+            cap = cv2.VideoCapture(str(video_path))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            cap.release()
+            if fps > 0:
+                return frame_count / fps
+        except:
+            pass
+        return None
+
+    @staticmethod
+    def get_duration_moviepy(video_path: str) -> Optional[float]:
+        """Get video duration using MoviePy."""
+        if not HAS_MOVIEPY:
+            return None
+        try:
+            clip = VideoFileClip(str(video_path))
+            duration = clip.duration
+            clip.close()
+            return duration
+        except:
+            pass
+        return None
+
+    @staticmethod
+    def get_duration(video_path: str) -> Tuple[Optional[float], str]:
+        """
+        Get video duration using available methods.
+
+        Returns:
+            Tuple of (duration_in_seconds, formatted_string)
+        """
+        if not video_path or not Path(video_path).exists():
+            return None, "File not found"
+
+        # Try different methods in order of preference
+        methods = [
+            ('ffprobe', VideoInfo.get_duration_ffprobe),
+            ('opencv', VideoInfo.get_duration_cv2),
+            ('moviepy', VideoInfo.get_duration_moviepy),
+        ]
+
+        for method_name, method_func in methods:
+            duration = method_func(video_path)
+            if duration is not None:
+                # Format duration nicely
+                if duration < 60:
+                    formatted = f"{duration:.1f}s"
+                else:
+                    minutes = int(duration // 60)
+                    seconds = int(duration % 60)
+                    formatted = f"{minutes}:{seconds:02d}"
+                return duration, formatted
+
+        # If no method worked, return file size as fallback info
+        try:
+            size_mb = Path(video_path).stat().st_size / (1024 * 1024)
+            return None, f"{size_mb:.1f}MB"
+        except:
+            return None, "Unknown"